@@ -0,0 +1,60 @@
+"""Compare the throughput of ThreadedMatchScraper and AsyncClient against a local stand-in server
+
+Both clients run at the same concurrency with the memory cache disabled, so every match ID is fetched
+and parsed.
+
+Run from the repository root:
+
+    python benchmarks/bench_async.py
+"""
+
+import time
+import asyncio
+
+from helpers import load_regressions, match_page_ids, StandInServer, LocalTransport
+
+from vlrscraper.logger import set_should_print
+from vlrscraper.async_client import AsyncClient
+from vlrscraper.cache import MemoryCache, set_memory_cache
+from vlrscraper.scraping import ThreadedMatchScraper
+from vlrscraper.transport import set_transport
+
+ROUNDS = 8
+# Both clients fetch this many pages at once, so only how they schedule fetches and parses differs
+CONCURRENCY = 16
+
+
+def main() -> None:
+    set_should_print(False)
+    # Every round fetches each page again rather than reusing memoized matches
+    set_memory_cache(MemoryCache(max_entries=0))
+    pages = load_regressions()
+    match_ids = match_page_ids(pages) * ROUNDS
+
+    with StandInServer(pages, latency=0.2) as server:
+        set_transport(LocalTransport(server.url, pool_maxsize=CONCURRENCY))
+
+        start = time.perf_counter()
+        threaded = ThreadedMatchScraper(match_ids, fetch_workers=CONCURRENCY).run()
+        threaded_time = time.perf_counter() - start
+
+        async def scrape():
+            async with AsyncClient(concurrency=CONCURRENCY) as client:
+                return await client.get_matches(match_ids)
+
+        start = time.perf_counter()
+        asynchronous = asyncio.run(scrape())
+        async_time = time.perf_counter() - start
+
+    assert len(threaded) == len(asynchronous) == len(match_ids)
+    print(f"{len(match_ids)} match pages")
+    print(
+        f"ThreadedMatchScraper: {threaded_time:.2f}s ({len(match_ids) / threaded_time:.1f} pages/s)"
+    )
+    print(
+        f"AsyncClient:          {async_time:.2f}s ({len(match_ids) / async_time:.1f} pages/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
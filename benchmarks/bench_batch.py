@@ -0,0 +1,69 @@
+"""Compare scraping the players of a 16 team event one at a time against scraping them with
+PlayerController.get_players, against a local stand-in server
+
+Every player ID is served one of the player pages stored in regressions.json.
+
+Run from the repository root:
+
+    python benchmarks/bench_batch.py
+"""
+
+import re
+import time
+
+from helpers import load_regressions, StandInServer, LocalTransport
+
+from vlrscraper.cache import get_memory_cache
+from vlrscraper.controllers import PlayerController
+from vlrscraper.logger import set_should_print
+from vlrscraper.transport import set_transport
+
+PLAYERS = 16 * 5
+
+
+class PlayerPageTransport(LocalTransport):
+    """Serves the page of one of the stored players for every player ID"""
+
+    def __init__(self, base_url: str, players: list, **kwargs) -> None:
+        super().__init__(base_url, **kwargs)
+        self.players = players
+
+    def get(self, url: str, **kwargs):
+        url = re.sub(
+            r"/player/(\d+)$",
+            lambda m: f"/player/{self.players[int(m[1]) % len(self.players)]}",
+            url,
+        )
+        return super().get(url, **kwargs)
+
+
+def main() -> None:
+    set_should_print(False)
+    pages = load_regressions()
+    players = [
+        int(m[1])
+        for url in pages
+        if (m := re.fullmatch(r"https://vlr.gg/player/(\d+)", url))
+    ]
+    ids = list(range(1, PLAYERS + 1))
+
+    with StandInServer(pages, latency=0.2) as server:
+        set_transport(PlayerPageTransport(server.url, players, pool_maxsize=16))
+
+        start = time.perf_counter()
+        serial = [PlayerController.get_player(_id) for _id in ids]
+        serial_time = time.perf_counter() - start
+
+        get_memory_cache().clear()
+        start = time.perf_counter()
+        batch = PlayerController.get_players(ids)
+        batch_time = time.perf_counter() - start
+
+    assert all(serial) and all(response["success"] for response in batch.values())
+    print(f"{PLAYERS} player pages")
+    print(f"get_player loop: {serial_time:.2f}s ({PLAYERS / serial_time:.1f} pages/s)")
+    print(f"get_players:     {batch_time:.2f}s ({PLAYERS / batch_time:.1f} pages/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure the memory each scraped entity takes, both for matches parsed from the pages stored in regressions.json
+and for players, teams and stats built with freshly allocated strings the way scraping creates them
+
+Run from the repository root:
+
+    python benchmarks/bench_entity_memory.py
+"""
+
+import tracemalloc
+
+from typing import Callable, List
+
+from helpers import load_regressions, match_page_ids
+
+from vlrscraper.controllers import MatchController
+from vlrscraper.logger import set_should_print
+from vlrscraper.resources import Player, PlayerStatus, PlayerStats, Team
+
+# How many times each stored match page is parsed
+MATCH_COPIES = 40
+ENTITIES = 20_000
+
+
+def fresh(value: str) -> str:
+    """Copy a string into a new object, as every page parse does for the names and urls it scrapes"""
+    return "".join(list(value))
+
+
+def measure(build: Callable[[], List[object]]) -> float:
+    """Get the number of bytes still allocated per entity once `build` has returned its entities"""
+    tracemalloc.start()
+    entities = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory / len(entities)
+
+
+def main() -> None:
+    set_should_print(False)
+    pages = load_regressions()
+    data = {
+        _id: pages[f"https://vlr.gg/{_id}"]["content"].encode()
+        for _id in match_page_ids(pages)
+    }
+
+    def matches() -> List[object]:
+        return [
+            MatchController.parse_match(_id, page, mode="stats")
+            for _ in range(MATCH_COPIES)
+            for _id, page in data.items()
+        ]
+
+    def players() -> List[object]:
+        return [
+            Player(
+                i + 1,
+                fresh("zekken"),
+                None,
+                fresh("Zachary"),
+                fresh("Patrone"),
+                fresh("https://owcdn.net/img/65cc6f0d8d1a4.png"),
+                PlayerStatus.ACTIVE,
+            )
+            for i in range(ENTITIES)
+        ]
+
+    def teams() -> List[object]:
+        return [
+            Team(
+                i + 1,
+                fresh("Sentinels"),
+                fresh("SEN"),
+                fresh("https://owcdn.net/img/62875027c8e06.png"),
+                [],
+            )
+            for i in range(ENTITIES)
+        ]
+
+    def stats() -> List[object]:
+        return [
+            PlayerStats(1.19, 271, 45, 36, 8, 9, 71, 164, 21, 7, 5, 2)
+            for _ in range(ENTITIES)
+        ]
+
+    print(f"Match (with teams, players and stats) {measure(matches):8.0f} bytes")
+    print(f"Player                                {measure(players):8.0f} bytes")
+    print(f"Team                                  {measure(teams):8.0f} bytes")
+    print(f"PlayerStats                           {measure(stats):8.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure the throughput, file size and peak memory of exporting a stream of matches to each export format.
+Matches are rebuilt one at a time from the match pages stored in regressions.json, so peak memory should stay
+flat however many matches are exported
+
+Run from the repository root:
+
+    python benchmarks/bench_export.py
+"""
+
+import os
+import time
+import tempfile
+import tracemalloc
+
+from itertools import cycle, islice
+from typing import Iterator
+
+from helpers import load_regressions, match_page_ids
+
+from vlrscraper.controllers import MatchController
+from vlrscraper.export import export_matches
+from vlrscraper.logger import set_should_print
+from vlrscraper.resources import Match
+
+FORMATS = [
+    ("ndjson", None),
+    ("ndjson", "gzip"),
+    ("parquet", "zstd"),
+    ("arrow", "zstd"),
+]
+
+
+def size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def main() -> None:
+    set_should_print(False)
+    pages = load_regressions()
+    records = [
+        MatchController.parse_match_record(
+            _id, pages[f"https://vlr.gg/{_id}"]["content"].encode()
+        )
+        for _id in match_page_ids(pages)
+    ]
+
+    def matches(count: int) -> Iterator[Match]:
+        return (
+            MatchController.match_from_record(record)
+            for record in islice(cycle(records), count)
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in (2_000, 10_000):
+            for file_format, compression in FORMATS:
+                path = os.path.join(directory, f"{count}-{file_format}-{compression}")
+                tracemalloc.start()
+                start = time.perf_counter()
+                export_matches(matches(count), path, file_format, compression)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(
+                    f"{count:6} matches {file_format:7} {str(compression):5} "
+                    f"{elapsed / count * 1e6:7.0f}us per match  "
+                    f"{size(path) / count:7.0f} bytes per match  peak memory {peak / 2**20:6.1f}MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
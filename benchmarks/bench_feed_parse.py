@@ -0,0 +1,101 @@
+"""Compare parsing match pages from complete byte strings against feeding them to lxml in chunks, with and
+without pruning, for every match page stored in regressions.json
+
+Parse time includes evaluating the XPATH constants that match pages are scraped with. Peak memory is measured
+in a fresh process per mode that reads each page from disk and keeps every parsed tree, as the memory cache
+does, so it counts lxml's own allocations as well as python's.
+
+Run from the repository root:
+
+    python benchmarks/bench_feed_parse.py
+"""
+
+import os
+import sys
+import time
+import resource
+import tempfile
+import subprocess
+
+from helpers import load_regressions, match_page_ids
+
+from vlrscraper import constants as const
+from vlrscraper.logger import set_should_print
+from vlrscraper.scraping import XpathParser
+
+ROUNDS = 20
+# How many copies of each page the memory measurement keeps parsed at once
+COPIES = 40
+
+MATCH_XPATHS = [
+    value for name, value in const.REGISTRY.items() if name.startswith("MATCH_")
+]
+
+
+def parse_bytes(path: str) -> XpathParser:
+    with open(path, "rb") as f:
+        return XpathParser(f.read())
+
+
+def parse_chunks(path: str, prune: bool = False) -> XpathParser:
+    with open(path, "rb") as f:
+        return XpathParser.from_file(f, prune=prune)
+
+
+MODES = {
+    "bytes": parse_bytes,
+    "chunks": parse_chunks,
+    "pruned": lambda path: parse_chunks(path, prune=True),
+}
+
+
+def time_mode(paths, mode) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for path in paths:
+            parser = MODES[mode](path)
+            for xpath in MATCH_XPATHS:
+                parser.evaluate(xpath)
+    return (time.perf_counter() - start) / (ROUNDS * len(paths))
+
+
+def peak_memory(paths, mode) -> int:
+    """Parse every page COPIES times in this process, returning the growth in peak RSS in KiB"""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    parsers = [MODES[mode](path) for _ in range(COPIES) for path in paths]
+    assert parsers
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+def main() -> None:
+    set_should_print(False)
+
+    # Child processes only measure memory
+    if len(sys.argv) > 2 and sys.argv[1] == "--memory":
+        print(peak_memory(sys.argv[3:], sys.argv[2]))
+        return
+
+    pages = load_regressions()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for _id in match_page_ids(pages):
+            paths.append(os.path.join(directory, f"{_id}.html"))
+            with open(paths[-1], "wb") as f:
+                f.write(pages[f"https://vlr.gg/{_id}"]["content"].encode())
+
+        for mode in MODES:
+            per_page = time_mode(paths, mode)
+            memory = subprocess.run(
+                [sys.executable, __file__, "--memory", mode, *paths],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            print(
+                f"{mode:7} {per_page * 1000:6.2f}ms per page  "
+                f"peak memory +{int(memory) / 1024:6.1f}MiB for {COPIES * len(paths)} pages"
+            )
+
+
+if __name__ == "__main__":
+    main()
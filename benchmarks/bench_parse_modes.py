@@ -0,0 +1,36 @@
+"""Compare the CPU time of parsing every match page stored in regressions.json in each match parse mode
+
+Run from the repository root:
+
+    python benchmarks/bench_parse_modes.py
+"""
+
+import time
+
+from helpers import load_regressions, match_page_ids
+
+from vlrscraper.controllers import MatchController, MATCH_PARSE_MODES
+from vlrscraper.logger import set_should_print
+
+ROUNDS = 20
+
+
+def main() -> None:
+    set_should_print(False)
+    pages = load_regressions()
+    data = {
+        _id: pages[f"https://vlr.gg/{_id}"]["content"].encode()
+        for _id in match_page_ids(pages)
+    }
+
+    for mode in MATCH_PARSE_MODES:
+        start = time.process_time()
+        for _ in range(ROUNDS):
+            for _id, page in data.items():
+                MatchController.parse_match_record(_id, page, mode)
+        per_page = (time.process_time() - start) / (ROUNDS * len(data))
+        print(f"{mode:7} {per_page * 1000:6.2f}ms CPU per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Compare ThreadedMatchScraper parse throughput with thread and process pool parsing
+
+Run from the repository root:
+
+    python benchmarks/bench_process_parse.py
+"""
+
+import os
+import time
+
+from helpers import load_regressions, match_page_ids, StandInServer, LocalTransport
+
+from vlrscraper.logger import set_should_print
+from vlrscraper.scraping import ThreadedMatchScraper
+from vlrscraper.transport import set_transport
+
+ROUNDS = 10
+
+
+def main() -> None:
+    set_should_print(False)
+    pages = load_regressions()
+    match_ids = match_page_ids(pages) * ROUNDS
+
+    with StandInServer(pages, latency=0) as server:
+        set_transport(LocalTransport(server.url))
+
+        for processes in sorted({0, 2, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            matches = ThreadedMatchScraper(
+                match_ids, fetch_workers=4, processes=processes
+            ).run()
+            elapsed = time.perf_counter() - start
+            assert len(matches) == len(match_ids)
+            print(
+                f"processes={processes}: {elapsed:.2f}s "
+                f"({len(match_ids) / elapsed:.1f} pages/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare the memory used and the time taken to aggregate player stats kept as PlayerStats objects against a
+columnar StatsTable, for as many rows as a few years of pro matches
+
+Run from the repository root:
+
+    python benchmarks/bench_stats_table.py
+"""
+
+import time
+import random
+import tracemalloc
+
+from vlrscraper.logger import set_should_print
+from vlrscraper.resources import PlayerStats
+from vlrscraper.stats import StatsTable
+
+ROWS = 200_000
+PLAYERS = 2_000
+
+
+def random_stats() -> PlayerStats:
+    return PlayerStats(
+        round(random.uniform(0.3, 2.0), 2),
+        *(random.randint(-10, 300) for _ in range(11)),
+    )
+
+
+def main() -> None:
+    set_should_print(False)
+
+    random.seed(0)
+    tracemalloc.start()
+    rows = [(i // 10, random.randrange(PLAYERS), random_stats()) for i in range(ROWS)]
+    object_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    random.seed(0)
+    tracemalloc.start()
+    table = StatsTable()
+    for i in range(ROWS):
+        table.append(i // 10, random.randrange(PLAYERS), random_stats())
+    table_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"PlayerStats objects {object_memory / ROWS:6.1f} bytes per row")
+    print(f"StatsTable          {table_memory / ROWS:6.1f} bytes per row")
+
+    start = time.perf_counter()
+    ratings = {}
+    for _, player, stats in rows:
+        ratings.setdefault(player, []).append(stats.rating)
+    {player: sum(values) / len(values) for player, values in ratings.items()}
+    print(
+        f"Mean rating per player over objects    {(time.perf_counter() - start) * 1000:7.1f}ms"
+    )
+
+    start = time.perf_counter()
+    table.mean("rating", by_player=True)
+    print(
+        f"Mean rating per player over StatsTable {(time.perf_counter() - start) * 1000:7.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
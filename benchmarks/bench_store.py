@@ -0,0 +1,68 @@
+"""Measure how fast matches are upserted into an EntityStore on disk with one transaction per match against
+batched transactions, and how fast stored matches are queried and loaded
+
+Matches are rebuilt from the match pages stored in regressions.json, each with a new ID.
+
+Run from the repository root:
+
+    python benchmarks/bench_store.py
+"""
+
+import os
+import time
+import tempfile
+
+from itertools import cycle, islice
+
+from helpers import load_regressions, match_page_ids
+
+from vlrscraper.controllers import MatchController
+from vlrscraper.logger import set_should_print
+from vlrscraper.store import EntityStore
+
+MATCHES = 2000
+
+
+def main() -> None:
+    set_should_print(False)
+    pages = load_regressions()
+    records = [
+        MatchController.parse_match_record(
+            _id, pages[f"https://vlr.gg/{_id}"]["content"].encode()
+        )
+        for _id in match_page_ids(pages)
+    ]
+    matches = [
+        MatchController.match_from_record({**record, "id": _id})
+        for _id, record in enumerate(islice(cycle(records), MATCHES), 1)
+    ]
+    player = next(iter(matches[0].get_stats()))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for batch_size in (1, 500):
+            store = EntityStore(
+                os.path.join(directory, f"{batch_size}.sqlite"), batch_size
+            )
+            start = time.perf_counter()
+            store.put_matches(matches)
+            elapsed = time.perf_counter() - start
+            print(
+                f"batch size {batch_size:3}  {elapsed / MATCHES * 1e6:7.0f}us per match upserted"
+            )
+
+        start = time.perf_counter()
+        ids = store.get_match_ids(player=player)
+        query = time.perf_counter() - start
+        start = time.perf_counter()
+        for _id, _ in ids:
+            store.get_match(_id)
+        load = time.perf_counter() - start
+        print(
+            f"query {len(ids)} matches of a player in {query * 1000:.2f}ms, "
+            f"{load / len(ids) * 1e6:.0f}us per match loaded"
+        )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare evaluating the XPATH constants as strings against evaluating them precompiled,
+for every page stored in regressions.json
+
+Run from the repository root:
+
+    python benchmarks/bench_xpath.py
+"""
+
+import time
+
+from lxml import html
+
+from helpers import load_regressions
+
+from vlrscraper.logger import set_should_print
+from vlrscraper.constants import REGISTRY
+
+ROUNDS = 20
+
+
+def time_page(tree, evaluate) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for xpath in REGISTRY.values():
+            evaluate(tree, xpath)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main() -> None:
+    set_should_print(False)
+    total_string, total_compiled = 0.0, 0.0
+
+    for url, page in load_regressions().items():
+        if page["status-code"] != 200:
+            continue
+        tree = html.fromstring(page["content"].encode())
+
+        string = time_page(tree, lambda t, x: t.xpath(x.path))
+        compiled = time_page(tree, lambda t, x: x(t))
+        total_string += string
+        total_compiled += compiled
+        print(
+            f"{url:45} string {string * 1000:7.2f}ms  compiled {compiled * 1000:7.2f}ms  "
+            f"({string / compiled:.2f}x)"
+        )
+
+    print(
+        f"{'total':45} string {total_string * 1000:7.2f}ms  "
+        f"compiled {total_compiled * 1000:7.2f}ms  ({total_string / total_compiled:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
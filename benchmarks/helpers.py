@@ -0,0 +1,76 @@
+"""Shared helpers for the benchmarks in this directory
+
+Implements:
+    - `load_regressions`, a function that loads the pages stored in regressions.json
+    - `match_page_ids`, a function that gets the IDs of the stored match pages
+    - `StandInServer`, a local keep-alive server that serves the regression pages with simulated latency
+    - `LocalTransport`, a transport that redirects vlr.gg requests to a `StandInServer`
+"""
+
+import json
+import time
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from vlrscraper.transport import Transport
+
+
+def load_regressions(path: str = "regressions.json") -> Dict[str, dict]:
+    with open(path, "r") as f:
+        return json.load(f)["regressions"]
+
+
+def match_page_ids(pages: Dict[str, dict]) -> List[int]:
+    return [
+        int(path) for url in pages if (path := url.split("vlr.gg/", 1)[1]).isdigit()
+    ]
+
+
+class StandInServer:
+    """Serves every stored regression page by path, sleeping `latency` seconds before each response"""
+
+    def __init__(self, pages: Dict[str, dict], latency: float = 0.05) -> None:
+        routes = {
+            url.split("vlr.gg", 1)[1]: (page["status-code"], page["content"].encode())
+            for url, page in pages.items()
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                time.sleep(latency)
+                status, body = routes.get(self.path, (404, b"Not found"))
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "StandInServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class LocalTransport(Transport):
+    """A transport that sends every vlr.gg request to a local server instead"""
+
+    def __init__(self, base_url: str, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def get(self, url: str, **kwargs):
+        for prefix in ("https://www.vlr.gg", "https://vlr.gg"):
+            url = url.replace(prefix, self.base_url, 1)
+        return super().get(url, **kwargs)
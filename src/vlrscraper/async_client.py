@@ -0,0 +1,253 @@
+"""This module implements an asyncio API for scraping vlr.gg that mirrors the controllers in
+:mod:`vlrscraper.controllers`
+
+Implements:
+    - `AsyncClient`, a client whose coroutines can be fanned out over thousands of IDs from one event loop
+"""
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Union, Callable, Any
+
+from vlrscraper.cache import Memoized
+from vlrscraper.logger import get_logger
+from vlrscraper.resource import Resource
+from vlrscraper.resources import Player, Team, Match
+from vlrscraper.store import get_store
+from vlrscraper.utils import TimeWindow
+from vlrscraper.controllers import PlayerController, TeamController, MatchController
+from vlrscraper.vlr_resources import player_resource, team_resource, match_resource
+
+_logger = get_logger()
+
+
+class AsyncClient:
+    """Scrape vlr.gg data from an event loop
+
+    Every request goes through the shared :class:`vlrscraper.transport.Transport`, so all coroutines share
+    one connection pool. Entities go through the same memory cache, entity store and registry as the
+    controllers, so both return the same results for the same ID. The number of fetches in flight at
+    once is bounded by a semaphore. Blocking fetches run on a worker pool of that size, while parsing
+    runs on a separate, smaller pool so that CPU-bound parses do not fight the fetch threads for the GIL.
+
+    .. code-block:: python
+
+        async def main():
+            async with AsyncClient(concurrency=32) as client:
+                return await asyncio.gather(*(client.get_match(i) for i in match_ids))
+
+        matches = asyncio.run(main())
+
+    :param concurrency: The maximum number of pages being fetched at once, defaults to 16
+    :type concurrency: int, optional
+
+    :param parse_workers: The number of threads parsing fetched pages, defaults to 1
+    :type parse_workers: int, optional
+    """
+
+    def __init__(self, concurrency: int = 16, parse_workers: int = 1) -> None:
+        if concurrency <= 0 or parse_workers <= 0:
+            raise ValueError("AsyncClient worker counts must be positive integers.")
+        self.__concurrency = concurrency
+        self.__fetch_executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.__parse_executor = ThreadPoolExecutor(max_workers=parse_workers)
+        self.__semaphore: Optional[asyncio.BoundedSemaphore] = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    def get_concurrency(self) -> int:
+        """Get the maximum number of pages that this client will fetch at once
+
+        :return: The concurrency limit
+        :rtype: int
+        """
+        return self.__concurrency
+
+    def close(self) -> None:
+        """Shut down the client's worker pools"""
+        self.__fetch_executor.shutdown(wait=False)
+        self.__parse_executor.shutdown(wait=False)
+
+    async def _fetch(self, resource: Resource, _id: int) -> dict:
+        """Fetch a resource on the fetch pool once a concurrency slot is free
+
+        :param resource: The resource to fetch
+        :type resource: Resource
+
+        :param _id: The ID of the resource
+        :type _id: int
+
+        :return: The response dict returned by :func:`Resource.get_data`
+        :rtype: dict
+        """
+        # Semaphores must be created inside the running loop on python < 3.10
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.BoundedSemaphore(self.__concurrency)
+        async with self.__semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.__fetch_executor, resource.get_data, _id
+            )
+
+    async def _parse(self, func: Callable, *args) -> Any:
+        """Run a blocking parse function on the parse pool
+
+        :param func: The parse function to run
+        :type func: :class:`collections.abc.Callable`
+
+        :return: The return value of the function
+        :rtype: :class:`typing.Any`
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__parse_executor, func, *args
+        )
+
+    async def _get(
+        self,
+        memoized: Memoized,
+        resource: Resource,
+        scrape: Callable[[int, bytes], Any],
+        _id: int,
+    ) -> Any:
+        """Fetch and scrape an entity through the same memory cache as the controller method it mirrors
+
+        :param memoized: The memoized controller method, such as :func:`PlayerController.get_player`
+        :type memoized: :class:`vlrscraper.cache.Memoized`
+
+        :param resource: The resource to fetch
+        :type resource: Resource
+
+        :param scrape: The controller function that scrapes the entity from the resource ID and page data,
+            storing and resolving it like the controller method does
+        :type scrape: :class:`collections.abc.Callable`
+
+        :param _id: The ID of the resource
+        :type _id: int
+
+        :return: The entity, or None if it could not be fetched
+        :rtype: :class:`typing.Any`
+        """
+        if (value := memoized.get_cached(_id)) is not None:
+            return value
+        if not (data := await self._fetch(resource, _id))["success"]:
+            return None
+        value = await self._parse(scrape, _id, data["data"])
+        memoized.remember(_id, value)
+        return value
+
+    async def get_player(self, _id: int) -> Optional[Player]:
+        """Scrape a player's data given a valid vlr.gg player ID. See :func:`PlayerController.get_player`
+
+        :param _id: The ID of the player
+        :type _id: int
+
+        :return: The player data
+        :rtype: Optional[Player]
+        """
+        return await self._get(
+            PlayerController.get_player,
+            player_resource,
+            PlayerController.scrape_player,
+            _id,
+        )
+
+    async def get_team(self, _id: int) -> Optional[Team]:
+        """Scrape the team data from vlr.gg given a valid team ID. See :func:`TeamController.get_team`
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :return: The team data, or None if the ID is invalid
+        :rtype: Optional[Team]
+        """
+        return await self._get(
+            TeamController.get_team, team_resource, TeamController.scrape_team, _id
+        )
+
+    async def get_match(self, _id: int) -> Optional[Match]:
+        """Scrape the data of a match given a valid vlr.gg match ID. See :func:`MatchController.get_match`
+
+        :param _id: The ID of the match
+        :type _id: int
+
+        :return: The match data
+        :rtype: Optional[Match]
+        """
+        if (store := get_store()) is not None and (
+            match := await asyncio.get_running_loop().run_in_executor(
+                self.__fetch_executor, store.get_match, _id
+            )
+        ) is not None:
+            return match
+        return await self._get(
+            MatchController.get_match,
+            match_resource,
+            MatchController.scrape_match,
+            _id,
+        )
+
+    async def get_matches(self, ids: List[int]) -> List[Match]:
+        """Scrape many matches concurrently
+
+        :param ids: The vlr.gg IDs of the matches
+        :type ids: List[int]
+
+        :return: The matches that could be scraped, newest first
+        :rtype: List[Match]
+        """
+        matches = await asyncio.gather(*(self.get_match(_id) for _id in ids))
+        return sorted(
+            (m for m in matches if m is not None),
+            key=lambda m: m.get_date(),
+            reverse=True,
+        )
+
+    async def get_player_matches(
+        self, _id: int, _from: Union[float, TimeWindow], to: Optional[float] = None
+    ) -> List[Match]:
+        """Get a player's valorant matches within the given timeframe
+
+        :param _id: The vlr.gg ID of the player
+        :type _id: int
+
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
+
+        :return: A list of matches that occurred between the two given timestamps
+        :rtype: List[Match]
+        """
+        ids = await asyncio.get_running_loop().run_in_executor(
+            self.__fetch_executor, MatchController.get_player_match_ids, _id, _from, to
+        )
+        return await self.get_matches(ids)
+
+    async def get_team_matches(
+        self, _id: int, _from: Union[float, TimeWindow], to: Optional[float] = None
+    ) -> List[Match]:
+        """Get a team's valorant matches within the given timeframe
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
+
+        :return: A list of matches that occurred between the two given timestamps
+        :rtype: List[Match]
+        """
+        ids = await asyncio.get_running_loop().run_in_executor(
+            self.__fetch_executor, MatchController.get_team_match_ids, _id, _from, to
+        )
+        return await self.get_matches(ids)
@@ -0,0 +1,427 @@
+"""This module implements caches that stop vlrscraper from fetching the same data twice
+
+Implements:
+    - `ResponseCache`, a persistent, size-bounded LRU cache of HTTP responses stored in SQLite
+    - `MemoryCache`, a thread-safe in-memory LRU cache of fetched pages and scraped entities
+    - `get_memory_cache` / `set_memory_cache`, functions to get or swap the process-wide memory cache
+    - `memoize`, a decorator that caches a controller method's results by resource URL, as a `Memoized`
+"""
+
+import time
+import zlib
+import sqlite3
+import threading
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Union, Tuple, Any, Hashable, Callable, TYPE_CHECKING
+
+from vlrscraper.logger import get_logger
+
+if TYPE_CHECKING:
+    from vlrscraper.resource import Resource
+
+_logger = get_logger()
+
+# The number of seconds a cached page stays fresh for, None if it never expires, or a function that gets
+# either from the body of the cached page
+TTL = Union[float, None, Callable[[bytes], Optional[float]]]
+
+
+class ResponseCache:
+    """A persistent cache of HTTP response bodies keyed by URL
+
+    Bodies are stored zlib-compressed in a SQLite database along with any `ETag` / `Last-Modified`
+    validators the server sent, so stale entries can be revalidated with a conditional request instead of
+    being downloaded again. When the compressed bodies outgrow `max_size`, the least recently used
+    entries are evicted.
+
+    .. code-block:: python
+
+        set_transport(Transport(cache=ResponseCache("vlr_cache.sqlite")))
+
+    :param path: The path of the SQLite database, defaults to ":memory:"
+    :type path: str, optional
+
+    :param max_size: The maximum number of compressed bytes to store, defaults to 256MB
+    :type max_size: int, optional
+    """
+
+    def __init__(self, path: str = ":memory:", max_size: int = 256 * 1024 * 1024):
+        if max_size <= 0:
+            raise ValueError("Cache size must be a positive integer.")
+
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+        self.__stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored REAL NOT NULL,
+                accessed REAL NOT NULL
+            )"""
+        )
+        self.__db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self.__db.commit()
+
+    def get(self, url: str, ttl: TTL) -> Optional[dict]:
+        """Look up the cached response for a URL
+
+        Stale entries are still returned, with `fresh` set to False, so that they can be revalidated.
+
+        :param url: The url of the response
+        :type url: str
+
+        :param ttl: The number of seconds a response stays fresh for, None if it never expires, or a function
+            that gets either from the cached body
+        :type ttl: TTL
+
+        :return: A dict of the `content`, `etag`, `last_modified` and `fresh` flag of the entry, or None
+        :rtype: Optional[dict]
+        """
+        now = time.time()
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT content, etag, last_modified, stored FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                self.__stats["misses"] += 1
+                return None
+
+            self.__db.execute(
+                "UPDATE responses SET accessed = ? WHERE url = ?", (now, url)
+            )
+            self.__db.commit()
+
+        content = zlib.decompress(row[0])
+        if callable(ttl):
+            ttl = ttl(content)
+        fresh = ttl is None or now - row[3] < ttl
+        with self.__lock:
+            self.__stats["hits" if fresh else "misses"] += 1
+
+        return {
+            "content": content,
+            "etag": row[1],
+            "last_modified": row[2],
+            "fresh": fresh,
+        }
+
+    def put(
+        self,
+        url: str,
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a response, evicting the least recently used entries if the cache is full
+
+        :param url: The url of the response
+        :type url: str
+
+        :param content: The body of the response
+        :type content: bytes
+
+        :param etag: The `ETag` header sent with the response, defaults to None
+        :type etag: Optional[str]
+
+        :param last_modified: The `Last-Modified` header sent with the response, defaults to None
+        :type last_modified: Optional[str]
+        """
+        compressed = zlib.compress(content)
+        if len(compressed) > self.__max_size:
+            _logger.warning(f"Response from {url} is too large to cache.")
+            return
+
+        now = time.time()
+        with self.__lock:
+            self.__db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, compressed, len(compressed), etag, last_modified, now, now),
+            )
+            self.__evict()
+            self.__db.commit()
+
+    def refresh(self, url: str) -> None:
+        """Mark a stale entry as fresh again after the server confirmed it has not changed
+
+        :param url: The url of the response
+        :type url: str
+        """
+        with self.__lock:
+            self.__stats["revalidated"] += 1
+            self.__db.execute(
+                "UPDATE responses SET stored = ? WHERE url = ?", (time.time(), url)
+            )
+            self.__db.commit()
+
+    def __evict(self) -> None:
+        """Delete the least recently used entries until the cache fits in its size limit"""
+        size = self.__db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if size <= self.__max_size:
+            return
+
+        evicted = []
+        for url, entry_size in self.__db.execute(
+            "SELECT url, size FROM responses ORDER BY accessed ASC"
+        ).fetchall():
+            if size <= self.__max_size:
+                break
+            evicted.append((url,))
+            size -= entry_size
+
+        self.__db.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        self.__stats["evictions"] += len(evicted)
+
+    def get_stats(self) -> dict:
+        """Get the hit, miss, revalidation and eviction counters of the cache
+
+        :return: The counters, along with the number of entries and their total compressed size
+        :rtype: dict
+        """
+        with self.__lock:
+            entries, size = self.__db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return {**self.__stats, "entries": entries, "size": size}
+
+    def clear(self) -> None:
+        """Delete every cached response"""
+        with self.__lock:
+            self.__db.execute("DELETE FROM responses")
+            self.__db.commit()
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self.__lock:
+            self.__db.close()
+
+
+class MemoryCache:
+    """A thread-safe, in-memory LRU cache
+
+    Used process-wide to hold the raw bytes of fetched pages and finished
+    :class:`vlrscraper.resources.Player`, :class:`vlrscraper.resources.Team` and
+    :class:`vlrscraper.resources.Match` objects, keyed by the URL they were scraped from, so that
+    scraping the same page more than once only fetches it once.
+
+    :param max_entries: The maximum number of entries to keep, or 0 to disable the cache, defaults to 256
+    :type max_entries: int, optional
+
+    :param max_age: The number of seconds an entry is kept for, or None to keep entries until they are
+        evicted, defaults to 300
+    :type max_age: Optional[float], optional
+    """
+
+    def __init__(self, max_entries: int = 256, max_age: Optional[float] = 300) -> None:
+        if max_entries < 0:
+            raise ValueError("Cache entry count must not be negative.")
+
+        self.__max_entries = max_entries
+        self.__max_age = max_age
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get the value stored under a key
+
+        :param key: The key of the entry
+        :type key: :class:`typing.Hashable`
+
+        :return: The value, or None if there is no entry for the key or it is too old
+        :rtype: Optional[:class:`typing.Any`]
+        """
+        with self.__lock:
+            if (entry := self.__entries.get(key)) is None or (
+                self.__max_age is not None and time.time() - entry[0] >= self.__max_age
+            ):
+                self.__entries.pop(key, None)
+                self.__stats["misses"] += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if the cache is full
+
+        :param key: The key of the entry
+        :type key: :class:`typing.Hashable`
+
+        :param value: The value to store
+        :type value: :class:`typing.Any`
+        """
+        if self.__max_entries == 0:
+            return
+
+        with self.__lock:
+            self.__entries[key] = (time.time(), value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get the value stored under a key, or create and store it if there is none
+
+        Values of None are returned but not stored, so failed scrapes are retried next time.
+
+        :param key: The key of the entry
+        :type key: :class:`typing.Hashable`
+
+        :param factory: A function that creates the value
+        :type factory: :class:`collections.abc.Callable`
+
+        :return: The value
+        :rtype: :class:`typing.Any`
+        """
+        if (value := self.get(key)) is not None:
+            return value
+        if (value := factory()) is not None:
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Delete every entry"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get the hit and miss counters of the cache
+
+        :return: The counters, along with the number of entries
+        :rtype: dict
+        """
+        with self.__lock:
+            return {**self.__stats, "entries": len(self.__entries)}
+
+
+class _MemoryCacheConfig:
+    cache = MemoryCache()
+    lock = threading.Lock()
+
+
+def get_memory_cache() -> MemoryCache:
+    """Get the process-wide cache of fetched pages and scraped entities
+
+    :return: The memory cache
+    :rtype: MemoryCache
+    """
+    with _MemoryCacheConfig.lock:
+        return _MemoryCacheConfig.cache
+
+
+def set_memory_cache(cache: MemoryCache) -> None:
+    """Swap the process-wide cache of fetched pages and scraped entities
+
+    .. code-block:: python
+
+        # Keep up to 10000 entities for an hour
+        set_memory_cache(MemoryCache(max_entries=10000, max_age=3600))
+
+        # Never memoize anything
+        set_memory_cache(MemoryCache(max_entries=0))
+
+    :param cache: The new memory cache
+    :type cache: MemoryCache
+    """
+    with _MemoryCacheConfig.lock:
+        _MemoryCacheConfig.cache = cache
+
+
+class Memoized:
+    """A function taking a resource ID whose results are kept in the memory cache. See :func:`memoize`
+
+    Callers that fetch and scrape the resource themselves, such as :class:`vlrscraper.async_client.AsyncClient`,
+    can share the same entries with :func:`get_cached` and :func:`remember`.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[int], Any],
+        kind: str,
+        resource: "Resource",
+        keep: Optional[Callable[[Any], bool]] = None,
+    ) -> None:
+        wraps(func)(self)
+        self.__func = func
+        self.__kind = kind
+        self.__resource = resource
+        self.__keep = keep
+
+    def __call__(self, _id: int) -> Any:
+        if (value := self.get_cached(_id)) is not None:
+            return value
+        value = self.__func(_id)
+        self.remember(_id, value)
+        return value
+
+    def __key(self, _id: int) -> Optional[Tuple[str, str]]:
+        if not (url := self.__resource.get_url(_id)) or self.__resource.get_ttl() == 0:
+            return None
+        return (self.__kind, url)
+
+    def get_cached(self, _id: int) -> Optional[Any]:
+        """Get the result kept for a resource ID
+
+        :param _id: The resource (vlr) ID
+        :type _id: int
+
+        :return: The result, or None if no result is kept for the ID
+        :rtype: Optional[:class:`typing.Any`]
+        """
+        if (key := self.__key(_id)) is None:
+            return None
+        return get_memory_cache().get(key)
+
+    def remember(self, _id: int, value: Any) -> None:
+        """Keep a result for a resource ID, unless it is None or should not be kept
+
+        :param _id: The resource (vlr) ID
+        :type _id: int
+
+        :param value: The result
+        :type value: :class:`typing.Any`
+        """
+        if (key := self.__key(_id)) is None or value is None:
+            return
+        if self.__keep is None or self.__keep(value):
+            get_memory_cache().set(key, value)
+
+
+def memoize(
+    kind: str, resource: "Resource", keep: Optional[Callable[[Any], bool]] = None
+) -> Callable[[Callable[[int], Any]], Memoized]:
+    """Decorate a function taking a resource ID so that its results are kept in the memory cache,
+    keyed by the kind of result and the URL of the resource it was scraped from.
+    Results are not kept for resources with a TTL of 0.
+
+    Results are kept as they are rather than copied, so players and teams stay the canonical instances of
+    the :class:`vlrscraper.registry.EntityRegistry` and every call returns the same objects.
+
+    :param kind: The kind of result the function returns, such as "player"
+    :type kind: str
+
+    :param resource: The resource the function scrapes
+    :type resource: Resource
+
+    :param keep: A function that checks whether a result may be kept, such as whether a match has finished,
+        defaults to keeping every result
+    :type keep: :class:`collections.abc.Callable`, optional
+
+    :return: The decorator
+    :rtype: :class:`collections.abc.Callable`
+    """
+    return lambda func: Memoized(func, kind, resource, keep)
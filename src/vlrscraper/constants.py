@@ -1,42 +1,124 @@
-"""Contains XPATH constants for scraping"""
+"""Contains XPATH constants for scraping
 
-from .scraping import xpath, join
+Every constant is a precompiled :class:`lxml.etree.XPath`, so each expression is compiled once at import
+rather than on every query of every page. The source string of a constant is available from its `path`
+attribute, and constants can be combined with :func:`vlrscraper.scraping.join` like strings.
 
+The `_REGION` constants are bytes that only appear in the opening tag of a region of a page, used to cut
+that region out with :func:`vlrscraper.scraping.extract_element` before parsing.
+"""
 
-PLAYER_DISPLAYNAME = xpath("h1", class_="wf-title")
-PLAYER_FULLNAME = xpath("h2", class_="player-real-name")
-PLAYER_IMAGE_SRC = join(xpath("div", class_="wf-avatar"), "img")
-PLAYER_CURRENT_TEAM = f"({xpath('a', class_='wf-module-item mod-first')})[1]"
-PLAYER_INACTIVE_CHECK = "(//a[contains(@class, 'wf-module-item mod-first')])[1]//div[contains(@class, 'ge-text-light')]"
+from typing import Dict
 
-PLAYER_TEAMS = "(((//div[contains(@class, 'wf-card')])[3] | (//div[contains(@class, 'wf-card')])[4])//a[contains(@class, 'wf-module-item')])"
+from lxml.etree import XPath
 
-PLAYER_MATCHES = xpath("a", class_="wf-card")
-PLAYER_MATCH_DATES = join(PLAYER_MATCHES, xpath("div", class_="m-item-date"))
+from .scraping import xpath, join, compile_xpath
 
-TEAM_DISPLAY_NAME = xpath("h1", class_="wf-title")
-TEAM_TAG = xpath("h2", class_="team-header-tag")
-TEAM_IMG = join(xpath("div", class_="wf-avatar"), "img")
-TEAM_ROSTER_ITEMS = join(xpath("div", class_="team-roster-item"), "a")
-TEAM_ROSTER_ITEM_ALIAS = xpath("div", class_="team-roster-item-name-alias")
-TEAM_ROSTER_ITEM_FULLNAME = xpath("div", class_="team-roster-item-name-real")
-TEAM_ROSTER_ITEM_IMAGE = join(xpath("div", class_="team-roster-item-img"), "img")
 
-TEAM_MATCHES = (
+PLAYER_DISPLAYNAME = compile_xpath(xpath("h1", class_="wf-title"))
+PLAYER_FULLNAME = compile_xpath(xpath("h2", class_="player-real-name"))
+PLAYER_IMAGE_SRC = compile_xpath(join(xpath("div", class_="wf-avatar"), "img"))
+PLAYER_CURRENT_TEAM = compile_xpath(
+    f"({xpath('a', class_='wf-module-item mod-first')})[1]"
+)
+PLAYER_CURRENT_TEAM_IMG = compile_xpath(join(PLAYER_CURRENT_TEAM, "img")[2:])
+PLAYER_CURRENT_TEAM_NAME = compile_xpath(
+    join(PLAYER_CURRENT_TEAM, "div[2]", "div[1]")[2:]
+)
+PLAYER_INACTIVE_CHECK = compile_xpath(
+    "(//a[contains(@class, 'wf-module-item mod-first')])[1]//div[contains(@class, 'ge-text-light')]"
+)
+
+PLAYER_TEAMS = compile_xpath(
+    "(((//div[contains(@class, 'wf-card')])[3] | (//div[contains(@class, 'wf-card')])[4])//a[contains(@class, 'wf-module-item')])"
+)
+# Evaluated relative to a single PLAYER_TEAMS item
+PLAYER_TEAM_NAME = compile_xpath("./div[2]/div[1]")
+PLAYER_TEAM_IMG = compile_xpath(".//img")
+PLAYER_TEAM_DATES = compile_xpath(xpath("div", root=".", class_="ge-text-light"))
+
+PLAYER_MATCHES = compile_xpath(xpath("a", class_="wf-card"))
+PLAYER_MATCH_DATES = compile_xpath(
+    join(PLAYER_MATCHES, xpath("div", class_="m-item-date"))
+)
+
+TEAM_DISPLAY_NAME = compile_xpath(xpath("h1", class_="wf-title"))
+TEAM_TAG = compile_xpath(xpath("h2", class_="team-header-tag"))
+TEAM_IMG = compile_xpath(join(xpath("div", class_="wf-avatar"), "img"))
+TEAM_ROSTER_ITEM = compile_xpath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' team-roster-item ')]"
+)
+# Evaluated relative to a single TEAM_ROSTER_ITEM
+TEAM_ROSTER_ITEM_LINK = compile_xpath("./a")
+TEAM_ROSTER_ITEM_ALIAS = compile_xpath(
+    xpath("div", root=".", class_="team-roster-item-name-alias")
+)
+TEAM_ROSTER_ITEM_FULLNAME = compile_xpath(
+    xpath("div", root=".", class_="team-roster-item-name-real")
+)
+TEAM_ROSTER_ITEM_IMAGE = compile_xpath(
+    join(xpath("div", root=".", class_="team-roster-item-img"), "img")[2:]
+)
+TEAM_ROSTER_ITEM_TAG = compile_xpath(xpath("div", root=".", class_="wf-tag"))
+
+TEAM_MATCHES = compile_xpath(
     "//a[contains(@class, 'wf-card') and not(contains(@class, 'm-item-games-item'))]"
 )
-TEAM_MATCH_DATES = join(TEAM_MATCHES, xpath("div", class_="m-item-date"))
+TEAM_MATCH_DATES = compile_xpath(join(TEAM_MATCHES, xpath("div", class_="m-item-date")))
 
-MATCH_EVENT_NAME = "(//a[contains(@class, 'match-header-event')]//div//div)[1]"
-MATCH_NAME = "(//a[contains(@class, 'match-header-event')]//div//div)[2]"
+MATCH_EVENT_NAME = compile_xpath(
+    "(//a[contains(@class, 'match-header-event')]//div//div)[1]"
+)
+MATCH_NAME = compile_xpath("(//a[contains(@class, 'match-header-event')]//div//div)[2]")
+
+MATCH_TEAMS = compile_xpath(xpath("a", class_="match-header-link"))
+
+MATCH_TEAM_NAMES = compile_xpath(join(MATCH_TEAMS, xpath("div", class_="wf-title-med")))
+MATCH_TEAM_LOGOS = compile_xpath(join(MATCH_TEAMS, "img"))
 
-MATCH_TEAMS = xpath("a", class_="match-header-link")
+MATCH_DATE = compile_xpath("//div[@class='moment-tz-convert'][1]")
+
+MATCH_PLAYER_TABLE = compile_xpath(
+    "//div[@class='vm-stats-game mod-active']//tbody//tr//td//a"
+)
+MATCH_PLAYER_NAMES = compile_xpath(join(MATCH_PLAYER_TABLE, "div[1]"))
+MATCH_PLAYER_STATS = compile_xpath(
+    "//div[@class='vm-stats-game mod-active']//tbody//tr//td//span[contains(@class, 'mod-both')]"
+)
+MATCH_PLAYER_STATS_ATTACK = compile_xpath(
+    "//div[@class='vm-stats-game mod-active']//tbody//tr//td//span[contains(concat(' ', @class, ' '), ' mod-t ')]"
+)
+MATCH_PLAYER_STATS_DEFENSE = compile_xpath(
+    "//div[@class='vm-stats-game mod-active']//tbody//tr//td//span[contains(concat(' ', @class, ' '), ' mod-ct ')]"
+)
 
-MATCH_TEAM_NAMES = join(MATCH_TEAMS, xpath("div", class_="wf-title-med"))
-MATCH_TEAM_LOGOS = join(MATCH_TEAMS, "img")
+# The stats table of each map, not including the all-maps table
+MATCH_MAPS = compile_xpath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' vm-stats-game ') and @data-game-id != 'all']"
+)
+# Relative to an element of MATCH_MAPS
+MATCH_MAP_NAME = compile_xpath(
+    "./div[@class='vm-stats-game-header']//div[@class='map']/div[1]/span"
+)
+MATCH_MAP_PLAYERS = compile_xpath(".//tbody//tr//td//a")
+MATCH_MAP_STATS = compile_xpath(".//tbody//tr//td//span[contains(@class, 'mod-both')]")
+MATCH_MAP_STATS_ATTACK = compile_xpath(
+    ".//tbody//tr//td//span[contains(concat(' ', @class, ' '), ' mod-t ')]"
+)
+MATCH_MAP_STATS_DEFENSE = compile_xpath(
+    ".//tbody//tr//td//span[contains(concat(' ', @class, ' '), ' mod-ct ')]"
+)
 
-MATCH_DATE = "//div[@class='moment-tz-convert'][1]"
+# The header of a match page, holding its name, event, date and teams
+MATCH_HEADER_REGION = b' match-header"'
+# The note above the score of a match page, reading "final" once the match has finished
+MATCH_STATUS_REGION = b'class="match-header-vs-note"'
+# The stats table of the map shown when a match page is opened, holding every player's stats
+MATCH_STATS_REGION = b'class="vm-stats-game mod-active"'
+# Every stats table of a match page, including the table of each map
+MATCH_MAPS_REGION = b'class="vm-stats-container"'
 
-MATCH_PLAYER_TABLE = "//div[@class='vm-stats-game mod-active']//tbody//tr//td//a"
-MATCH_PLAYER_NAMES = join(MATCH_PLAYER_TABLE, "div[1]")
-MATCH_PLAYER_STATS = "//div[@class='vm-stats-game mod-active']//tbody//tr//td//span[contains(@class, 'mod-both')]"
+#: Every XPATH constant in this module, keyed by name
+REGISTRY: Dict[str, XPath] = {
+    name: value for name, value in list(globals().items()) if isinstance(value, XPath)
+}
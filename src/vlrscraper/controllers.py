@@ -1,19 +1,41 @@
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Iterable, Iterator, Callable, Union, Any
 
-import time
+from contextlib import closing
+from dataclasses import astuple
 from lxml import html
+from lxml.etree import XPath
 
 import vlrscraper.constants as const
+from vlrscraper.cache import memoize
 from vlrscraper.logger import get_logger
-from vlrscraper.scraping import XpathParser, join, ThreadedMatchScraper
-from vlrscraper.resources import Player, PlayerStatus, Team, PlayerStats, Match
+from vlrscraper.registry import get_registry
+from vlrscraper.store import get_store
+from vlrscraper.resource import Resource, ResourceResponse
+from vlrscraper.scraping import (
+    XpathParser,
+    ThreadedMatchScraper,
+    Paginator,
+    extract_element,
+    fetch_many,
+)
+from vlrscraper.resources import (
+    Player,
+    PlayerStatus,
+    Team,
+    PlayerStats,
+    Match,
+    MapStats,
+)
 from vlrscraper.vlr_resources import (
+    is_match_final,
     team_resource,
     match_resource,
     player_resource,
     player_match_resource,
+    team_match_resource,
 )
 from vlrscraper.utils import (
+    TimeWindow,
     parse_stat,
     get_url_segment,
     resolve_vlr_image,
@@ -23,11 +45,45 @@ from vlrscraper.utils import (
 
 _logger = get_logger()
 
+# The regions of a match page that each parse mode reads, or None to parse the whole page
+MATCH_PARSE_MODES: Dict[str, Optional[Tuple[bytes, ...]]] = {
+    "full": None,
+    "maps": (const.MATCH_HEADER_REGION, const.MATCH_MAPS_REGION),
+    "stats": (const.MATCH_HEADER_REGION, const.MATCH_STATS_REGION),
+    "header": (const.MATCH_HEADER_REGION,),
+}
+
+
+def _scrape(_id: int, resource: Resource, scrape: Callable[[int, bytes], Any]) -> dict:
+    """Fetch a resource and scrape an entity from its data, reporting why if either step fails
+
+    :param _id: The vlr.gg ID of the resource
+    :type _id: int
+
+    :param resource: The resource to fetch
+    :type resource: Resource
+
+    :param scrape: A function that scrapes the entity from the resource ID and page data
+    :type scrape: :class:`collections.abc.Callable`
+
+    :return: A :class:`vlrscraper.resource.ResourceResponse` dict, with the entity as its `data` on success
+    :rtype: dict
+    """
+    attempts = 1
+    try:
+        if not (response := resource.get_data(_id))["success"]:
+            return response
+        attempts = response["attempts"]
+        return ResourceResponse.success(scrape(_id, response["data"]), attempts)
+    except Exception as e:
+        return ResourceResponse.scrape_failed(_id, e, attempts)
+
 
 class PlayerController:
     """Contains all methods for scraping player data"""
 
     @staticmethod
+    @memoize("player", player_resource)
     def get_player(_id: int) -> Optional[Player]:
         """Scrape a player's data given a valid vlr.gg player ID
 
@@ -45,7 +101,99 @@ class PlayerController:
         """
         if (parser := player_resource.get_parser(_id)) is None:
             return None
+        return PlayerController.__resolve(PlayerController.parse_player(_id, parser))
+
+    @staticmethod
+    def get_players(ids: Iterable[int]) -> Dict[int, dict]:
+        """Scrape many players at once on the shared worker pool. See :func:`vlrscraper.scraping.fetch_many`
 
+        .. code-block:: python
+
+            players = PlayerController.get_players([29873, 31207, -1])
+            players[29873]["data"].get_display_name()    # "benjyfishy"
+            players[-1]["success"]                       # False
+
+        :param ids: The vlr.gg IDs of the players
+        :type ids: Iterable[int]
+
+        :return: A dictionary mapping each ID, in the order given, to a
+            :class:`vlrscraper.resource.ResourceResponse` dict with the Player as its `data` if it was scraped
+        :rtype: Dict[int, dict]
+        """
+        ids = list(ids)
+        responses = dict(PlayerController.iter_players(ids))
+        return {_id: responses[_id] for _id in ids}
+
+    @staticmethod
+    def iter_players(ids: Iterable[int]) -> Iterator[Tuple[int, dict]]:
+        """Scrape many players at once on the shared worker pool, yielding each player as soon as it is scraped
+
+        :param ids: The vlr.gg IDs of the players
+        :type ids: Iterable[int]
+
+        :return: A generator of (ID, response) tuples in the order they finish, where each response is a
+            :class:`vlrscraper.resource.ResourceResponse` dict with the Player as its `data` if it was scraped
+        :rtype: Iterator[Tuple[int, dict]]
+        """
+        return fetch_many(
+            ids,
+            lambda _id: _scrape(
+                _id,
+                player_resource,
+                PlayerController.scrape_player,
+            ),
+        )
+
+    @staticmethod
+    def scrape_player(_id: int, data: bytes) -> Player:
+        """Parse a fetched player page, storing the player and resolving them with the entity registry the
+        same way as :func:`get_player`
+
+        :param _id: The ID of the player
+        :type _id: int
+
+        :param data: The byte data of the player page
+        :type data: bytes
+
+        :return: The player data
+        :rtype: Player
+        """
+        return PlayerController.__resolve(
+            PlayerController.parse_player(
+                _id, XpathParser.from_chunks((data,), prune=True)
+            )
+        )
+
+    @staticmethod
+    def __resolve(player: Player) -> Player:
+        """Store a scraped player and resolve them with the entity registry, if either is set
+
+        :param player: The scraped player
+        :type player: Player
+
+        :return: The canonical instance of the player
+        :rtype: Player
+        """
+        if (store := get_store()) is not None:
+            store.put_player(player)
+        # The player page is the latest word on the player, so it replaces their old team and status
+        if (registry := get_registry()) is not None:
+            return registry.player(player, overwrite=True)
+        return player
+
+    @staticmethod
+    def parse_player(_id: int, parser: XpathParser) -> Player:
+        """Parse a player's data from their vlr.gg player page
+
+        :param _id: The ID of the player
+        :type _id: int
+
+        :param parser: An XpathParser representing the player's vlr.gg page
+        :type parser: XpathParser
+
+        :return: The player data
+        :rtype: Player
+        """
         player_alias = parser.get_text(const.PLAYER_DISPLAYNAME)
         player_image = f"https:{parser.get_img(const.PLAYER_IMAGE_SRC)}"
         player_name = parse_first_last_name(parser.get_text(const.PLAYER_FULLNAME))
@@ -86,45 +234,36 @@ class PlayerController:
         :return: A list of players that are present on the team vlr.gg page
         :rtype: List[Player]
         """
-        player_ids = [
-            get_url_segment(str(url), 2, rtype=int)
-            for url in parser.get_elements(const.TEAM_ROSTER_ITEMS, "href")
-        ]
-        player_aliases = parser.get_text_many(const.TEAM_ROSTER_ITEM_ALIAS)
-        player_fullnames = [
-            parse_first_last_name(name)
-            for name in parser.get_text_many(const.TEAM_ROSTER_ITEM_FULLNAME)
-        ]
-        player_images = [
-            f"https:{img}"
-            for img in parser.get_elements(const.TEAM_ROSTER_ITEM_IMAGE, "src")
-        ]
-        player_tags = [
-            parser.get_text(
-                f"//a[contains(@href, '{p.lower()}')]//div[contains(@class, 'wf-tag')]"
+        players = []
+        # Read every field relative to its own roster item, so one pass over the roster is enough
+        for element in parser.get_elements(const.TEAM_ROSTER_ITEM):
+            item = XpathParser.from_element(element)  # type: ignore
+            forename, surname = parse_first_last_name(
+                "".join(item.get_text_many(const.TEAM_ROSTER_ITEM_FULLNAME))
             )
-            for p in player_aliases
-        ]
-        return [
-            Player.from_team_page(
-                pid,
-                player_aliases[i],
-                player_fullnames[i][0],
-                player_fullnames[i][1],
-                team,
-                image=player_images[i],
-                status=PlayerStatus.INACTIVE
-                if player_tags[i] == "Inactive"
-                else PlayerStatus.ACTIVE,
+            players.append(
+                Player.from_team_page(
+                    get_url_segment(
+                        item.get_href(const.TEAM_ROSTER_ITEM_LINK), 2, rtype=int
+                    ),
+                    "".join(item.get_text_many(const.TEAM_ROSTER_ITEM_ALIAS)),
+                    forename,
+                    surname,
+                    team,
+                    image=resolve_vlr_image(item.get_img(const.TEAM_ROSTER_ITEM_IMAGE)),
+                    status=PlayerStatus.INACTIVE
+                    if item.get_text(const.TEAM_ROSTER_ITEM_TAG) == "Inactive"
+                    else PlayerStatus.ACTIVE,
+                )
             )
-            for i, pid in enumerate(player_ids)
-        ]
+        return players
 
 
 class TeamController:
     """Contains all methods relating to scraping Team data"""
 
     @staticmethod
+    @memoize("team", team_resource)
     def get_team(_id: int) -> Optional[Team]:
         """Scrape the team data from vlr.gg given a valid team ID
 
@@ -137,7 +276,87 @@ class TeamController:
 
         if (parser := team_resource.get_parser(_id)) is None:
             return None
+        return TeamController.__resolve(TeamController.parse_team(_id, parser))
+
+    @staticmethod
+    def get_teams(ids: Iterable[int]) -> Dict[int, dict]:
+        """Scrape many teams at once on the shared worker pool. See :func:`PlayerController.get_players`
+
+        :param ids: The vlr.gg IDs of the teams
+        :type ids: Iterable[int]
+
+        :return: A dictionary mapping each ID, in the order given, to a
+            :class:`vlrscraper.resource.ResourceResponse` dict with the Team as its `data` if it was scraped
+        :rtype: Dict[int, dict]
+        """
+        ids = list(ids)
+        responses = dict(TeamController.iter_teams(ids))
+        return {_id: responses[_id] for _id in ids}
+
+    @staticmethod
+    def iter_teams(ids: Iterable[int]) -> Iterator[Tuple[int, dict]]:
+        """Scrape many teams at once on the shared worker pool, yielding each team as soon as it is scraped
+
+        :param ids: The vlr.gg IDs of the teams
+        :type ids: Iterable[int]
+
+        :return: A generator of (ID, response) tuples in the order they finish, where each response is a
+            :class:`vlrscraper.resource.ResourceResponse` dict with the Team as its `data` if it was scraped
+        :rtype: Iterator[Tuple[int, dict]]
+        """
+        return fetch_many(
+            ids,
+            lambda _id: _scrape(
+                _id,
+                team_resource,
+                TeamController.scrape_team,
+            ),
+        )
+
+    @staticmethod
+    def scrape_team(_id: int, data: bytes) -> Team:
+        """Parse a fetched team page, storing the team the same way as :func:`get_team`
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :param data: The byte data of the team page
+        :type data: bytes
+
+        :return: The team data
+        :rtype: Team
+        """
+        return TeamController.__resolve(
+            TeamController.parse_team(_id, XpathParser.from_chunks((data,), prune=True))
+        )
+
+    @staticmethod
+    def __resolve(team: Team) -> Team:
+        """Store a scraped team, if an entity store is set
 
+        :param team: The scraped team
+        :type team: Team
+
+        :return: The team
+        :rtype: Team
+        """
+        if (store := get_store()) is not None:
+            store.put_team(team)
+        return team
+
+    @staticmethod
+    def parse_team(_id: int, parser: XpathParser) -> Team:
+        """Parse the team data from a team's vlr.gg page
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :param parser: An XpathParser representing the team's vlr.gg page
+        :type parser: XpathParser
+
+        :return: The team data
+        :rtype: Team
+        """
         from vlrscraper.controllers import PlayerController
 
         team = Team.from_team_page(
@@ -164,11 +383,8 @@ class TeamController:
         :return: The team data
         :rtype: Team
         """
-        imgpath = join(const.PLAYER_CURRENT_TEAM, "img")[2:]
-        namepath = join(const.PLAYER_CURRENT_TEAM, "div[2]", "div[1]")[2:]
-
-        team_name = parser.get_text(namepath)
-        team_image = f"https:{parser.get_img(imgpath)}"
+        team_name = parser.get_text(const.PLAYER_CURRENT_TEAM_NAME)
+        team_image = f"https:{parser.get_img(const.PLAYER_CURRENT_TEAM_IMG)}"
         team_id = get_url_segment(
             parser.get_href(const.PLAYER_CURRENT_TEAM), 2, rtype=int
         )
@@ -176,13 +392,14 @@ class TeamController:
         return Team.from_player_page(team_id, team_name, team_image)
 
     @staticmethod
+    @memoize("team_history", player_resource)
     def get_player_team_history(_id: int) -> List[Team]:
         """Get the team history of a player given their vlr.gg ID
 
         :param _id: The ID of the player
         :type _id: int
 
-        :return: A list of teams that the player has been a part of
+        :return: A list of teams that the player has been a part of, along with when they joined and left each
         :rtype: list[Team]
         """
         if (parser := player_resource.get_parser(_id)) is None:
@@ -190,22 +407,64 @@ class TeamController:
 
         parsed_teams: List[Team] = []
 
-        team = 1
-        while team_link := parser.get_href(f"{const.PLAYER_TEAMS}[{team}]"):
-            team_id = get_url_segment(team_link, 2, int)
-            team_name = parser.get_text(f"{const.PLAYER_TEAMS}[{team}]//div[2]//div[1]")
-            team_image = parser.get_img(f"{const.PLAYER_TEAMS}[{team}]//img")
+        # Read every field relative to its own history item, so one pass over the history is enough
+        for element in parser.get_elements(const.PLAYER_TEAMS):
+            # The history also links to news articles about roster moves
+            if not (team_link := element.get("href", "")).startswith("/team/"):
+                continue
+            item = XpathParser.from_element(element)  # type: ignore
+            joined, left = TeamController.__parse_history_dates(
+                item.get_text_many(const.PLAYER_TEAM_DATES)
+            )
             parsed_teams.append(
-                Team.from_player_page(team_id, team_name, resolve_vlr_image(team_image))
+                Team.from_player_page(
+                    get_url_segment(team_link, 2, int),
+                    item.get_text(const.PLAYER_TEAM_NAME),
+                    resolve_vlr_image(item.get_img(const.PLAYER_TEAM_IMG)),
+                    joined=joined,
+                    left=left,
+                )
             )
-            team += 1
 
         return parsed_teams
 
+    @staticmethod
+    def __parse_history_dates(
+        dates: List[str],
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Parse the join and leave dates shown under a team in a player's team history
+
+        vlr.gg shows these as "joined in <Month Year>", "left in <Month Year>" or "<Month Year> – <Month Year>",
+        followed by an optional "Inactive from <Month Year>" line which is ignored.
+
+        :param dates: The text of each date line under the team
+        :type dates: List[str]
+
+        :return: A tuple of the epochs the player joined and left the team, each None if not shown
+        :rtype: Tuple[Optional[float], Optional[float]]
+        """
+
+        def parse(date: str) -> Optional[float]:
+            try:
+                return epoch_from_timestamp(f"{date.strip()} -0400", "%B %Y %z")
+            except ValueError:
+                _logger.warning(f"Could not parse team history date {date}")
+                return None
+
+        for line in dates:
+            if line.startswith("joined in "):
+                return parse(line[len("joined in ") :]), None
+            if line.startswith("left in "):
+                return None, parse(line[len("left in ") :])
+            if "\u2013" in line:
+                joined, left = line.split("\u2013", 1)
+                return parse(joined), parse(left)
+        return None, None
+
 
 class MatchController:
-    """Contains all methods relating to scraping match data
-    """
+    """Contains all methods relating to scraping match data"""
+
     @staticmethod
     def __parse_match_stats(
         players: List[int], stats: List[html.HtmlElement]
@@ -247,8 +506,20 @@ class MatchController:
         return player_stats
 
     @staticmethod
-    def parse_match(_id: int, data: bytes) -> Match:
-        """Parse a vlr.gg match page from the bytes returned by :func:`requests.get`
+    def parse_match_record(_id: int, data: bytes, mode: str = "full") -> dict:
+        """Parse a vlr.gg match page into a compact record made only of builtin types
+
+        Records can be pickled cheaply, so the parse can be done in another process and the
+        :class:`Match` rebuilt in the parent with :func:`MatchController.match_from_record`
+
+        The "maps", "stats" and "header" modes cut the regions they read out of the raw page and parse only
+        those, which is several times cheaper than parsing the whole page. If a region cannot be found or does
+        not hold what it should, the whole page is parsed instead.
+
+        .. code-block:: python
+
+            # Only the name, event, date and teams, without rosters or stats
+            record = MatchController.parse_match_record(_id, data, mode="header")
 
         :param _id: The match ID
         :type _id: int
@@ -256,231 +527,823 @@ class MatchController:
         :param data: The byte data of the match page
         :type data: bytes
 
-        :return: The match data
-        :rtype: Match
+        :param mode: "full" to parse the whole page, "maps" to parse only the header and every stats table,
+            "stats" to parse only the header and the stats table of the whole match (leaving out the stats of
+            each map), or "header" to parse only the header, defaults to "full"
+        :type mode: str, optional
+
+        :return: The match record
+        :rtype: dict
         """
-        parser = XpathParser(data)
+        if mode not in MATCH_PARSE_MODES:
+            raise ValueError(f"Unknown match parse mode {mode!r}.")
+        read_stats = mode != "header"
+        read_maps = mode in ("full", "maps")
+        final = is_match_final(data)
+
+        if (regions := MATCH_PARSE_MODES[mode]) is not None:
+            fragments = [extract_element(data, region) for region in regions]
+            if None not in fragments:
+                try:
+                    record = MatchController.__parse_record(
+                        _id, XpathParser.from_chunks(fragments), read_stats, read_maps
+                    )  # type: ignore
+                    if (record["stats"] or not read_stats) and (
+                        record["maps"] or not read_maps
+                    ):
+                        return {**record, "final": final}
+                except (IndexError, ValueError):
+                    pass
+            _logger.warning(
+                f"Could not read the {mode} regions of match {_id}, parsing the whole page"
+            )
 
-        match_player_ids = [
-            get_url_segment(str(x), 2, rtype=int)
-            for x in parser.get_elements(const.MATCH_PLAYER_TABLE, "href")
-        ]
-        match_player_names = parser.get_text_many(const.MATCH_PLAYER_NAMES)
-        match_stats = parser.get_elements(const.MATCH_PLAYER_STATS)
+        record = MatchController.__parse_record(
+            _id, XpathParser.from_chunks((data,), prune=True), read_stats, read_maps
+        )
+        return {**record, "final": final}
 
-        match_stats_parsed = MatchController.__parse_match_stats(
-            match_player_ids, match_stats
-        )  # type: ignore
+    @staticmethod
+    def __parse_record(
+        _id: int, parser: XpathParser, read_stats: bool = True, read_maps: bool = True
+    ) -> dict:
+        """Build a match record from a parsed match page or the regions of one
+
+        :param _id: The match ID
+        :type _id: int
+
+        :param parser: The parser of the match page
+        :type parser: XpathParser
+
+        :param read_stats: Whether to read the players and their stats, defaults to True
+        :type read_stats: bool, optional
+
+        :param read_maps: Whether to read the stats of each map, defaults to True
+        :type read_maps: bool, optional
+
+        :return: The match record
+        :rtype: dict
+        """
+        match_player_ids, match_player_names = [], []
+        stats, sides, maps = {}, {}, []
+        if read_stats:
+            match_player_ids = [
+                get_url_segment(str(x), 2, rtype=int)
+                for x in parser.get_elements(const.MATCH_PLAYER_TABLE, "href")
+            ]
+            match_player_names = parser.get_text_many(const.MATCH_PLAYER_NAMES)
+            stats = MatchController.__stats_record(
+                match_player_ids, parser.get_elements(const.MATCH_PLAYER_STATS)
+            )  # type: ignore
+            sides = {
+                "attack": MatchController.__stats_record(
+                    match_player_ids,
+                    parser.get_elements(const.MATCH_PLAYER_STATS_ATTACK),
+                ),  # type: ignore
+                "defense": MatchController.__stats_record(
+                    match_player_ids,
+                    parser.get_elements(const.MATCH_PLAYER_STATS_DEFENSE),
+                ),  # type: ignore
+            }
+        if read_maps:
+            maps = [
+                MatchController.__map_record(element)  # type: ignore
+                for element in parser.get_elements(const.MATCH_MAPS)
+            ]
 
         team_links = parser.get_elements(const.MATCH_TEAMS, "href")
         team_names = parser.get_text_many(const.MATCH_TEAM_NAMES)
         team_logos = parser.get_elements(const.MATCH_TEAM_LOGOS, "src")
         _logger.debug(team_logos)
 
-        teams = (
-            Team.from_match_page(
-                get_url_segment(str(team_links[0]), 2, int),
-                team_names[0],
-                "",
-                f"https:{team_logos[0]}",
-                [
-                    Player.from_match_page(match_player_ids[pl], match_player_names[pl])
-                    for pl in range(0, 5)
-                ],
+        # The first five rows of the stats table belong to the first team, the next five to the second
+        teams = tuple(
+            (
+                get_url_segment(str(team_links[t]), 2, int),
+                team_names[t],
+                f"https:{team_logos[t]}",
+                tuple(
+                    zip(
+                        match_player_ids[t * 5 : t * 5 + 5],
+                        match_player_names[t * 5 : t * 5 + 5],
+                    )
+                ),
+            )
+            for t in range(2)
+        )
+
+        return {
+            "id": _id,
+            "name": parser.get_text(const.MATCH_NAME),
+            "event": parser.get_text(const.MATCH_EVENT_NAME),
+            "epoch": epoch_from_timestamp(
+                f"{parser.get_elements(const.MATCH_DATE, 'data-utc-ts')[0]} -0400",
+                "%Y-%m-%d %H:%M:%S %z",
+            ),
+            "teams": teams,
+            "stats": stats,
+            "sides": sides,
+            "maps": tuple(maps),
+        }
+
+    @staticmethod
+    def __map_record(element: html.HtmlElement) -> tuple:
+        """Build the record of a single map from its stats table
+
+        :param element: The element of the map's stats table
+        :type element: :class:`lxml.html.HtmlElement`
+
+        :return: The game ID, name, stats, attacking stats and defending stats of the map
+        :rtype: tuple
+        """
+        game = XpathParser.from_element(element)  # type: ignore
+        players = [
+            get_url_segment(str(x), 2, rtype=int)
+            for x in game.get_elements(const.MATCH_MAP_PLAYERS, "href")
+        ]
+        return (
+            int(element.get("data-game-id")),
+            game.get_text(const.MATCH_MAP_NAME),
+            *(
+                MatchController.__stats_record(players, game.get_elements(xpath))  # type: ignore
+                for xpath in (
+                    const.MATCH_MAP_STATS,
+                    const.MATCH_MAP_STATS_ATTACK,
+                    const.MATCH_MAP_STATS_DEFENSE,
+                )
             ),
+        )
+
+    @staticmethod
+    def __stats_record(
+        players: List[int], stats: List[html.HtmlElement]
+    ) -> Dict[int, tuple]:
+        """Parse the given stats table cells into a mapping of player IDs to tuples of PlayerStats fields
+
+        :param players: The players to parse the stats for
+        :type players: List[int]
+
+        :param stats: The stat cells of one side of the table, a row of 12 per player
+        :type stats: List[html.HtmlElement]
+
+        :return: A dictionary mapping player IDs to PlayerStats fields
+        :rtype: Dict[int, tuple]
+        """
+        return {
+            player: astuple(player_stats)
+            for player, player_stats in MatchController.__parse_match_stats(
+                players, stats
+            ).items()  # type: ignore
+        }
+
+    @staticmethod
+    def match_from_record(record: dict) -> Match:
+        """Build a Match from a record returned by :func:`MatchController.parse_match_record`
+
+        The match's teams and players are resolved with the shared :class:`vlrscraper.registry.EntityRegistry`,
+        so matches built in the same session share their Team and Player objects
+
+        :param record: The match record
+        :type record: dict
+
+        :return: The match data
+        :rtype: Match
+        """
+        teams = tuple(
             Team.from_match_page(
-                get_url_segment(str(team_links[1]), 2, int),
-                team_names[1],
+                team_id,
+                team_name,
                 "",
-                f"https:{team_logos[1]}",
-                [
-                    Player.from_match_page(match_player_ids[pl], match_player_names[pl])
-                    for pl in range(1, 5)
-                ],
-            ),
+                team_logo,
+                [Player.from_match_page(pid, name) for pid, name in roster],
+            )
+            for team_id, team_name, team_logo, roster in record["teams"]
         )
+        if (registry := get_registry()) is not None:
+            teams = tuple(registry.team(team) for team in teams)
 
         match = Match(
-            _id,
-            parser.get_text(const.MATCH_NAME),
-            parser.get_text(const.MATCH_EVENT_NAME),
-            epoch_from_timestamp(
-                f'{parser.get_elements(const.MATCH_DATE, "data-utc-ts")[0]} -0400',
-                "%Y-%m-%d %H:%M:%S %z",
-            ),
-            teams,
+            record["id"], record["name"], record["event"], record["epoch"], teams
+        )  # type: ignore
+        match.set_stats(MatchController.__stats_from_record(record["stats"]))  # type: ignore
+        for side, stats in record["sides"].items():
+            match.set_side_stats(side, MatchController.__stats_from_record(stats))  # type: ignore
+        match.set_maps(
+            [
+                MapStats(
+                    game_id,
+                    name,
+                    *(MatchController.__stats_from_record(s) for s in map_stats),  # type: ignore
+                )
+                for game_id, name, *map_stats in record["maps"]
+            ]
         )
-        match.set_stats(match_stats_parsed)
-
+        match.set_final(record.get("final", False))
         return match
 
     @staticmethod
+    def __stats_from_record(stats: Dict[int, tuple]) -> Dict[int, PlayerStats]:
+        """Rebuild the PlayerStats of a match record
+
+        :param stats: A dictionary mapping player IDs to PlayerStats fields
+        :type stats: Dict[int, tuple]
+
+        :return: A dictionary mapping player IDs to PlayerStats objects
+        :rtype: Dict[int, PlayerStats]
+        """
+        return {player: PlayerStats(*fields) for player, fields in stats.items()}
+
+    @staticmethod
+    def parse_match(_id: int, data: bytes, mode: str = "full") -> Match:
+        """Parse a vlr.gg match page from the bytes returned by :func:`requests.get`
+
+        :param _id: The match ID
+        :type _id: int
+
+        :param data: The byte data of the match page
+        :type data: bytes
+
+        :param mode: Which parts of the page to parse, see :func:`MatchController.parse_match_record`,
+            defaults to "full"
+        :type mode: str, optional
+
+        :return: The match data
+        :rtype: Match
+        """
+        return MatchController.match_from_record(
+            MatchController.parse_match_record(_id, data, mode)
+        )
+
+    @staticmethod
+    # Upcoming and live matches are still changing, so they are scraped again next time
+    @memoize("match", match_resource, keep=Match.is_final)
     def get_match(_id: int) -> Optional[Match]:
         """Scrape the data of a match given a valid vlr.gg match ID
 
+        If an :class:`vlrscraper.store.EntityStore` is set, the match is loaded from it when it is stored,
+        and stored once it has been scraped otherwise.
+
         :param _id: The ID of the match
         :type _id: int
 
         :return: The match data
         :rtype: Optional[Match]
         """
+        if (store := get_store()) is not None and (
+            match := store.get_match(_id)
+        ) is not None:
+            return match
         if (data := match_resource.get_data(_id))["success"] is False:
             return None
-        return MatchController.parse_match(_id, data["data"])
-
-    @staticmethod
-    def __get_player_match_ids_page(
-        _id: int, page: int = 1
-    ) -> Tuple[List[int], List[float]]:
-        if (parser := player_match_resource(page).get_parser(_id)) is None:
-            get_logger().warning(f"Could not get player match page for player {_id}")
-            return ([], [])
-        match_epochs = [
-            epoch_from_timestamp(f"{elem} -0400", "%Y/%m/%d%I:%M %p %z")
-            for elem in parser.get_text_many(const.PLAYER_MATCH_DATES)
-        ]
-        match_ids = [
-            get_url_segment(str(elem), 1, rtype=int)
-            for elem in parser.get_elements(const.PLAYER_MATCHES, "href")
-        ]
-        return match_ids, match_epochs
+        return MatchController.scrape_match(_id, data["data"])
 
     @staticmethod
-    def __get_team_match_ids_page(
-        _id: int, page: int = 1
-    ) -> Tuple[List[int], List[float]]:
-        if (parser := team_resource.get_parser(_id)) is None:
-            return ([], [])
+    def get_matches(ids: Iterable[int]) -> Dict[int, dict]:
+        """Scrape many matches at once on the shared worker pool. See :func:`PlayerController.get_players`
 
-        match_epochs = [
-            epoch_from_timestamp(f"{elem} -0400", "%Y/%m/%d%I:%M %p %z")
-            for elem in parser.get_text_many(const.TEAM_MATCH_DATES)
-        ]
-        match_ids = [
-            get_url_segment(str(elem), 1, rtype=int)
-            for elem in parser.get_elements(const.TEAM_MATCHES, "href")
-        ]
-        return match_ids, match_epochs
+        Stored matches are loaded from the entity store, if one is set, with 0 attempts.
+
+        :param ids: The vlr.gg IDs of the matches
+        :type ids: Iterable[int]
+
+        :return: A dictionary mapping each ID, in the order given, to a
+            :class:`vlrscraper.resource.ResourceResponse` dict with the Match as its `data` if it was scraped
+        :rtype: Dict[int, dict]
+        """
+        ids = list(ids)
+        responses = dict(MatchController.iter_matches(ids))
+        return {_id: responses[_id] for _id in ids}
+
+    @staticmethod
+    def iter_matches(ids: Iterable[int]) -> Iterator[Tuple[int, dict]]:
+        """Scrape many matches at once on the shared worker pool, yielding each match as soon as it is scraped
+
+        Unlike :class:`vlrscraper.scraping.ThreadedMatchScraper`, every ID gets a response, including the
+        reason that any match could not be scraped.
+
+        :param ids: The vlr.gg IDs of the matches
+        :type ids: Iterable[int]
+
+        :return: A generator of (ID, response) tuples in the order they finish, where each response is a
+            :class:`vlrscraper.resource.ResourceResponse` dict with the Match as its `data` if it was scraped
+        :rtype: Iterator[Tuple[int, dict]]
+        """
+
+        def fetch(_id: int) -> dict:
+            if (store := get_store()) is not None and (
+                match := store.get_match(_id)
+            ) is not None:
+                return ResourceResponse.success(match, 0)
+            return _scrape(_id, match_resource, MatchController.scrape_match)
+
+        return fetch_many(ids, fetch)
+
+    @staticmethod
+    def scrape_match(_id: int, data: bytes) -> Match:
+        """Parse a fetched match page and store the match the same way as :func:`get_match`, if an entity
+        store is set
+
+        :param _id: The match ID
+        :type _id: int
+
+        :param data: The byte data of the match page
+        :type data: bytes
+
+        :return: The match data
+        :rtype: Match
+        """
+        match = MatchController.parse_match(_id, data)
+        # Upcoming and live matches are still changing, so they are fetched again next time
+        if (store := get_store()) is not None and match.is_final():
+            store.put_match(match)
+        return match
+
+    @staticmethod
+    def __iter_match_ids(
+        pages: Paginator,
+        matches: XPath,
+        dates: XPath,
+        window: TimeWindow,
+        watermark: Optional[Tuple[int, float]] = None,
+    ) -> Iterator[Tuple[int, float]]:
+        """Iterate over the match IDs listed on a paginated match list within the given timeframe
+
+        :param pages: The paginator of the match list
+        :type pages: Paginator
+
+        :param matches: The XPATH of the links to each match on a page
+        :type matches: :class:`lxml.etree.XPath`
+
+        :param dates: The XPATH of the dates of each match on a page
+        :type dates: :class:`lxml.etree.XPath`
+
+        :param window: The timeframe to get matches within, which is resolved once iteration starts
+        :type window: TimeWindow
+
+        :param watermark: The (match ID, epoch) of a match to stop at, defaults to None
+        :type watermark: Optional[Tuple[int, float]], optional
+
+        :return: A generator of (match ID, epoch) tuples, newest first
+        :rtype: Iterator[Tuple[int, float]]
+        """
+        _from, to = window.resolve()
+        with closing(iter(pages)) as parsers:  # type: ignore
+            for parser in parsers:
+                match_epochs = [
+                    epoch_from_timestamp(f"{elem} -0400", "%Y/%m/%d%I:%M %p %z")
+                    for elem in parser.get_text_many(dates)
+                ]
+                match_ids = [
+                    get_url_segment(str(elem), 1, rtype=int)
+                    for elem in parser.get_elements(matches, "href")
+                ]
+                for match_id, epoch in zip(match_ids, match_epochs):
+                    # Match dates are only precise to the minute, so matches as old as the watermark may be new
+                    if watermark is not None and (
+                        match_id == watermark[0] or epoch < watermark[1]
+                    ):
+                        return
+                    if _from <= epoch <= to:
+                        yield match_id, epoch
+
+                # Match lists are sorted newest first, so once a page reaches past `_from` every later page does too
+                if not match_epochs or min(match_epochs) < _from:
+                    return
+
+    @staticmethod
+    def iter_player_match_ids(
+        _id: int,
+        _from: Union[float, TimeWindow],
+        to: Optional[float] = None,
+        prefetch: int = 2,
+        watermark: Optional[Tuple[int, float]] = None,
+    ) -> Iterator[Tuple[int, float]]:
+        """Iterate over the vlr.gg match IDs that a player has been a part of, within the given timeframe
+
+        The player's match list is fetched `prefetch` pages at a time, and stops as soon as a page is older
+        than `_from`. Matches are yielded as each page is parsed, so they can be scraped before pagination
+        has finished.
+
+        .. code-block:: python
+
+            for match_id, epoch in MatchController.iter_player_match_ids(4004, previous_epoch(days=365)):
+                print(match_id, epoch)
+
+        :param _id: The vlr.gg ID of the player
+        :type _id: int
+
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
+
+        :param prefetch: The number of match list pages fetched at once, defaults to 2
+        :type prefetch: int, optional
+
+        :param watermark: The (match ID, epoch) of a match to stop at, such as the newest match already
+            scraped. Stops at the first match with the same ID or an earlier epoch, defaults to None
+        :type watermark: Optional[Tuple[int, float]], optional
+
+        :return: A generator of (match ID, epoch) tuples, newest first
+        :rtype: Iterator[Tuple[int, float]]
+        """
+        return MatchController.__iter_match_ids(
+            Paginator(player_match_resource, _id, prefetch),
+            const.PLAYER_MATCHES,
+            const.PLAYER_MATCH_DATES,
+            TimeWindow.of(_from, to),
+            watermark,
+        )
+
+    @staticmethod
+    def iter_team_match_ids(
+        _id: int,
+        _from: Union[float, TimeWindow],
+        to: Optional[float] = None,
+        prefetch: int = 2,
+        watermark: Optional[Tuple[int, float]] = None,
+    ) -> Iterator[Tuple[int, float]]:
+        """Iterate over the vlr.gg match IDs that a team has been a part of, within the given timeframe
+
+        See :func:`iter_player_match_ids`.
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
+
+        :param prefetch: The number of match list pages fetched at once, defaults to 2
+        :type prefetch: int, optional
+
+        :param watermark: The (match ID, epoch) of a match to stop at, such as the newest match already
+            scraped. Stops at the first match with the same ID or an earlier epoch, defaults to None
+        :type watermark: Optional[Tuple[int, float]], optional
+
+        :return: A generator of (match ID, epoch) tuples, newest first
+        :rtype: Iterator[Tuple[int, float]]
+        """
+        return MatchController.__iter_match_ids(
+            Paginator(team_match_resource, _id, prefetch),
+            const.TEAM_MATCHES,
+            const.TEAM_MATCH_DATES,
+            TimeWindow.of(_from, to),
+            watermark,
+        )
 
     @staticmethod
     def get_player_match_ids(
-        _id: int, _from: float, to: float = time.time()
+        _id: int, _from: Union[float, TimeWindow], to: Optional[float] = None
     ) -> List[int]:
         """Get a list of vlr.gg match IDs that a player has been a part of, within the given timeframe
 
         :param _id: The vlr.gg ID of the player
         :type _id: int
 
-        :param _from: The epoch to get the matches from
-        :type _from: float
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
 
-        :param to: The epoch to get matches to, defaults to time.time()
-        :type to: float, optional
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
 
         :return: A list of match IDs of the matches that occurred between the two given timestamps
         :rtype: List[Match]
         """
-        page = 1
-        ids, epochs = MatchController.__get_player_match_ids_page(_id, page)
-        _logger.warning(ids)
-
-        parsed_ids: List[int] = []
-
-        while (
-            len(
-                parsed_ids := parsed_ids
-                + [id for i, id in enumerate(ids) if _from <= epochs[i] <= to]
-            )
-            % 50
-            == 0
-            and parsed_ids != []
-        ):
-            _logger.warning(len(parsed_ids))
-            page += 1
-            ids, epochs = MatchController.__get_player_match_ids_page(_id, page)
-        return parsed_ids
+        return [
+            match_id
+            for match_id, _ in MatchController.iter_player_match_ids(_id, _from, to)
+        ]
 
     @staticmethod
     def get_team_match_ids(
-        _id: int, _from: float, to: float = time.time()
+        _id: int, _from: Union[float, TimeWindow], to: Optional[float] = None
     ) -> List[int]:
         """Get a list of vlr.gg match IDs that a team has been a part of, within the given timeframe
 
         :param _id: The vlr.gg ID of the team
         :type _id: int
 
-        :param _from: The epoch to get the matches from
-        :type _from: float
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
 
-        :param to: The epoch to get matches to, defaults to time.time()
-        :type to: float, optional
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
 
         :return: A list of match IDs of the matches that occurred between the two given timestamps
         :rtype: List[Match]
         """
-        page = 1
-        ids, epochs = MatchController.__get_team_match_ids_page(_id, page)
+        return [
+            match_id
+            for match_id, _ in MatchController.iter_team_match_ids(_id, _from, to)
+        ]
+
+    @staticmethod
+    def iter_player_matches(
+        _id: int,
+        _from: Union[float, TimeWindow],
+        to: Optional[float] = None,
+        ordered: bool = False,
+        reorder_buffer: int = 32,
+        processes: int = 0,
+        mode: str = "full",
+    ) -> Iterator[Match]:
+        """Iterate over a player's valorant matches within the given timeframe, yielding each match as soon as
+        it has been scraped
+
+        Only the matches in flight are held in memory at once, so this is suited to scraping long histories.
+
+        .. code-block:: python
+
+            for match in MatchController.iter_player_matches(4004, previous_epoch(days=3 * 365)):
+                store(match)
 
-        parsed_ids: List[int] = []
+        :param _id: The vlr.gg ID of the player
+        :type _id: int
+
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
+
+        :param ordered: Whether to yield matches newest first rather than in the order they finish scraping,
+            defaults to False
+        :type ordered: bool, optional
+
+        :param reorder_buffer: The maximum number of matches held back to yield them in order, defaults to 32
+        :type reorder_buffer: int, optional
 
-        while (
-            len(
-                parsed_ids := parsed_ids
-                + [id for i, id in enumerate(ids) if _from <= epochs[i] <= to]
+        :param processes: The number of processes to parse match pages in, or 0 to parse them in a thread,
+            defaults to 0
+        :type processes: int, optional
+
+        :param mode: Which parts of each match page to parse, see :func:`parse_match_record`. Use "stats"
+            for bulk stat pulls, defaults to "full"
+        :type mode: str, optional
+
+        :return: A generator of matches that occurred between the two given timestamps
+        :rtype: Iterator[Match]
+        """
+        match_ids = (
+            match_id
+            for match_id, _ in MatchController.iter_player_match_ids(_id, _from, to)
+        )
+        return iter(
+            ThreadedMatchScraper(
+                match_ids,
+                processes=processes,
+                ordered=ordered,
+                reorder_buffer=reorder_buffer,
+                mode=mode,
             )
-            % 50
-            == 0
-            and parsed_ids != []
-        ):
-            _logger.warning(len(parsed_ids))
-            page += 1
-            ids, epochs = MatchController.__get_player_match_ids_page(_id, page)
+        )
 
-        return parsed_ids
+    @staticmethod
+    def iter_team_matches(
+        _id: int,
+        _from: Union[float, TimeWindow],
+        to: Optional[float] = None,
+        ordered: bool = False,
+        reorder_buffer: int = 32,
+        processes: int = 0,
+        mode: str = "full",
+    ) -> Iterator[Match]:
+        """Iterate over a team's valorant matches within the given timeframe, yielding each match as soon as
+        it has been scraped
+
+        See :func:`iter_player_matches`.
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
+
+        :param ordered: Whether to yield matches newest first rather than in the order they finish scraping,
+            defaults to False
+        :type ordered: bool, optional
+
+        :param reorder_buffer: The maximum number of matches held back to yield them in order, defaults to 32
+        :type reorder_buffer: int, optional
+
+        :param processes: The number of processes to parse match pages in, or 0 to parse them in a thread,
+            defaults to 0
+        :type processes: int, optional
+
+        :param mode: Which parts of each match page to parse, see :func:`parse_match_record`. Use "stats"
+            for bulk stat pulls, defaults to "full"
+        :type mode: str, optional
+
+        :return: A generator of matches that occurred between the two given timestamps
+        :rtype: Iterator[Match]
+        """
+        match_ids = (
+            match_id
+            for match_id, _ in MatchController.iter_team_match_ids(_id, _from, to)
+        )
+        return iter(
+            ThreadedMatchScraper(
+                match_ids,
+                processes=processes,
+                ordered=ordered,
+                reorder_buffer=reorder_buffer,
+                mode=mode,
+            )
+        )
 
     @staticmethod
     def get_player_matches(
-        _id: int, _from: float, to: float = time.time()
+        _id: int,
+        _from: Union[float, TimeWindow],
+        to: Optional[float] = None,
+        processes: int = 0,
     ) -> List[Match]:
         """Get a player's valorant matches within the given timeframe
 
         :param _id: The vlr.gg ID of the player
         :type _id: int
 
-        :param _from: The epoch to get the matches from
-        :type _from: float
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
 
-        :param to: The epoch to get matches to, defaults to time.time()
-        :type to: float, optional
+        :param processes: The number of processes to parse match pages in, or 0 to parse them in a thread,
+            defaults to 0
+        :type processes: int, optional
 
         :return: A list of matches that occurred between the two given timestamps
         :rtype: List[Match]
         """
-        match_ids = MatchController.get_player_match_ids(_id, _from, to)
-        # Thread get each one
-        scraper = ThreadedMatchScraper(match_ids)
-        matches = scraper.run()
-        return matches
+        # Matches are scraped while the rest of the match list is still being paginated
+        return list(
+            MatchController.iter_player_matches(
+                _id, _from, to, ordered=True, processes=processes
+            )
+        )
 
     @staticmethod
     def get_team_matches(
-        _id: int, _from: float, to: float = time.time()
+        _id: int,
+        _from: Union[float, TimeWindow],
+        to: Optional[float] = None,
+        processes: int = 0,
     ) -> List[Match]:
         """Get a teams valorant matches within the given timeframe
 
         :param _id: The vlr.gg ID of the team
         :type _id: int
 
-        :param _from: The epoch to get the matches from
-        :type _from: float
+        :param _from: The epoch to get the matches from, or a :class:`vlrscraper.utils.TimeWindow` to get
+            matches within
+        :type _from: Union[float, TimeWindow]
+
+        :param to: The epoch to get matches to, defaults to now
+        :type to: Optional[float], optional
 
-        :param to: The epoch to get matches to, defaults to time.time()
-        :type to: float, optional
+        :param processes: The number of processes to parse match pages in, or 0 to parse them in a thread,
+            defaults to 0
+        :type processes: int, optional
 
         :return: A list of matches that occurred between the two given timestamps
         :rtype: List[Match]
         """
-        match_ids = MatchController.get_team_match_ids(_id, _from, to)
-        scraper = ThreadedMatchScraper(match_ids)
-        matches = scraper.run()
+        return list(
+            MatchController.iter_team_matches(
+                _id, _from, to, ordered=True, processes=processes
+            )
+        )
+
+    @staticmethod
+    def __sync_matches(
+        kind: str,
+        _id: int,
+        match_ids: Callable[..., Iterator[Tuple[int, float]]],
+        _from: Union[float, TimeWindow],
+        processes: int,
+    ) -> List[Match]:
+        """Scrape the matches of a player or team that are newer than their watermark in the entity store
+
+        :param kind: "player" or "team"
+        :type kind: str
+
+        :param _id: The vlr.gg ID of the player or team
+        :type _id: int
+
+        :param match_ids: :func:`iter_player_match_ids` or :func:`iter_team_match_ids`
+        :type match_ids: :class:`collections.abc.Callable`
+
+        :param _from: The epoch or window to get the matches from if they have never been synced
+        :type _from: Union[float, TimeWindow]
+
+        :param processes: The number of processes to parse match pages in, or 0 to parse them in a thread
+        :type processes: int
+
+        :return: The new matches, newest first
+        :rtype: List[Match]
+        """
+        if (store := get_store()) is None:
+            raise ValueError("Syncing matches requires an entity store, see set_store.")
+
+        watermark = store.get_watermark(kind, _id)
+        # A single page is fetched at a time, since most syncs only need the first page
+        listed = list(match_ids(_id, _from, None, prefetch=1, watermark=watermark))
+        stored = {match_id for match_id, _ in listed if store.has_match(match_id)}
+        matches = list(
+            ThreadedMatchScraper(
+                (match_id for match_id, _ in listed if match_id not in stored),
+                processes=processes,
+                ordered=True,
+            )
+        )
+
+        # The watermark only moves past matches that have been stored, so matches that failed or have not
+        # finished yet are scraped again next time
+        stored.update(m.get_id() for m in matches if store.has_match(m.get_id()))
+        for match_id, epoch in reversed(listed):
+            if match_id not in stored:
+                break
+            watermark = (match_id, epoch)
+        if watermark is not None:
+            store.set_watermark(kind, _id, *watermark)
+
+        _logger.info(f"Synced {len(matches)} new matches of {kind} {_id}")
         return matches
+
+    @staticmethod
+    def sync_player_matches(
+        _id: int, _from: Union[float, TimeWindow], processes: int = 0
+    ) -> List[Match]:
+        """Scrape the matches a player has played since their matches were last synced
+
+        The newest match synced for each player is kept in the :class:`vlrscraper.store.EntityStore` set with
+        :func:`vlrscraper.store.set_store`, and the player's match list is only paginated until it is reached,
+        so checking for new matches usually fetches a single page. New matches are stored as they are scraped,
+        and upcoming and live matches are scraped again by each sync until they have finished.
+
+        .. code-block:: python
+
+            set_store(EntityStore("vlr.sqlite"))
+            while True:
+                for match in MatchController.sync_player_matches(4004, previous_epoch(days=365)):
+                    print(match.get_full_name())
+                time.sleep(3600)
+
+        :param _id: The vlr.gg ID of the player
+        :type _id: int
+
+        :param _from: The epoch or :class:`vlrscraper.utils.TimeWindow` to get the matches from the first time
+            the player's matches are synced
+        :type _from: Union[float, TimeWindow]
+
+        :param processes: The number of processes to parse match pages in, or 0 to parse them in a thread,
+            defaults to 0
+        :type processes: int, optional
+
+        :return: The new matches, newest first
+        :rtype: List[Match]
+        """
+        return MatchController.__sync_matches(
+            "player", _id, MatchController.iter_player_match_ids, _from, processes
+        )
+
+    @staticmethod
+    def sync_team_matches(
+        _id: int, _from: Union[float, TimeWindow], processes: int = 0
+    ) -> List[Match]:
+        """Scrape the matches a team has played since their matches were last synced
+
+        See :func:`sync_player_matches`.
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :param _from: The epoch or :class:`vlrscraper.utils.TimeWindow` to get the matches from the first time
+            the team's matches are synced
+        :type _from: Union[float, TimeWindow]
+
+        :param processes: The number of processes to parse match pages in, or 0 to parse them in a thread,
+            defaults to 0
+        :type processes: int, optional
+
+        :return: The new matches, newest first
+        :rtype: List[Match]
+        """
+        return MatchController.__sync_matches(
+            "team", _id, MatchController.iter_team_match_ids, _from, processes
+        )
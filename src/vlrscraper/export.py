@@ -0,0 +1,397 @@
+"""This module implements exporting scraped matches to files in batches, so any number of matches can be written
+without holding them all in memory
+
+Implements:
+    - `match_to_dict`, a function that converts a match into a JSON-serializable dictionary with a fixed shape
+    - `match_to_rows`, a function that flattens a match into rows of the fixed columnar schema
+    - `NDJSONExporter`, a class that writes one JSON object per match per line, optionally compressed
+    - `ColumnarExporter`, a class that writes the match, team, player and stats tables to Parquet or Arrow IPC
+      files using pyarrow
+    - `export_matches`, a function that writes matches to NDJSON, Parquet or Arrow IPC files
+"""
+
+import os
+import bz2
+import gzip
+import json
+import lzma
+
+from typing import Optional, List, Dict, Iterable, Tuple, IO, Any
+
+from vlrscraper.resources import Match
+from vlrscraper.stats import STAT_FIELDS, stats_groups
+from vlrscraper.logger import get_logger
+
+try:
+    import pyarrow as pa
+    from pyarrow import ipc, parquet
+except ImportError:  # pragma: no cover
+    pa = None
+
+_logger = get_logger()
+
+# The columns of each table written by ColumnarExporter, and their types
+SCHEMA: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "matches": (
+        ("match_id", "int64"),
+        ("name", "string"),
+        ("event", "string"),
+        ("epoch", "float64"),
+    ),
+    "teams": (
+        ("match_id", "int64"),
+        ("team_id", "int64"),
+        ("name", "string"),
+        ("tag", "string"),
+        ("logo", "string"),
+    ),
+    "players": (
+        ("match_id", "int64"),
+        ("team_id", "int64"),
+        ("player_id", "int64"),
+        ("name", "string"),
+    ),
+    "stats": (
+        ("match_id", "int64"),
+        # The game ID and name of the map, or null for stats over the whole match
+        ("game_id", "int64"),
+        ("map", "string"),
+        ("player_id", "int64"),
+        # "both", "attack" or "defense"
+        ("side", "string"),
+        *((name, "float64" if name == "rating" else "int64") for name in STAT_FIELDS),
+    ),
+}
+# The file opener for each NDJSON compression
+_NDJSON_OPENERS = {None: open, "gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+def match_to_dict(match: Match) -> dict:
+    """Convert a match into a dictionary of builtin types that can be serialized to JSON
+
+    Every key is always present, with None for anything that was not scraped. Teams hold their rosters, and
+    stats are a list of rows with the same keys as the stats table of :data:`SCHEMA`, without `match_id`.
+
+    :param match: The match to convert
+    :type match: Match
+
+    :return: The match as a dictionary
+    :rtype: dict
+    """
+    return {
+        "match_id": match.get_id(),
+        "name": match.get_name(),
+        "event": match.get_event_name(),
+        "epoch": match.get_date(),
+        "teams": [
+            {
+                "team_id": team.get_id(),
+                "name": team.get_name(),
+                "tag": team.get_tag() or None,
+                "logo": team.get_logo(),
+                "players": [
+                    {"player_id": player.get_id(), "name": player.get_display_name()}
+                    for player in team.get_roster() or []
+                ],
+            }
+            for team in match.get_teams()
+        ],
+        "stats": [
+            {
+                "game_id": None if game is None else game.game_id,
+                "map": None if game is None else game.name,
+                "player_id": player,
+                "side": side,
+                **{name: getattr(player_stats, name) for name in STAT_FIELDS},
+            }
+            for game, side, stats in stats_groups(match)
+            for player, player_stats in stats.items()
+        ],
+    }
+
+
+def match_to_rows(match: Match) -> Dict[str, List[tuple]]:
+    """Flatten a match into rows of each table of :data:`SCHEMA`
+
+    :param match: The match to flatten
+    :type match: Match
+
+    :return: A dictionary mapping each table name to its rows, each row a tuple in the order of the table's
+        columns
+    :rtype: Dict[str, List[tuple]]
+    """
+    _id = match.get_id()
+    teams = match.get_teams()
+    return {
+        "matches": [(_id, match.get_name(), match.get_event_name(), match.get_date())],
+        "teams": [
+            (_id, t.get_id(), t.get_name(), t.get_tag() or None, t.get_logo())
+            for t in teams
+        ],
+        "players": [
+            (_id, t.get_id(), p.get_id(), p.get_display_name())
+            for t in teams
+            for p in t.get_roster() or []
+        ],
+        "stats": [
+            (
+                _id,
+                None if game is None else game.game_id,
+                None if game is None else game.name,
+                player,
+                side,
+                *(getattr(player_stats, name) for name in STAT_FIELDS),
+            )
+            for game, side, stats in stats_groups(match)
+            for player, player_stats in stats.items()
+        ],
+    }
+
+
+class NDJSONExporter:
+    """Writes matches to a newline-delimited JSON file, one :func:`match_to_dict` object per line
+
+    Lines are written as each match is given, so memory use does not grow with the number of matches.
+
+    .. code-block:: python
+
+        with NDJSONExporter("matches.ndjson.gz", compression="gzip") as exporter:
+            exporter.write_many(MatchController.iter_player_matches(4004, previous_epoch(days=365)))
+
+    :param path: The path of the file to write, or a text file-like object to write to
+    :type path: Union[str, IO[str]]
+
+    :param compression: None, "gzip", "bz2" or "xz", defaults to None. Ignored when writing to a file-like
+        object
+    :type compression: Optional[str], optional
+    """
+
+    def __init__(self, path: Any, compression: Optional[str] = None) -> None:
+        if compression not in _NDJSON_OPENERS:
+            raise ValueError(
+                f"Unknown NDJSON compression {compression!r}, expected one of {tuple(_NDJSON_OPENERS)}."
+            )
+        self.__owns_file = isinstance(path, (str, os.PathLike))
+        self.__file: IO[str] = (
+            _NDJSON_OPENERS[compression](path, "wt", encoding="utf-8")  # type: ignore
+            if self.__owns_file
+            else path
+        )
+        self.__count = 0
+
+    def __enter__(self) -> "NDJSONExporter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_count(self) -> int:
+        """Get the number of matches written so far
+
+        :return: The number of matches
+        :rtype: int
+        """
+        return self.__count
+
+    def write(self, match: Match) -> None:
+        """Write a single match
+
+        :param match: The match to write
+        :type match: Match
+        """
+        self.__file.write(json.dumps(match_to_dict(match), separators=(",", ":")))
+        self.__file.write("\n")
+        self.__count += 1
+
+    def write_many(self, matches: Iterable[Match]) -> int:
+        """Write every match from an iterable, consuming it lazily
+
+        :param matches: The matches to write
+        :type matches: Iterable[Match]
+
+        :return: The number of matches written
+        :rtype: int
+        """
+        count = self.__count
+        for match in matches:
+            self.write(match)
+        return self.__count - count
+
+    def close(self) -> None:
+        """Flush the file, closing it if it was opened by the exporter"""
+        if self.__owns_file:
+            self.__file.close()
+        else:
+            self.__file.flush()
+
+
+class ColumnarExporter:
+    """Writes matches to one Parquet or Arrow IPC file per table of :data:`SCHEMA`, in the given directory
+
+    Rows are buffered until `batch_size` matches have been given, then written as one row group / record
+    batch, so memory use is bounded by the batch size rather than the number of matches. Requires pyarrow.
+
+    .. code-block:: python
+
+        with ColumnarExporter("export", compression="zstd") as exporter:
+            exporter.write_many(MatchController.iter_team_matches(2, previous_epoch(days=365)))
+
+        # export/matches.parquet, export/teams.parquet, export/players.parquet and export/stats.parquet
+
+    :param directory: The directory to write the files to, which is created if it does not exist
+    :type directory: str
+
+    :param file_format: "parquet" or "arrow", defaults to "parquet"
+    :type file_format: str, optional
+
+    :param compression: The codec to compress the files with, such as "zstd", "snappy" or "gzip" for Parquet
+        and "zstd" or "lz4" for Arrow, or None to not compress them, defaults to "zstd"
+    :type compression: Optional[str], optional
+
+    :param batch_size: The number of matches to buffer before writing, defaults to 1000
+    :type batch_size: int, optional
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        file_format: str = "parquet",
+        compression: Optional[str] = "zstd",
+        batch_size: int = 1000,
+    ) -> None:
+        if pa is None:
+            raise ImportError(
+                "Exporting to Parquet or Arrow requires pyarrow to be installed."
+            )
+        if file_format not in ("parquet", "arrow"):
+            raise ValueError(
+                f"Unknown file format {file_format!r}, expected parquet or arrow."
+            )
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+
+        os.makedirs(directory, exist_ok=True)
+        self.__batch_size = batch_size
+        self.__count = 0
+        self.__buffered = 0
+        self.__rows: Dict[str, List[tuple]] = {table: [] for table in SCHEMA}
+        self.__schemas = {
+            table: pa.schema([(name, getattr(pa, kind)()) for name, kind in columns])
+            for table, columns in SCHEMA.items()
+        }
+        self.__writers: Dict[str, Any] = {}
+        for table, schema in self.__schemas.items():
+            path = os.path.join(directory, f"{table}.{file_format}")
+            if file_format == "parquet":
+                self.__writers[table] = parquet.ParquetWriter(
+                    path, schema, compression=compression or "none"
+                )
+            else:
+                self.__writers[table] = ipc.new_file(
+                    path,
+                    schema,
+                    options=ipc.IpcWriteOptions(compression=compression),
+                )
+
+    def __enter__(self) -> "ColumnarExporter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get_count(self) -> int:
+        """Get the number of matches written or buffered so far
+
+        :return: The number of matches
+        :rtype: int
+        """
+        return self.__count
+
+    def write(self, match: Match) -> None:
+        """Buffer the rows of a single match, writing a batch if the buffer is full
+
+        :param match: The match to write
+        :type match: Match
+        """
+        for table, rows in match_to_rows(match).items():
+            self.__rows[table].extend(rows)
+        self.__count += 1
+        self.__buffered += 1
+        if self.__buffered >= self.__batch_size:
+            self.flush()
+
+    def write_many(self, matches: Iterable[Match]) -> int:
+        """Write every match from an iterable, consuming it lazily
+
+        :param matches: The matches to write
+        :type matches: Iterable[Match]
+
+        :return: The number of matches written
+        :rtype: int
+        """
+        count = self.__count
+        for match in matches:
+            self.write(match)
+        return self.__count - count
+
+    def flush(self) -> None:
+        """Write the buffered rows of every table as one batch"""
+        if not self.__buffered:
+            return
+        for table, rows in self.__rows.items():
+            schema = self.__schemas[table]
+            columns = list(zip(*rows)) if rows else [()] * len(schema)
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(c, type=f.type) for c, f in zip(columns, schema)],
+                schema=schema,
+            )
+            self.__writers[table].write_batch(batch)
+            rows.clear()
+        _logger.debug(f"Exported a batch of {self.__buffered} matches")
+        self.__buffered = 0
+
+    def close(self) -> None:
+        """Write any buffered rows and close every file"""
+        self.flush()
+        for writer in self.__writers.values():
+            writer.close()
+
+
+def export_matches(
+    matches: Iterable[Match],
+    path: str,
+    file_format: str = "ndjson",
+    compression: Optional[str] = None,
+    batch_size: int = 1000,
+) -> int:
+    """Write matches to NDJSON, Parquet or Arrow IPC files, consuming them lazily
+
+    .. code-block:: python
+
+        matches = MatchController.iter_player_matches(4004, previous_epoch(days=365))
+        export_matches(matches, "zekken.ndjson.gz", compression="gzip")
+
+    :param matches: The matches to write
+    :type matches: Iterable[Match]
+
+    :param path: The file to write NDJSON to, or the directory to write Parquet / Arrow files to
+    :type path: str
+
+    :param file_format: "ndjson", "parquet" or "arrow", defaults to "ndjson"
+    :type file_format: str, optional
+
+    :param compression: The compression to use, see :class:`NDJSONExporter` and :class:`ColumnarExporter`,
+        defaults to None
+    :type compression: Optional[str], optional
+
+    :param batch_size: The number of matches to buffer before writing Parquet / Arrow files, defaults to 1000
+    :type batch_size: int, optional
+
+    :return: The number of matches written
+    :rtype: int
+    """
+    if file_format == "ndjson":
+        with NDJSONExporter(path, compression) as exporter:
+            return exporter.write_many(matches)
+    with ColumnarExporter(path, file_format, compression, batch_size) as exporter:
+        return exporter.write_many(matches)
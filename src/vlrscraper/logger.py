@@ -1,6 +1,7 @@
 import os
 import sys
 import logging
+import multiprocessing
 
 from typing import Optional
 
@@ -34,13 +35,16 @@ def set_format(format: str) -> None:
 def setup_logging(stdout: bool, directory: str = "logs", level: int = logging.DEBUG):
     if not LogConfig.setup:
         LogConfig.logger = logging.getLogger(__name__)
-        if not os.path.isdir(directory):
-            os.mkdir(directory)
-        LogConfig.fileHandler = logging.FileHandler(
-            os.path.join(directory, "log.log"), "w"
-        )
-        LogConfig.fileHandler.setLevel(logging.DEBUG)
-        LogConfig.logger.addHandler(LogConfig.fileHandler)
+        # Child processes, such as those that parse match pages, import vlrscraper again. Opening the log file
+        # would truncate the parent's log, so they only log to stdout
+        if multiprocessing.parent_process() is None:
+            if not os.path.isdir(directory):
+                os.mkdir(directory)
+            LogConfig.fileHandler = logging.FileHandler(
+                os.path.join(directory, "log.log"), "w"
+            )
+            LogConfig.fileHandler.setLevel(logging.DEBUG)
+            LogConfig.logger.addHandler(LogConfig.fileHandler)
         set_format("%(created)f:%(levelname)s:%(name)s:%(module)s:%(message)s")
         set_should_print(stdout)
         LogConfig.setup = True
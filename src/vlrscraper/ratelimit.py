@@ -0,0 +1,333 @@
+"""This module implements client-side throttling of the requests sent to vlr.gg
+
+Implements:
+    - `TokenBucket`, a thread-safe token bucket that limits the rate requests are sent at
+    - `AdaptiveLimiter`, an AIMD controller that tunes the request rate and the number of requests in flight
+      based on how the server is responding
+"""
+
+import time
+import threading
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from vlrscraper.logger import get_logger
+
+_logger = get_logger()
+
+# Status codes that mean the server wants us to slow down
+THROTTLE_STATUSES = frozenset({429, 503})
+# Responses faster than this (in seconds) never count as latency spikes, however fast the average is
+MIN_SPIKE_LATENCY = 1.0
+
+
+class TokenBucket:
+    """A thread-safe token bucket
+
+    Tokens are added at `rate` per second, up to `burst` tokens, and every request takes one token.
+
+    :param rate: The number of tokens added per second
+    :type rate: float
+
+    :param burst: The maximum number of tokens that can be saved up, defaults to 1
+    :type burst: int, optional
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0 or burst <= 0:
+            raise ValueError("Token bucket rate and burst must be positive.")
+
+        self.__rate = rate
+        self.__burst = burst
+        self.__tokens = float(burst)
+        self.__updated = time.monotonic()
+        self.__paused_until = 0.0
+        self.__lock = threading.Lock()
+
+    def get_rate(self) -> float:
+        """Get the number of tokens added per second
+
+        :return: The rate
+        :rtype: float
+        """
+        return self.__rate
+
+    def set_rate(self, rate: float) -> None:
+        """Change the number of tokens added per second
+
+        :param rate: The new rate
+        :type rate: float
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.__rate = rate
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given number of seconds
+
+        :param seconds: The number of seconds to pause for
+        :type seconds: float
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__refill(now)
+            self.__paused_until = max(self.__paused_until, now + seconds)
+            # Do not let a burst of requests through the moment the pause ends
+            self.__tokens = min(self.__tokens, 1.0)
+
+    def __refill(self, now: float) -> None:
+        if now > self.__updated:
+            since = max(self.__updated, self.__paused_until)
+            if now > since:
+                self.__tokens = min(
+                    self.__burst, self.__tokens + (now - since) * self.__rate
+                )
+            self.__updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take a token, waiting until one is available
+
+        :param timeout: The maximum number of seconds to wait, or None to wait forever, defaults to None
+        :type timeout: Optional[float], optional
+
+        :return: True if a token was taken, False if the timeout ran out first
+        :rtype: bool
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__refill(now)
+                if now >= self.__paused_until and self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return True
+                wait = max(self.__paused_until - now, (1 - self.__tokens) / self.__rate)
+
+            if deadline is not None:
+                if (remaining := deadline - time.monotonic()) <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(max(wait, 0.001))
+
+
+class AdaptiveLimiter:
+    """Throttles requests with a token bucket and a window of requests in flight, both tuned with AIMD
+    (additive increase, multiplicative decrease)
+
+    Every healthy response grows the rate and the window so they each go up by about one per round of
+    requests. A 429 / 503 response, a latency spike or a `Retry-After` header cuts both by `decrease`,
+    at most once per `cooldown` seconds so one burst of errors only counts once. A `Retry-After` header also
+    pauses every request for as long as the server asked.
+
+    .. code-block:: python
+
+        limiter = AdaptiveLimiter(rate=2, max_rate=10)
+        set_transport(Transport(limiter=limiter))
+        ...
+        limiter.get_rate(), limiter.get_window()
+
+    :param rate: The initial number of requests sent per second, defaults to 4.0
+    :type rate: float, optional
+
+    :param window: The initial number of requests in flight at once, defaults to 4
+    :type window: int, optional
+
+    :param min_rate: The lowest request rate to back off to, defaults to 0.5
+    :type min_rate: float, optional
+
+    :param max_rate: The highest request rate to grow to, defaults to 20.0
+    :type max_rate: float, optional
+
+    :param max_window: The most requests to have in flight at once, defaults to 16
+    :type max_window: int, optional
+
+    :param decrease: The factor the rate and window are multiplied by when backing off, defaults to 0.5
+    :type decrease: float, optional
+
+    :param latency_spike: How many times slower than the average a response must be to count as a latency
+        spike, defaults to 3.0
+    :type latency_spike: float, optional
+
+    :param cooldown: The minimum number of seconds between two back offs, defaults to 1.0
+    :type cooldown: float, optional
+    """
+
+    def __init__(
+        self,
+        rate: float = 4.0,
+        window: int = 4,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        max_window: int = 16,
+        decrease: float = 0.5,
+        latency_spike: float = 3.0,
+        cooldown: float = 1.0,
+    ) -> None:
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError(
+                "Limiter rates must satisfy 0 < min_rate <= rate <= max_rate."
+            )
+        if not 0 < window <= max_window:
+            raise ValueError("Limiter windows must satisfy 0 < window <= max_window.")
+        if not 0 < decrease < 1:
+            raise ValueError("Limiter decrease must be between 0 and 1.")
+
+        self.__bucket = TokenBucket(rate, burst=window)
+        self.__window = float(window)
+        self.__min_rate = min_rate
+        self.__max_rate = max_rate
+        self.__max_window = max_window
+        self.__decrease = decrease
+        self.__latency_spike = latency_spike
+        self.__cooldown = cooldown
+
+        self.__in_flight = 0
+        self.__latency: Optional[float] = None
+        self.__last_decrease = float("-inf")
+        self.__condition = threading.Condition()
+        self.__stats = {"requests": 0, "throttled": 0, "spikes": 0, "backoffs": 0}
+
+    def get_rate(self) -> float:
+        """Get the number of requests currently allowed per second
+
+        :return: The request rate
+        :rtype: float
+        """
+        return self.__bucket.get_rate()
+
+    def get_window(self) -> int:
+        """Get the number of requests currently allowed in flight at once
+
+        :return: The window size
+        :rtype: int
+        """
+        with self.__condition:
+            return int(self.__window)
+
+    def get_in_flight(self) -> int:
+        """Get the number of requests currently in flight
+
+        :return: The number of requests that have been acquired but not released
+        :rtype: int
+        """
+        with self.__condition:
+            return self.__in_flight
+
+    def get_stats(self) -> dict:
+        """Get the current rate, window and average latency along with counters of the responses seen
+
+        :return: The stats
+        :rtype: dict
+        """
+        with self.__condition:
+            return {
+                **self.__stats,
+                "rate": self.__bucket.get_rate(),
+                "window": int(self.__window),
+                "in_flight": self.__in_flight,
+                "latency": self.__latency,
+            }
+
+    def acquire(self) -> None:
+        """Wait for a free slot in the window and a token from the bucket before sending a request
+
+        Every call must be followed by a call to :func:`release` once the request has finished.
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__in_flight < int(self.__window))
+            self.__in_flight += 1
+        self.__bucket.acquire()
+
+    def release(
+        self,
+        status: Optional[int],
+        latency: float,
+        retry_after: Optional[str] = None,
+    ) -> None:
+        """Report how a request went, freeing its slot in the window and adjusting the rate and window
+
+        :param status: The status code of the response, or None if no response was recieved. Requests without
+            a response only count towards backing off if they were slow enough to be a latency spike
+        :type status: Optional[int]
+
+        :param latency: The number of seconds the request took
+        :type latency: float
+
+        :param retry_after: The `Retry-After` header of the response, defaults to None
+        :type retry_after: Optional[str], optional
+        """
+        with self.__condition:
+            self.__in_flight -= 1
+            self.__stats["requests"] += 1
+
+            throttled = status in THROTTLE_STATUSES or retry_after is not None
+            spike = self.__latency is not None and latency > max(
+                self.__latency * self.__latency_spike, MIN_SPIKE_LATENCY
+            )
+            self.__stats["throttled"] += throttled
+            self.__stats["spikes"] += spike
+            # Keep spikes out of the average so a slow server is not mistaken for the new normal
+            if status is not None and not spike:
+                self.__latency = (
+                    latency
+                    if self.__latency is None
+                    else 0.8 * self.__latency + 0.2 * latency
+                )
+
+            if throttled or spike:
+                self.__back_off(retry_after)
+            elif status is not None:
+                self.__window = min(
+                    self.__max_window, self.__window + 1 / self.__window
+                )
+                rate = self.__bucket.get_rate()
+                self.__bucket.set_rate(min(self.__max_rate, rate + 1 / rate))
+            self.__condition.notify_all()
+
+    def __back_off(self, retry_after: Optional[str]) -> None:
+        if (pause := parse_retry_after(retry_after)) is not None:
+            _logger.warning(
+                f"Server asked to retry after {pause:.1f}s, pausing requests"
+            )
+            self.__bucket.pause(pause)
+
+        now = time.monotonic()
+        if now - self.__last_decrease < self.__cooldown:
+            return
+        self.__last_decrease = now
+        self.__stats["backoffs"] += 1
+        self.__window = max(1.0, self.__window * self.__decrease)
+        self.__bucket.set_rate(
+            max(self.__min_rate, self.__bucket.get_rate() * self.__decrease)
+        )
+        _logger.info(
+            f"Backing off to {self.__bucket.get_rate():.2f} requests/s, window {int(self.__window)}"
+        )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse the number of seconds to wait from a `Retry-After` header
+
+    :param value: The header, either a number of seconds or an HTTP date
+    :type value: Optional[str]
+
+    :return: The number of seconds to wait, or None if the header is missing or invalid
+    :rtype: Optional[float]
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,185 @@
+"""This module implements an identity map of the players and teams scraped during a session
+
+Implements:
+    - `EntityRegistry`, a thread-safe registry that hands out one canonical instance per player and team
+    - `get_registry` / `set_registry`, functions to get or swap the registry used when building matches
+"""
+
+import threading
+
+from typing import Optional, Iterable, Tuple
+from weakref import WeakValueDictionary
+
+from vlrscraper.resources import Player, Team
+from vlrscraper.logger import get_logger
+
+_logger = get_logger()
+
+# Teams are registered by their ID and the sorted IDs of the players on their roster
+_TeamKey = Tuple[int, Optional[Tuple[int, ...]]]
+
+
+class EntityRegistry:
+    """An identity map of the players and teams scraped during a session
+
+    Every player scraped with the same vlr.gg ID is resolved to one canonical :class:`Player`, with the
+    fields of later scrapes filling in whatever the canonical player is missing, and scrapes of the player's
+    own page replacing their current team and status. Teams are resolved by their
+    ID and roster, since a team's roster on a match page is the roster that played that match, so every match
+    a team played with the same five players shares one :class:`Team`.
+
+    Entities are held weakly, so they are forgotten once nothing else refers to them and the registry never
+    grows past the entities in use.
+
+    .. code-block:: python
+
+        registry = get_registry()
+        matches = MatchController.get_team_matches(2, previous_epoch(days=365))
+        matches[0].get_teams()[0] is matches[1].get_teams()[0]     # True if the rosters were the same
+        registry.get_player(4004)
+    """
+
+    def __init__(self) -> None:
+        self.__players: "WeakValueDictionary[int, Player]" = WeakValueDictionary()
+        self.__teams: "WeakValueDictionary[_TeamKey, Team]" = WeakValueDictionary()
+        self.__lock = threading.RLock()
+        self.__stats = {"hits": 0, "misses": 0}
+
+    def player(self, player: Player, overwrite: bool = False) -> Player:
+        """Get the canonical instance of a player, registering the player if it has not been seen before
+
+        :param player: The scraped player
+        :type player: Player
+
+        :param overwrite: Whether the scraped player is newer and authoritative, such as a scrape of their
+            player page, so its fields replace the canonical player's, see :func:`Player.merge`,
+            defaults to False
+        :type overwrite: bool, optional
+
+        :return: The canonical player, with any fields it was missing filled in from the scraped player
+        :rtype: Player
+        """
+        with self.__lock:
+            if (canonical := self.__players.get(player.get_id())) is None:
+                self.__stats["misses"] += 1
+                self.__players[player.get_id()] = player
+                return player
+            self.__stats["hits"] += 1
+            if canonical is not player:
+                canonical.merge(player, overwrite)
+            return canonical
+
+    def team(self, team: Team, overwrite: bool = False) -> Team:
+        """Get the canonical instance of a team with the same roster, registering the team if it has not been
+        seen before. The players on the roster are resolved to their canonical instances too
+
+        :param team: The scraped team
+        :type team: Team
+
+        :param overwrite: Whether the scraped team is newer and authoritative, so its fields replace the
+            canonical team's, see :func:`Team.merge`, defaults to False
+        :type overwrite: bool, optional
+
+        :return: The canonical team, with any fields it was missing filled in from the scraped team
+        :rtype: Team
+        """
+        with self.__lock:
+            if (roster := team.get_roster()) is not None:
+                roster = [self.player(player) for player in roster]
+            key = EntityRegistry.__team_key(
+                team.get_id(), None if roster is None else map(Player.get_id, roster)
+            )
+            if (canonical := self.__teams.get(key)) is None:
+                self.__stats["misses"] += 1
+                if roster is not None:
+                    team.set_roster(roster)
+                self.__teams[key] = team
+                return team
+            self.__stats["hits"] += 1
+            if canonical is not team:
+                canonical.merge(team, overwrite)
+            return canonical
+
+    def get_player(self, _id: int) -> Optional[Player]:
+        """Get the canonical instance of a player by ID
+
+        :param _id: The vlr.gg ID of the player
+        :type _id: int
+
+        :return: The player, or None if no player with the ID is in use
+        :rtype: Optional[Player]
+        """
+        with self.__lock:
+            return self.__players.get(_id)
+
+    def get_team(
+        self, _id: int, roster: Optional[Iterable[int]] = None
+    ) -> Optional[Team]:
+        """Get the canonical instance of a team by ID and roster
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :param roster: The vlr.gg IDs of the players on the roster in any order, or None for a team without
+            a roster, defaults to None
+        :type roster: Optional[Iterable[int]], optional
+
+        :return: The team, or None if no such team is in use
+        :rtype: Optional[Team]
+        """
+        with self.__lock:
+            return self.__teams.get(EntityRegistry.__team_key(_id, roster))
+
+    def get_stats(self) -> dict:
+        """Get the number of players and teams in use along with how many lookups found an existing entity
+
+        :return: The stats
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                **self.__stats,
+                "players": len(self.__players),
+                "teams": len(self.__teams),
+            }
+
+    def clear(self) -> None:
+        """Forget every registered entity"""
+        with self.__lock:
+            self.__players.clear()
+            self.__teams.clear()
+
+    @staticmethod
+    def __team_key(_id: int, roster: Optional[Iterable[int]]) -> _TeamKey:
+        return (_id, None if roster is None else tuple(sorted(roster)))
+
+
+class _RegistryConfig:
+    registry: Optional[EntityRegistry] = EntityRegistry()
+    lock = threading.Lock()
+
+
+def get_registry() -> Optional[EntityRegistry]:
+    """Get the registry that the players and teams of scraped matches are resolved with
+
+    :return: The shared registry, or None if entities are not being deduplicated
+    :rtype: Optional[EntityRegistry]
+    """
+    with _RegistryConfig.lock:
+        return _RegistryConfig.registry
+
+
+def set_registry(registry: Optional[EntityRegistry]) -> None:
+    """Swap the registry that the players and teams of scraped matches are resolved with
+
+    .. code-block:: python
+
+        # Give every match its own Team and Player objects
+        set_registry(None)
+
+    :param registry: The new registry, or None to stop deduplicating entities
+    :type registry: Optional[EntityRegistry]
+    """
+    _logger.info(f"Setting shared entity registry to {registry}")
+    with _RegistryConfig.lock:
+        _RegistryConfig.registry = registry
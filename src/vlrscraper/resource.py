@@ -1,10 +1,15 @@
-from typing import Any
+import time
+
+from typing import Any, Optional, List, Tuple, Iterator, cast
 
 import requests
-from typing import Optional
 
+from vlrscraper.cache import TTL, get_memory_cache
 from vlrscraper.logger import get_logger
+from vlrscraper.ratelimit import parse_retry_after
+from vlrscraper.retry import RetryPolicy, get_retry_policy
 from vlrscraper.scraping import XpathParser
+from vlrscraper.transport import Transport, get_transport
 
 _logger = get_logger()
 
@@ -13,23 +18,55 @@ class ResourceResponse:
     @staticmethod
     def id_invalid(_id: Any) -> dict:
         _logger.warning(f"Attempt to get resource at ID {_id} failed, invalid ID.")
-        return {"success": False, "error": f"Invalid id given: {_id}"}
+        return {"success": False, "error": f"Invalid id given: {_id}", "attempts": 0}
 
     @staticmethod
-    def request_refused(url: str, code: int) -> dict:
+    def request_refused(url: str, code: int, attempts: int = 1) -> dict:
         _logger.warning(f"Attempt to get data at {url} timed out (Status code {code})")
         return {
             "success": False,
             "error": f"Invalid status code {code} recieved when fetching data from {url}",
+            "attempts": attempts,
+        }
+
+    @staticmethod
+    def scrape_failed(_id: Any, error: Exception, attempts: int = 1) -> dict:
+        _logger.error(f"Could not scrape resource at ID {_id}: {error}")
+        return {
+            "success": False,
+            "error": f"Could not scrape resource at ID {_id}: {error}",
+            "attempts": attempts,
         }
 
     @staticmethod
-    def success(data) -> dict:
-        return {"success": True, "data": data}
+    def success(data, attempts: int = 1) -> dict:
+        return {"success": True, "data": data, "attempts": attempts}
 
 
 class Resource:
-    def __init__(self, url: str) -> None:
+    """A vlr.gg page that can be fetched for any resource ID
+
+    :param url: The url of the resource, containing a `<res_id>` tag where the ID should be placed
+    :type url: str
+
+    :param transport: The transport to fetch data through, defaults to the shared transport
+    :type transport: Transport, optional
+
+    :param ttl: The number of seconds a cached copy of this resource stays fresh for, None if it never
+        expires, or a function that gets either from the cached page, defaults to 0
+    :type ttl: TTL, optional
+
+    :param retry: The policy used to retry failed requests, defaults to the shared retry policy
+    :type retry: RetryPolicy, optional
+    """
+
+    def __init__(
+        self,
+        url: str,
+        transport: Optional[Transport] = None,
+        ttl: TTL = 0,
+        retry: Optional[RetryPolicy] = None,
+    ) -> None:
         if not isinstance(url, str):
             _logger.error(
                 f"Attempt to create resource with url {url} failed. URL must be of type string."
@@ -41,6 +78,33 @@ class Resource:
             )
             raise ValueError("Resource URLs must contain some reference to <res_id>.")
         self.__url = url
+        self.__transport = transport
+        self.__ttl = ttl
+        self.__retry = retry
+
+    def get_transport(self) -> Transport:
+        """Get the transport that this resource fetches data through
+
+        :return: The resource's own transport if it was given one, otherwise the shared transport
+        :rtype: Transport
+        """
+        return self.__transport or get_transport()
+
+    def get_retry_policy(self) -> RetryPolicy:
+        """Get the policy used to retry failed requests for this resource
+
+        :return: The resource's own policy if it was given one, otherwise the shared policy
+        :rtype: RetryPolicy
+        """
+        return self.__retry or get_retry_policy()
+
+    def get_ttl(self) -> TTL:
+        """Get the number of seconds a cached copy of this resource stays fresh for
+
+        :return: The TTL, None if cached copies never expire, or a function that gets either from a cached page
+        :rtype: TTL
+        """
+        return self.__ttl
 
     def get_base_url(self) -> str:
         return self.__url
@@ -62,13 +126,122 @@ class Resource:
         if not (url := self.get_url(_id)):
             return ResourceResponse.id_invalid(_id)
 
-        response = requests.get(url)
+        response, attempts = self.__fetch(url)
         return (
-            ResourceResponse.success(response.json() if json else response.content)
+            ResourceResponse.success(
+                response.json() if json else response.content, attempts
+            )
             if response.status_code == 200
-            else ResourceResponse.request_refused(url, response.status_code)
+            else ResourceResponse.request_refused(url, response.status_code, attempts)
+        )
+
+    def __fetch(self, url: str, stream: bool = False) -> Tuple[requests.Response, int]:
+        """Fetch a url, retrying transient failures as allowed by the retry policy
+
+        Retries are sent through the same transport as the first attempt, so they share its connection pool
+        and are throttled along with every other request.
+
+        :param url: The url to fetch
+        :type url: str
+
+        :param stream: Whether to return before the body has been downloaded, defaults to False
+        :type stream: bool, optional
+
+        :return: A tuple of the last response recieved and the number of attempts made
+        :rtype: Tuple[:class:`requests.Response`, int]
+        """
+        policy = self.get_retry_policy()
+        deadline = (
+            None if policy.deadline is None else time.monotonic() + policy.deadline
         )
+        attempt = 0
+        while True:
+            attempt += 1
+            response: Optional[requests.Response] = None
+            error: Optional[requests.RequestException] = None
+            try:
+                response = self.get_transport().get(url, ttl=self.__ttl, stream=stream)
+                status: Optional[int] = response.status_code
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except requests.RequestException as e:
+                status, retry_after, error = None, None, e
+
+            if attempt >= policy.attempts or not policy.is_retryable(status, error):
+                break
+            delay = policy.get_delay(attempt, retry_after)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                break
+            # A streamed response holds its connection until it is closed, so release it before retrying
+            if response is not None:
+                response.close()
+            _logger.info(
+                f"Retrying {url} in {delay:.2f}s after attempt {attempt} failed ({status or error})"
+            )
+            time.sleep(delay)
+
+        if response is None:
+            raise cast(requests.RequestException, error)
+        return response, attempt
+
+    def get_parser(self, _id: int, stream: bool = False) -> Optional[XpathParser]:
+        """Get a parser for the page of the given resource ID
+
+        Pages of resources with a non-zero TTL are kept in the memory cache as raw bytes, so asking for the
+        same page twice only fetches it once. The parts of pages that are never scraped are pruned, see
+        :func:`XpathParser.from_chunks`.
+
+        :param _id: The resource (vlr) ID of the resource being requested
+        :type _id: int
 
-    def get_parser(self, _id: int) -> Optional[XpathParser]:
-        data = self.get_data(_id, False)
-        return XpathParser(data["data"]) if data["success"] else None
+        :param stream: Whether to parse the page as it is downloaded rather than once it has been downloaded,
+            defaults to False
+        :type stream: bool, optional
+
+        :return: The parser, or None if the page could not be fetched
+        :rtype: Optional[XpathParser]
+        """
+        if not (url := self.get_url(_id)):
+            ResourceResponse.id_invalid(_id)
+            return None
+
+        # Only the page is cached, since parsed trees take many times the memory of the page they came from
+        cache = get_memory_cache() if self.__ttl != 0 else None
+        if cache is not None and (page := cache.get(("page", url))) is not None:
+            return XpathParser.from_chunks((page,), prune=True)
+
+        chunks: List[bytes] = []
+        if stream:
+            parser = self.__stream_parser(url, chunks)
+        elif (data := self.get_data(_id, False))["success"]:
+            chunks.append(data["data"])
+            parser = XpathParser.from_chunks(chunks, prune=True)
+        else:
+            parser = None
+        if cache is not None and parser is not None:
+            cache.set(("page", url), b"".join(chunks))
+        return parser
+
+    def __stream_parser(self, url: str, chunks: List[bytes]) -> Optional[XpathParser]:
+        """Fetch a page and feed its body to a parser chunk by chunk as it is downloaded
+
+        :param url: The url of the page
+        :type url: str
+
+        :param chunks: A list that each chunk of the body is added to as it is parsed
+        :type chunks: List[bytes]
+
+        :return: The parser, or None if the page could not be fetched
+        :rtype: Optional[XpathParser]
+        """
+        response, attempts = self.__fetch(url, stream=True)
+        if response.status_code != 200:
+            response.close()
+            ResourceResponse.request_refused(url, response.status_code, attempts)
+            return None
+
+        def body() -> Iterator[bytes]:
+            for chunk in self.get_transport().iter_body(response):
+                chunks.append(chunk)
+                yield chunk
+
+        return XpathParser.from_chunks(body(), prune=True)
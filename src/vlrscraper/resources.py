@@ -2,12 +2,15 @@
 - Player
 - Team
 - Match
+- MapStats
 """
 
 from __future__ import annotations
 
+import sys
+
 from enum import IntEnum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List, Tuple
 
 from vlrscraper.logger import get_logger
@@ -15,6 +18,26 @@ from vlrscraper.logger import get_logger
 _logger = get_logger()
 
 
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a string that is repeated across many entities, such as a team name or an image url, so that
+    every entity holding it shares one copy
+
+    lxml string results are converted to plain strings first, which also stops them keeping the page they
+    were scraped from alive
+
+    :param value: The string to intern
+    :type value: Optional[str]
+
+    :return: The interned string
+    :rtype: Optional[str]
+    """
+    return None if value is None else sys.intern(str(value))
+
+
+# The sides that per-side stats are kept for. Attack is the `mod-t` side of the stats tables, defense `mod-ct`
+SIDES = ("attack", "defense")
+
+
 class PlayerStatus(IntEnum):
     """Contains data relating to the player's current status.
     Can be either INACTIVE or ACTIVE
@@ -49,6 +72,17 @@ class Player:
     :type status: PlayerStatus, optional
     """
 
+    __slots__ = (
+        "__id",
+        "__displayname",
+        "__current_team",
+        "__name",
+        "__image_src",
+        "__status",
+        # Lets the entity registry hold players without keeping them alive
+        "__weakref__",
+    )
+
     def __init__(
         self,
         _id: int,
@@ -65,10 +99,12 @@ class Player:
             raise ValueError("Player ID must be an integer {0 < ID}")
 
         self.__id = _id
-        self.__displayname = name
+        self.__displayname = _intern(name)
         self.__current_team = current_team
-        self.__name = tuple(x for x in (forename, surname) if x is not None) or None
-        self.__image_src = image
+        self.__name = (
+            tuple(_intern(x) for x in (forename, surname) if x is not None) or None
+        )
+        self.__image_src = _intern(image)
         self.__status = status
 
     def __eq__(self, other: object) -> bool:
@@ -161,6 +197,8 @@ class Player:
         :rtype: bool
 
         """
+        if self is other:
+            return True
         return (
             isinstance(other, Player)
             and self.get_id() == other.get_id()
@@ -169,6 +207,38 @@ class Player:
             and self.get_image() == other.get_image()
         )
 
+    def merge(self, other: Player, overwrite: bool = False) -> None:
+        """Fill in the fields of this player that are missing with those of another scrape of the same player
+
+        Fields that this player already has are kept, so a player scraped from a match page gains the real
+        name, image and team of the same player scraped from their player page. If the other scrape is newer
+        and authoritative, such as a fresh scrape of the player page, set `overwrite` so that its display
+        name, team and status replace this player's, since those change over time.
+
+        :param other: Another instance of the same player
+        :type other: Player
+
+        :param overwrite: Whether the other scrape is newer and its fields win over this player's,
+            defaults to False
+        :type overwrite: bool, optional
+        """
+        if other.__id != self.__id:
+            raise ValueError(
+                f"Cannot merge player {other.__id} into player {self.__id}"
+            )
+        if overwrite:
+            self.__displayname = other.__displayname or self.__displayname
+            self.__current_team = other.__current_team
+            self.__name = other.__name or self.__name
+            self.__image_src = other.__image_src or self.__image_src
+            self.__status = other.__status
+            return
+        self.__displayname = self.__displayname or other.__displayname
+        self.__current_team = self.__current_team or other.__current_team
+        self.__name = self.__name or other.__name
+        self.__image_src = self.__image_src or other.__image_src
+        self.__status = self.__status or other.__status
+
     @staticmethod
     def from_player_page(
         _id: int,
@@ -280,8 +350,25 @@ class Team:
 
     :param roster: The current roster of the team
     :type roster: Optional[List[Player]]
+
+    :param joined: The epoch a player joined the team, if scraped from their team history, defaults to None
+    :type joined: Optional[float], optional
+
+    :param left: The epoch a player left the team, if scraped from their team history, defaults to None
+    :type left: Optional[float], optional
     """
 
+    __slots__ = (
+        "__id",
+        "__name",
+        "__tag",
+        "__logo",
+        "__roster",
+        "__joined",
+        "__left",
+        "__weakref__",
+    )
+
     # TODO implement Roster object
     def __init__(
         self,
@@ -290,16 +377,20 @@ class Team:
         tag: Optional[str],
         logo: Optional[str],
         roster: Optional[List[Player]],
+        joined: Optional[float] = None,
+        left: Optional[float] = None,
     ) -> None:
         """Team constructor"""
         if not isinstance(_id, int) or _id <= 0:
             raise ValueError("Player ID must be an integer {0 < ID}")
 
         self.__id = _id
-        self.__name = name
-        self.__tag = tag
-        self.__logo = logo
+        self.__name = _intern(name)
+        self.__tag = _intern(tag)
+        self.__logo = _intern(logo)
         self.__roster = roster
+        self.__joined = joined
+        self.__left = left
 
     def __eq__(self, other: object) -> bool:
         _logger.warning(
@@ -330,6 +421,8 @@ class Team:
         :return: True if the teams match otherwise False
         :rtype: bool
         """
+        if self is other:
+            return True
         return (
             isinstance(other, Team)
             and self.__id == other.__id
@@ -351,6 +444,8 @@ class Team:
         """
 
         # no I don't like doing this many returns, yes pyright is forcing my hand :D
+        if self is other:
+            return True
         if not isinstance(other, Team):
             return False
 
@@ -361,11 +456,38 @@ class Team:
         if mR is None or oR is None:
             return False
 
-
         return len(mR) == len(oR) and all(
             [p.is_same_player(oR[i])] for i, p in enumerate(mR)
         )
 
+    def merge(self, other: Team, overwrite: bool = False) -> None:
+        """Fill in the fields of this team that are missing with those of another scrape of the same team
+
+        Fields that this team already has are kept, including its roster, unless `overwrite` is set because
+        the other scrape is newer and authoritative, such as a fresh scrape of the team page.
+
+        :param other: Another instance of the same team
+        :type other: Team
+
+        :param overwrite: Whether the other scrape is newer and its fields win over this team's,
+            defaults to False
+        :type overwrite: bool, optional
+        """
+        if other.__id != self.__id:
+            raise ValueError(f"Cannot merge team {other.__id} into team {self.__id}")
+        if overwrite:
+            self.__name = other.__name or self.__name
+            self.__tag = other.__tag or self.__tag
+            self.__logo = other.__logo or self.__logo
+            if other.__roster is not None:
+                self.__roster = other.__roster
+            return
+        self.__name = self.__name or other.__name
+        self.__tag = self.__tag or other.__tag
+        self.__logo = self.__logo or other.__logo
+        if self.__roster is None:
+            self.__roster = other.__roster
+
     def get_id(self) -> int:
         """Get the vlr.gg ID of this team
 
@@ -406,6 +528,22 @@ class Team:
         """
         return self.__roster
 
+    def get_join_date(self) -> Optional[float]:
+        """Get the epoch that the player this team was scraped for joined it
+
+        :return: The join date, or None if it is unknown or the team was not scraped from a team history
+        :rtype: float, optional
+        """
+        return self.__joined
+
+    def get_leave_date(self) -> Optional[float]:
+        """Get the epoch that the player this team was scraped for left it
+
+        :return: The leave date, or None if the player is still on the team or it is unknown
+        :rtype: float, optional
+        """
+        return self.__left
+
     def set_roster(self, roster: List[Player]) -> None:
         """Set the current roster of this team
 
@@ -446,7 +584,13 @@ class Team:
         return Team(_id, name, tag, logo, roster)
 
     @staticmethod
-    def from_player_page(_id: int, name: str, logo: str) -> Team:
+    def from_player_page(
+        _id: int,
+        name: str,
+        logo: str,
+        joined: Optional[float] = None,
+        left: Optional[float] = None,
+    ) -> Team:
         """Construct a Team object from the data available on the team's vlr.gg page
 
         :param _id: The vlr.gg ID of the team
@@ -458,10 +602,18 @@ class Team:
         :param logo: The absolute url of the team's logo
         :type logo: str
 
+        :param joined: The epoch the player joined the team, defaults to None
+        :type joined: Optional[float], optional
+
+        :param left: The epoch the player left the team, defaults to None
+        :type left: Optional[float], optional
+
         :return: The team constructed
         :rtype: Team
         """
-        return Team(_id, name=name, tag=None, logo=logo, roster=None)
+        return Team(
+            _id, name=name, tag=None, logo=logo, roster=None, joined=joined, left=left
+        )
 
     @staticmethod
     def from_match_page(
@@ -520,6 +672,22 @@ class PlayerStats:
     :type FKFD: int
     """
 
+    # Declared by hand rather than with `dataclass(slots=True)`, which needs Python 3.10
+    __slots__ = (
+        "rating",
+        "ACS",
+        "kills",
+        "deaths",
+        "assists",
+        "KD",
+        "KAST",
+        "ADR",
+        "HS",
+        "FK",
+        "FD",
+        "FKFD",
+    )
+
     rating: Optional[float]
     ACS: Optional[int]
     kills: Optional[int]
@@ -534,6 +702,42 @@ class PlayerStats:
     FKFD: Optional[int]
 
 
+@dataclass
+class MapStats:
+    """Encapsulates the stats of every player on a single map of a match
+
+    :param game_id: The vlr.gg ID of the game played on the map
+    :type game_id: int
+    :param name: The name of the map
+    :type name: str
+    :param stats: A mapping of player IDs to stats over both sides
+    :type stats: dict[int, PlayerStats]
+    :param attack: A mapping of player IDs to stats on the attacking side
+    :type attack: dict[int, PlayerStats]
+    :param defense: A mapping of player IDs to stats on the defending side
+    :type defense: dict[int, PlayerStats]
+    """
+
+    game_id: int
+    name: str
+    stats: dict[int, PlayerStats] = field(default_factory=dict)
+    attack: dict[int, PlayerStats] = field(default_factory=dict)
+    defense: dict[int, PlayerStats] = field(default_factory=dict)
+
+    def get_side_stats(self, side: str) -> dict[int, PlayerStats]:
+        """Get the stats of every player on one side of the map
+
+        :param side: Either "attack" or "defense"
+        :type side: str
+
+        :return: A mapping of player IDs to stats
+        :rtype: dict[int, PlayerStats]
+        """
+        if side not in SIDES:
+            raise ValueError(f"Unknown side {side!r}, expected one of {SIDES}.")
+        return self.attack if side == "attack" else self.defense
+
+
 class Match:
     """Encapsulates all data related to valorant matches
 
@@ -553,6 +757,18 @@ class Match:
     :type teams: Tuple[Team, Team] | Tuple[()], by default ()
     """
 
+    __slots__ = (
+        "__id",
+        "__name",
+        "__event",
+        "__epoch",
+        "__teams",
+        "__stats",
+        "__side_stats",
+        "__maps",
+        "__final",
+    )
+
     def __init__(
         self,
         _id: int,
@@ -562,11 +778,16 @@ class Match:
         teams: Tuple[Team, Team] | Tuple[()] = (),
     ) -> None:
         self.__id = _id
-        self.__name = match_name
-        self.__event = event_name
+        self.__name = _intern(match_name)  # type: ignore
+        self.__event = _intern(event_name)  # type: ignore
         self.__epoch = epoch
         self.__teams = teams
         self.__stats: dict[int, PlayerStats] = {}
+        self.__side_stats: dict[str, dict[int, PlayerStats]] = {
+            side: {} for side in SIDES
+        }
+        self.__maps: List[MapStats] = []
+        self.__final = False
 
     def __eq__(self, other: object) -> bool:
         _logger.warning(
@@ -648,17 +869,56 @@ class Match:
         """
         return self.__stats
 
-    def get_player_stats(self, player: int) -> Optional[PlayerStats]:
+    def get_player_stats(
+        self, player: int, side: Optional[str] = None
+    ) -> Optional[PlayerStats]:
         """Gets the match stats for a specific player
 
         :param player: The vlr.gg ID of the player to get the stats for
         :type player: int
 
+        :param side: "attack" or "defense" to only get the player's stats on that side, defaults to None
+        :type side: Optional[str], optional
+
         :return: The player's stats, or None if the player was not part of the match
         :rtype: Optional[PlayerStats]
         """
+        if side is not None:
+            return self.get_side_stats(side).get(player, None)
         return self.__stats.get(player, None)
 
+    def get_side_stats(self, side: str) -> dict[int, PlayerStats]:
+        """Get the match stats of every player on one side
+
+        :param side: Either "attack" or "defense"
+        :type side: str
+
+        :return: A mapping of player IDs to stats
+        :rtype: dict[int, PlayerStats]
+        """
+        if side not in SIDES:
+            raise ValueError(f"Unknown side {side!r}, expected one of {SIDES}.")
+        return self.__side_stats[side]
+
+    def get_maps(self) -> List[MapStats]:
+        """Get the stats of each map played in the match, in the order they were played
+
+        :return: The stats of each map
+        :rtype: List[MapStats]
+        """
+        return self.__maps
+
+    def get_map(self, name: str) -> Optional[MapStats]:
+        """Get the stats of a map played in the match by its name
+
+        :param name: The name of the map, such as "Lotus"
+        :type name: str
+
+        :return: The stats of the map, or None if the map was not played
+        :rtype: Optional[MapStats]
+        """
+        return next((m for m in self.__maps if m.name == name), None)
+
     def get_date(self) -> float:
         """Get the match epoch
 
@@ -675,6 +935,44 @@ class Match:
         """
         self.__stats = stats
 
+    def set_side_stats(self, side: str, stats: dict[int, PlayerStats]) -> None:
+        """Set the player stats dictionary of one side
+
+        :param side: Either "attack" or "defense"
+        :type side: str
+
+        :param stats: The stat data
+        :type stats: dict[int, PlayerStats]
+        """
+        if side not in SIDES:
+            raise ValueError(f"Unknown side {side!r}, expected one of {SIDES}.")
+        self.__side_stats[side] = stats
+
+    def set_maps(self, maps: List[MapStats]) -> None:
+        """Set the stats of each map played in the match
+
+        :param maps: The stats of each map
+        :type maps: List[MapStats]
+        """
+        self.__maps = maps
+
+    def is_final(self) -> bool:
+        """Check whether the match had finished when it was scraped. Upcoming and live matches are not final,
+        even once live matches have stats
+
+        :return: True if the match has finished, otherwise False
+        :rtype: bool
+        """
+        return self.__final
+
+    def set_final(self, final: bool) -> None:
+        """Set whether the match had finished when it was scraped
+
+        :param final: Whether the match has finished
+        :type final: bool
+        """
+        self.__final = final
+
     def add_match_stat(self, player: int, stats: PlayerStats) -> None:
         """Add a player's stats to the match
 
@@ -0,0 +1,125 @@
+"""This module implements the policy used to retry failed requests
+
+Implements:
+    - `RetryPolicy`, a dataclass describing how many times, how often and for how long to retry a request
+    - `get_retry_policy` / `set_retry_policy`, functions to get or swap the policy used by every resource
+"""
+
+import random
+import threading
+
+from dataclasses import dataclass
+from typing import Optional, FrozenSet
+
+import requests
+
+from vlrscraper.logger import get_logger
+
+_logger = get_logger()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Describes how a :class:`vlrscraper.resource.Resource` retries requests that failed for a transient reason
+
+    Retries wait for an exponentially growing backoff with full jitter, or for as long as the server asked in
+    its `Retry-After` header if that is longer.
+
+    .. code-block:: python
+
+        # Try each page up to 5 times, but give up on a page after a minute
+        set_retry_policy(RetryPolicy(attempts=5, deadline=60))
+
+    :param attempts: The maximum number of attempts made for each request, defaults to 3
+    :type attempts: int, optional
+
+    :param backoff: The number of seconds the first retry waits for at most, doubling with each retry,
+        defaults to 0.5
+    :type backoff: float, optional
+
+    :param max_backoff: The most seconds a single retry can wait for, defaults to 10.0
+    :type max_backoff: float, optional
+
+    :param statuses: The status codes that are worth retrying, defaults to 429, 500, 502, 503 and 504
+    :type statuses: FrozenSet[int], optional
+
+    :param deadline: The most seconds to spend on a request including every retry, or None for no limit,
+        defaults to 30.0
+    :type deadline: Optional[float], optional
+    """
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+    statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    deadline: Optional[float] = 30.0
+
+    def __post_init__(self) -> None:
+        if self.attempts <= 0:
+            raise ValueError("Retry attempts must be a positive integer.")
+        if self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError("Retry backoff must not be negative.")
+
+    def is_retryable(
+        self, status: Optional[int], error: Optional[Exception] = None
+    ) -> bool:
+        """Check whether a request is worth retrying
+
+        Requests that failed without a response are only retried if they could not connect or timed out, so
+        a malformed url is not requested again.
+
+        :param status: The status code of the response, or None if the request failed without a response
+        :type status: Optional[int]
+
+        :param error: The error raised by a request that failed without a response, defaults to None
+        :type error: Optional[Exception], optional
+
+        :return: True if the request should be retried, otherwise False
+        :rtype: bool
+        """
+        if status is None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return status in self.statuses
+
+    def get_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Get the number of seconds to wait before retrying a request
+
+        :param attempt: The number of attempts that have been made so far
+        :type attempt: int
+
+        :param retry_after: The number of seconds the server asked us to wait, defaults to None
+        :type retry_after: Optional[float], optional
+
+        :return: The delay
+        :rtype: float
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+        return max(delay, retry_after or 0)
+
+
+class _RetryPolicyConfig:
+    policy = RetryPolicy()
+    lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the retry policy used by every resource that was not given its own policy
+
+    :return: The shared retry policy
+    :rtype: RetryPolicy
+    """
+    with _RetryPolicyConfig.lock:
+        return _RetryPolicyConfig.policy
+
+
+def set_retry_policy(policy: RetryPolicy) -> None:
+    """Swap the retry policy used by every resource that was not given its own policy
+
+    :param policy: The new retry policy, for example `RetryPolicy(attempts=1)` to never retry
+    :type policy: RetryPolicy
+    """
+    _logger.info(f"Setting shared retry policy to {policy}")
+    with _RetryPolicyConfig.lock:
+        _RetryPolicyConfig.policy = policy
@@ -3,24 +3,72 @@
 Implements:
     - `XpathParser`, a class that can be used to scrape sites by xpath strings
     - `xpath`, a function that generates xpath strings based on the arguments passed
+    - `compile_xpath`, a function that compiles xpath strings once and caches the result
+    - `extract_element`, a function that cuts a single element out of raw page bytes without parsing the page
+    - `ThreadedMatchScraper`, a class that fetches and parses many match pages with a bounded pipeline
+    - `Paginator`, a class that iterates over the pages of a paginated resource while prefetching the next ones
+    - `fetch_many`, a function that scrapes many IDs at once on the shared worker pool, yielding as each finishes
+    - `get_worker_pool` / `set_worker_pool`, functions to get or resize the shared worker pool
 """
 
-import time
-import requests
-
-from threading import Thread
-from typing import Optional, List, Union, Tuple
+import re
+import multiprocessing
+
+from collections import deque
+from functools import lru_cache
+from queue import Queue, Empty, Full
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from threading import Thread, Event, Lock, BoundedSemaphore
+from typing import (
+    Optional,
+    List,
+    Union,
+    Iterable,
+    Iterator,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Set,
+    Tuple,
+    IO,
+    TYPE_CHECKING,
+)
 
 from lxml import html
 from lxml.html import HtmlMixin, HtmlElement
-from lxml.etree import _Element
+from lxml.etree import _Element, XPath
 
 from vlrscraper.resources import Match
 from vlrscraper.logger import get_logger
-from vlrscraper.utils import thread_over_data
+
+if TYPE_CHECKING:
+    from vlrscraper.resource import Resource
 
 _logger = get_logger()
 
+# Sentinel passed down the ThreadedMatchScraper pipeline when a stage has finished
+_DONE = object()
+# How often (in seconds) blocked pipeline stages check whether they have been stopped
+_STOP_CHECK_INTERVAL = 0.1
+
+# Elements that no XPATH ever reads, dropped from pages parsed with `prune=True`
+PRUNED_TAGS = ("script", "style", "noscript", "iframe", "header", "nav")
+# Elements with classes that no XPATH ever reads, such as the discussion threads under match pages
+PRUNED_CLASSES = XPath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' post-container ')]"
+)
+# The size of the chunks that file-like objects are read in
+READ_CHUNK_SIZE = 64 * 1024
+# Opening and closing tags of each element type that `extract_element` can cut out, by tag name
+_TAG_PATTERNS: Dict[str, "re.Pattern[bytes]"] = {}
+
 
 class XpathParser:
     """Implements easier methods of parsing XPATH
@@ -41,22 +89,105 @@ class XpathParser:
         else:
             raise TypeError("Data must be either string or HtmlElement")
 
-    def get_element(self, xpath: str) -> Optional[HtmlElement]:
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes], prune: bool = False) -> "XpathParser":
+        """Create a parser by feeding a page to lxml one chunk at a time, so that the page can be parsed
+        while it is still being downloaded, without ever holding all of its data at once
+
+        With `prune` set, comments are dropped as the page is parsed and the subtrees matched by `PRUNED_TAGS`
+        / `PRUNED_CLASSES` as soon as it has been, so the tree that is kept only holds the parts of the page
+        that are scraped, and XPATHs have less of it to search.
+
+        .. code-block:: python
+
+            with open("match.html", "rb") as f:
+                parser = XpathParser.from_file(f, prune=True)
+
+        :param chunks: The chunks of the page's data, in order
+        :type chunks: Iterable[bytes]
+
+        :param prune: Whether to drop the parts of the page that are never scraped, defaults to False
+        :type prune: bool, optional
+
+        :return: The parser
+        :rtype: XpathParser
+        """
+        feed_parser = html.HTMLParser(remove_comments=prune, collect_ids=False)
+        for chunk in chunks:
+            feed_parser.feed(chunk)
+        root = feed_parser.close()
+
+        if prune:
+            for element in [*root.iter(*PRUNED_TAGS), *PRUNED_CLASSES(root)]:
+                element.drop_tree()
+        return cls.from_element(root)
+
+    @classmethod
+    def from_file(
+        cls, file: IO[bytes], prune: bool = False, chunk_size: int = READ_CHUNK_SIZE
+    ) -> "XpathParser":
+        """Create a parser from a binary file-like object, reading and parsing it one chunk at a time
+
+        :param file: The file-like object to read the page's data from
+        :type file: IO[bytes]
+
+        :param prune: Whether to drop the parts of the page that are never scraped, defaults to False
+        :type prune: bool, optional
+
+        :param chunk_size: The number of bytes to read at a time, defaults to 64KiB
+        :type chunk_size: int, optional
+
+        :return: The parser
+        :rtype: XpathParser
+        """
+        return cls.from_chunks(iter(lambda: file.read(chunk_size), b""), prune)
+
+    @classmethod
+    def from_element(cls, element: HtmlElement) -> "XpathParser":
+        """Create a parser for part of an already parsed page, so that relative XPATHs (starting with `.`)
+        are evaluated from the given element rather than the whole document
+
+        :param element: The element to parse from
+        :type element: :class:`lxml.html.HtmlElement`
+
+        :return: The parser
+        :rtype: XpathParser
+        """
+        parser = cls.__new__(cls)
+        parser.content = element
+        return parser
+
+    def evaluate(self, xpath: Union[str, XPath]) -> Any:
+        """Evaluate an XPATH against the page
+
+        Strings are compiled with :func:`compile_xpath`, so each expression is only compiled once
+
+        :param xpath: The XPATH string or precompiled XPATH to evaluate
+        :type xpath: Union[str, :class:`lxml.etree.XPath`]
+
+        :return: The result of the XPATH
+        :rtype: :class:`typing.Any`
+        """
+        if isinstance(xpath, str):
+            xpath = compile_xpath(xpath)
+        return xpath(self.content)
+
+    def get_element(self, xpath: Union[str, XPath]) -> Optional[HtmlElement]:
         """Gets a single HTML element from an XPATH string
 
         Args:
-            xpath (str): The XPATH to the element
+            xpath (str | XPath): The XPATH to the element
 
         Returns:
             html.HtmlElement: the HtmlElement at the desired XPATH
         """
-        elem = self.content.xpath(xpath)
+        elem = self.evaluate(xpath)
         if isinstance(elem, list):
             return elem[0] if elem else None
         return None
 
     def get_elements(
-        self, xpath: str, attr: str = ""
+        self, xpath: Union[str, XPath], attr: str = ""
     ) -> Union[List[HtmlElement], List[str]]:
         """Gets a list of htmlElements that match a given XPATH
 
@@ -64,14 +195,14 @@ class XpathParser:
         elements
 
         Args:
-            xpath (str): The XPATH to match the elements to
+            xpath (str | XPath): The XPATH to match the elements to
             attr (str): The attribute to get from each element (or '')
 
         Returns:
             List[str | html.HtmlElement]: The list of elements that match the given XPATH
         """
 
-        elements = self.content.xpath(xpath)
+        elements = self.evaluate(xpath)
 
         if not isinstance(elements, list):
             return []
@@ -86,11 +217,11 @@ class XpathParser:
             else elements
         )
 
-    def get_img(self, xpath: str) -> str:
+    def get_img(self, xpath: Union[str, XPath]) -> str:
         """Gets an image src from a given XPATH string
 
         Args:
-            xpath (str): the XPATH to find the image at.
+            xpath (str | XPath): the XPATH to find the image at.
 
         Returns:
             Optional[str]: the data contained in the `src` tag of the `HtmlElement` at the XPATH, or None if the src tag cannot be located.
@@ -99,11 +230,11 @@ class XpathParser:
             return ""
         return element.get("src", "").strip()
 
-    def get_href(self, xpath: str) -> str:
+    def get_href(self, xpath: Union[str, XPath]) -> str:
         """Gets an link href from a given XPATH string
 
         :param xpath: The XPATH to find the link at
-        :type xpath: str
+        :type xpath: Union[str, :class:`lxml.etree.XPath`]
 
         :return: The data contained in the href tag of the :class:`lxml.html.HtmlElement` at the XPATH, or "" if the href tag cannot be located
         :rtype: str
@@ -112,11 +243,11 @@ class XpathParser:
             return ""
         return element.get("href", "").strip()
 
-    def get_text(self, xpath: str) -> str:
+    def get_text(self, xpath: Union[str, XPath]) -> str:
         """Gets the inner text of the given XPATH
 
         Args:
-            xpath (str): The XPATH to find the text container at
+            xpath (str | XPath): The XPATH to find the text container at
 
         Returns:
             Optional[str]: The inner text of the element, or None if no element or text could be found
@@ -133,7 +264,7 @@ class XpathParser:
     def get_text_from_element(self, elem: HtmlMixin) -> str:
         return str(elem.text_content()).replace("\t", "").replace("\n", "").strip()
 
-    def get_text_many(self, xpath: str) -> List[str]:
+    def get_text_many(self, xpath: Union[str, XPath]) -> List[str]:
         elems = self.get_elements(xpath)
 
         return [
@@ -174,65 +305,574 @@ def xpath(elem: str, root: str = "", **kwargs) -> str:
     )
 
 
-def join(*xpath: str) -> str:
+def join(*xpath: Union[str, XPath]) -> str:
     """Create an xpath that is the combination of the xpaths provided
     Performs a similar function to `os.path.join()`
 
     :param *xpath: The xpaths or elements to combine
-    :type xpath: List[str]
+    :type xpath: List[Union[str, :class:`lxml.etree.XPath`]]
 
     :return: The result of a join across all given xpaths
     :rtype: str
     """
-    return "//" + "//".join(map(lambda f: f[2:] if f.startswith("//") else f, xpath))
+    paths = [x.path if isinstance(x, XPath) else x for x in xpath]
+    return "//" + "//".join(map(lambda f: f[2:] if f.startswith("//") else f, paths))
+
+
+@lru_cache(maxsize=None)
+def compile_xpath(path: str) -> XPath:
+    """Compile an XPATH string, returning the same compiled XPATH every time the same string is given
+
+    :param path: The XPATH string to compile
+    :type path: str
+
+    :return: The compiled XPATH
+    :rtype: :class:`lxml.etree.XPath`
+    """
+    return XPath(path)
+
+
+def extract_element(data: bytes, marker: bytes, tag: str = "div") -> Optional[bytes]:
+    """Cut the element whose opening tag contains `marker` out of the raw bytes of a page, by counting the
+    opening and closing tags that follow it rather than parsing the page
+
+    The element can then be parsed on its own, which is much cheaper than parsing the whole page when only a
+    small part of it is scraped. Tags inside comments or scripts are counted too, so callers should check that
+    the fragment contains what they expect and fall back to parsing the whole page if not.
+
+    .. code-block:: python
+
+        fragment = extract_element(data, b'class="vm-stats-game mod-active"')
+        if fragment is not None:
+            parser = XpathParser.from_chunks((fragment,))
+
+    :param data: The byte data of the page
+    :type data: bytes
+
+    :param marker: Bytes that only appear in the opening tag of the element, such as its class attribute
+    :type marker: bytes
+
+    :param tag: The tag name of the element, defaults to "div"
+    :type tag: str, optional
+
+    :return: The bytes of the element including its opening and closing tags, or None if it is not on the page
+        or is never closed
+    :rtype: Optional[bytes]
+    """
+    if (position := data.find(marker)) == -1:
+        return None
+    start = data.rfind(b"<", 0, position)
+    if start == -1 or not data.startswith(f"<{tag}".encode(), start):
+        return None
+
+    if (pattern := _TAG_PATTERNS.get(tag)) is None:
+        pattern = _TAG_PATTERNS[tag] = re.compile(
+            rf"<(/?){tag}[\s>]".encode(), re.IGNORECASE
+        )
+    depth = 0
+    for match in pattern.finditer(data, start):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            if (end := data.find(b">", match.end() - 1)) == -1:
+                return None
+            return data[start : end + 1]
+    return None
 
 
 class ThreadedMatchScraper:
-    def __init__(self, ids: List[int]) -> None:
-        self.__ids: List[int] = ids
-        self.__responses: List[Tuple[int, bytes]] = []
-        self.__data: List[Match] = []
-        self.__scraping = False
-
-    def fetch_single_url(self, _id: int) -> None:
-        response = requests.get(f"https://vlr.gg/{_id}")
-        if response.status_code == 200:
-            self.__responses.append((_id, response.content))
-        else:
+    """Scrapes vlr.gg match pages using a bounded producer / consumer pipeline
+
+    Match IDs are fed lazily to `fetch_workers` threads, whose responses are passed through a bounded
+    queue to `parse_workers` threads. When a queue is full the stage before it blocks until there is room,
+    so the number of unparsed pages held in memory never exceeds `queue_size`, however many IDs are given.
+
+    If an :class:`vlrscraper.store.EntityStore` is set, stored matches are loaded from it instead of being
+    fetched, and matches parsed in full are stored.
+
+    .. code-block:: python
+
+        # Get every match at once, newest first
+        matches = ThreadedMatchScraper(match_ids).run()
+
+        # Or handle each match as soon as it has been parsed
+        for match in ThreadedMatchScraper(match_ids, fetch_workers=8):
+            print(match.get_full_name())
+
+    :param ids: The vlr.gg IDs of the matches to scrape
+    :type ids: Iterable[int]
+
+    :param fetch_workers: The number of threads fetching match pages, defaults to 2
+    :type fetch_workers: int, optional
+
+    :param parse_workers: The number of threads parsing fetched pages, defaults to 1
+    :type parse_workers: int, optional
+
+    :param queue_size: The maximum number of items waiting between each stage, defaults to 8
+    :type queue_size: int, optional
+
+    :param processes: The number of processes to parse pages in, or 0 to parse in the parse worker threads.
+        Parsing is CPU-bound, so use processes when fetching outpaces a single core, defaults to 0
+    :type processes: int, optional
+
+    :param ordered: Whether to yield matches in the order their IDs were given rather than the order they
+        finish parsing in, defaults to False
+    :type ordered: bool, optional
+
+    :param reorder_buffer: The maximum number of matches that may be in flight or waiting to be yielded in
+        order at once when `ordered` is set, defaults to 32
+    :type reorder_buffer: int, optional
+
+    :param mode: Which parts of each match page to parse, see
+        :func:`vlrscraper.controllers.MatchController.parse_match_record`, defaults to "full"
+    :type mode: str, optional
+    """
+
+    def __init__(
+        self,
+        ids: Iterable[int],
+        fetch_workers: int = 2,
+        parse_workers: int = 1,
+        queue_size: int = 8,
+        processes: int = 0,
+        ordered: bool = False,
+        reorder_buffer: int = 32,
+        mode: str = "full",
+    ) -> None:
+        from vlrscraper.controllers import MATCH_PARSE_MODES
+
+        if fetch_workers <= 0 or parse_workers <= 0 or queue_size <= 0:
+            raise ValueError("Worker counts and queue size must be positive integers.")
+        if reorder_buffer <= 0:
+            raise ValueError("Reorder buffer size must be a positive integer.")
+        if processes < 0:
+            raise ValueError("Process count must not be negative.")
+        if mode not in MATCH_PARSE_MODES:
+            raise ValueError(f"Unknown match parse mode {mode!r}.")
+
+        # Each parse thread hands one page at a time to the process pool, so keep every process busy
+        parse_workers = max(parse_workers, processes)
+
+        self.__ids: Iterable[int] = ids
+        self.__fetch_workers = fetch_workers
+        self.__parse_workers = parse_workers
+        self.__processes = processes
+        self.__process_pool: Optional[ProcessPoolExecutor] = None
+        self.__id_queue: "Queue[Any]" = Queue(maxsize=queue_size)
+        self.__responses: "Queue[Any]" = Queue(maxsize=queue_size)
+        self.__results: "Queue[Any]" = Queue(maxsize=queue_size)
+        self.__stopped = Event()
+        self.__started = False
+        self.__lock = Lock()
+        self.__running_fetchers = fetch_workers
+        self.__running_parsers = parse_workers
+        self.__ordered = ordered
+        self.__mode = mode
+        # Stops the feeder getting more than `reorder_buffer` matches ahead of the next match to be yielded
+        self.__reorder_slots = BoundedSemaphore(reorder_buffer)
+
+    def stop(self) -> None:
+        """Signal every stage of the pipeline to shut down as soon as its current item is done"""
+        self.__stopped.set()
+
+    def is_stopped(self) -> bool:
+        """Check whether the pipeline has been told to shut down
+
+        :return: True if :func:`stop` has been called, otherwise False
+        :rtype: bool
+        """
+        return self.__stopped.is_set()
+
+    def _put(self, queue: "Queue[Any]", item: Any) -> bool:
+        """Put an item on a queue, blocking while the queue is full unless the pipeline is stopped
+
+        :return: True if the item was queued, False if the pipeline stopped first
+        :rtype: bool
+        """
+        while not self.__stopped.is_set():
+            try:
+                queue.put(item, timeout=_STOP_CHECK_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _get(self, queue: "Queue[Any]") -> Any:
+        """Take an item from a queue, blocking while the queue is empty unless the pipeline is stopped
+
+        :return: The item, or the shutdown sentinel if the pipeline stopped first
+        :rtype: :class:`typing.Any`
+        """
+        while not self.__stopped.is_set():
+            try:
+                return queue.get(timeout=_STOP_CHECK_INTERVAL)
+            except Empty:
+                continue
+        return _DONE
+
+    def _acquire_reorder_slot(self) -> bool:
+        """Wait until there is room in the reorder buffer, unless the pipeline is stopped
+
+        :return: True if a slot was taken, False if the pipeline stopped first
+        :rtype: bool
+        """
+        while not self.__stopped.is_set():
+            if self.__reorder_slots.acquire(timeout=_STOP_CHECK_INTERVAL):
+                return True
+        return False
+
+    def fetch_single_url(self, _id: int) -> Optional[bytes]:
+        """Fetch the page data of a single match
+
+        :param _id: The vlr.gg ID of the match
+        :type _id: int
+
+        :return: The page data, or None if it could not be fetched
+        :rtype: Optional[bytes]
+        """
+        from vlrscraper.vlr_resources import match_resource
+
+        try:
+            response = match_resource.get_data(_id)
+        except Exception as e:
+            _logger.error(f"Could not fetch data for match {_id}: {e}")
+            return None
+        if not response["success"]:
             _logger.warning(
-                f"Could not fetch data for match {_id}: {response.status_code}"
+                f"Could not fetch data for match {_id}: {response['error']}"
             )
+            return None
+        return response["data"]
+
+    def feed_ids(self) -> None:
+        """Feed the match IDs to the fetch workers, followed by one shutdown sentinel per worker"""
+        # IDs may be produced lazily (for example while match lists are still being paginated), so make sure
+        # the fetch workers are shut down even if producing them fails
+        try:
+            for seq, _id in enumerate(self.__ids):
+                if self.__ordered and not self._acquire_reorder_slot():
+                    return
+                if not self._put(self.__id_queue, (seq, _id)):
+                    return
+        except Exception as e:
+            _logger.error(f"Could not get the IDs of the matches to scrape: {e}")
+        for _ in range(self.__fetch_workers):
+            self._put(self.__id_queue, _DONE)
 
     def fetch_urls(self) -> None:
+        """Fetch match pages until the ID queue is exhausted, passing the data on to the parse workers"""
         _logger.info(f"Began fetch URL thread for {self}")
-        """ for _id in self.__ids:
-            response = requests.get(f"https://vlr.gg/{_id}")
-            if response.status_code == 200:
-                self.__responses.append((_id, response.content))
-            else:
-                _logger.warning(f"Could not fetch data for match {_id}: {response.status_code}") """
-        thread_over_data(self.__ids, self.fetch_single_url, 2)
-        self.__scraping = False
+        # Failed matches are still passed on as None, so that ordered iteration knows not to wait for them
+        from vlrscraper.store import get_store
+
+        store = get_store()
+        while (item := self._get(self.__id_queue)) is not _DONE:
+            seq, _id = item
+            match = None
+            try:
+                match = store.get_match(_id) if store is not None else None
+            except Exception as e:
+                _logger.error(f"Could not load match {_id} from the store: {e}")
+            # Stored matches skip both the network and the parse workers
+            if match is not None:
+                if not self._put(self.__results, (seq, match)):
+                    return
+            elif not self._put(
+                self.__responses, (seq, _id, self.fetch_single_url(_id))
+            ):
+                return
+
+        with self.__lock:
+            self.__running_fetchers -= 1
+            last_fetcher = self.__running_fetchers == 0
+        if last_fetcher:
+            for _ in range(self.__parse_workers):
+                self._put(self.__responses, _DONE)
 
     def parse_data(self) -> None:
-        _logger.info(f"Begain data parsing thread for {self}")
+        """Parse fetched match pages until every fetch worker has finished"""
+        _logger.info(f"Began data parsing thread for {self}")
         from vlrscraper.controllers import MatchController
+        from vlrscraper.store import get_store
+
+        # Only complete matches are stored, so matches parsed in other modes are fetched again next time
+        store = get_store() if self.__mode == "full" else None
+        while (item := self._get(self.__responses)) is not _DONE:
+            seq, _id, data = item
+            match = None
+            try:
+                if data is not None and self.__process_pool is None:
+                    match = MatchController.parse_match(_id, data, self.__mode)
+                elif data is not None:
+                    match = MatchController.match_from_record(
+                        self.__process_pool.submit(
+                            MatchController.parse_match_record, _id, data, self.__mode
+                        ).result()
+                    )
+                # A match that cannot be stored is still yielded, and fetched again next time
+                if store is not None and match is not None and match.is_final():
+                    store.put_match(match)
+            except Exception as e:
+                _logger.error(f"Could not parse or store data for match {_id}: {e}")
+            if not self._put(self.__results, (seq, match)):
+                return
+
+        with self.__lock:
+            self.__running_parsers -= 1
+            last_parser = self.__running_parsers == 0
+        if last_parser:
+            self._put(self.__results, _DONE)
+
+    def __iter__(self) -> Iterator[Match]:
+        """Start the pipeline and yield each match as soon as it has been parsed
+
+        Matches are yielded in the order that they finish parsing, or in the order their IDs were given if
+        the scraper is ordered. If the caller stops iterating early, the pipeline is shut down.
+        """
+        with self.__lock:
+            if self.__started:
+                raise RuntimeError("A ThreadedMatchScraper can only be run once.")
+            self.__started = True
+
+        # Forking while other threads hold locks (such as those of the shared compiled XPaths) can leave a
+        # child deadlocked, so the processes are spawned fresh instead
+        if self.__processes:
+            self.__process_pool = ProcessPoolExecutor(
+                max_workers=self.__processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
 
-        while self.__scraping or self.__responses:
-            if not self.__responses:
-                time.sleep(0.2)
-                continue
-            _id, data = self.__responses.pop(0)
-            self.__data.append(MatchController.parse_match(_id, data))
+        threads = [
+            Thread(target=self.feed_ids, daemon=True),
+            *(
+                Thread(target=self.fetch_urls, daemon=True)
+                for _ in range(self.__fetch_workers)
+            ),
+            *(
+                Thread(target=self.parse_data, daemon=True)
+                for _ in range(self.__parse_workers)
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        waiting: Dict[int, Optional[Match]] = {}
+        next_seq = 0
+        try:
+            while (item := self._get(self.__results)) is not _DONE:
+                if not self.__ordered:
+                    if item[1] is not None:
+                        yield item[1]
+                    continue
+
+                waiting[item[0]] = item[1]
+                while next_seq in waiting:
+                    match = waiting.pop(next_seq)
+                    next_seq += 1
+                    self.__reorder_slots.release()
+                    if match is not None:
+                        yield match
+        finally:
+            self.stop()
+            if self.__process_pool is not None:
+                self.__process_pool.shutdown(wait=False)
 
     def run(self) -> List[Match]:
-        fetch_thread = Thread(target=self.fetch_urls)
-        parse_thread = Thread(target=self.parse_data)
+        """Scrape every match
+
+        :return: The matches that could be scraped, newest first
+        :rtype: List[Match]
+        """
+        return sorted(self, key=lambda m: m.get_date(), reverse=True)
+
+
+class Paginator:
+    """Iterate over the pages of a paginated vlr.gg resource in order, fetching the next pages in the
+    background while the current one is being parsed
+
+    Pages are numbered from 1 and fetched until one cannot be fetched. Stop iterating as soon as no more
+    pages are needed, and any pages still being fetched are abandoned.
+
+    .. code-block:: python
+
+        for parser in Paginator(player_match_resource, 4004, prefetch=3):
+            if not parser.get_elements(const.PLAYER_MATCHES):
+                break
+
+    :param page_resource: A function that returns the resource of the given page number
+    :type page_resource: :class:`collections.abc.Callable`
+
+    :param _id: The vlr.gg ID to get the pages of
+    :type _id: int
+
+    :param prefetch: The number of pages being fetched at once, defaults to 2
+    :type prefetch: int, optional
+    """
+
+    def __init__(
+        self, page_resource: Callable[[int], "Resource"], _id: int, prefetch: int = 2
+    ) -> None:
+        if prefetch <= 0:
+            raise ValueError("Prefetch page count must be a positive integer.")
+        self.__page_resource = page_resource
+        self.__id = _id
+        self.__prefetch = prefetch
+
+    def get_prefetch(self) -> int:
+        """Get the number of pages that this paginator fetches at once
+
+        :return: The prefetch page count
+        :rtype: int
+        """
+        return self.__prefetch
+
+    def __iter__(self) -> Iterator[XpathParser]:
+        executor = ThreadPoolExecutor(max_workers=self.__prefetch)
+        pending: Deque[Future] = deque()
+        page = 1
+        try:
+            while True:
+                while len(pending) < self.__prefetch:
+                    pending.append(
+                        executor.submit(self.__page_resource(page).get_data, self.__id)
+                    )
+                    page += 1
+
+                if not (data := pending.popleft().result())["success"]:
+                    _logger.info(f"Stopped paginating {self.__id}: {data['error']}")
+                    return
+                yield XpathParser(data["data"])
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+class _WorkerPoolConfig:
+    workers = 16
+    pool: Optional[ThreadPoolExecutor] = None
+    # The number of `fetch_many` calls running on each pool, so a replaced pool is only shut down once idle
+    users: Dict[ThreadPoolExecutor, int] = {}
+    lock = Lock()
+
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """Get the thread pool that batches of players, teams and matches are scraped on, creating it if needed
+
+    :return: The shared worker pool
+    :rtype: :class:`concurrent.futures.ThreadPoolExecutor`
+    """
+    with _WorkerPoolConfig.lock:
+        return _get_worker_pool()
+
+
+def _get_worker_pool() -> ThreadPoolExecutor:
+    """Get the shared worker pool, creating it if needed. The worker pool lock must be held"""
+    if _WorkerPoolConfig.pool is None:
+        _WorkerPoolConfig.pool = ThreadPoolExecutor(
+            max_workers=_WorkerPoolConfig.workers, thread_name_prefix="vlrscraper"
+        )
+    return _WorkerPoolConfig.pool
+
+
+def _acquire_worker_pool() -> Tuple[ThreadPoolExecutor, int]:
+    """Get the shared worker pool and its size, keeping the pool running until it is released
+
+    :return: A tuple of the pool and its number of threads
+    :rtype: Tuple[:class:`concurrent.futures.ThreadPoolExecutor`, int]
+    """
+    with _WorkerPoolConfig.lock:
+        pool = _get_worker_pool()
+        _WorkerPoolConfig.users[pool] = _WorkerPoolConfig.users.get(pool, 0) + 1
+        return pool, _WorkerPoolConfig.workers
 
-        self.__scraping = True
 
-        fetch_thread.start()
-        parse_thread.start()
-        parse_thread.join()
+def _release_worker_pool(pool: ThreadPoolExecutor) -> None:
+    """Release a pool taken with :func:`_acquire_worker_pool`, shutting it down if it has been replaced and
+    nothing else is running on it
+
+    :param pool: The pool
+    :type pool: :class:`concurrent.futures.ThreadPoolExecutor`
+    """
+    with _WorkerPoolConfig.lock:
+        if users := _WorkerPoolConfig.users.pop(pool) - 1:
+            _WorkerPoolConfig.users[pool] = users
+            return
+        if pool is _WorkerPoolConfig.pool:
+            return
+    pool.shutdown(wait=False)
 
-        return sorted(self.__data, key=lambda m: m.get_date(), reverse=True)
+
+def set_worker_pool(workers: int) -> None:
+    """Resize the thread pool that batches of players, teams and matches are scraped on. Scrapes already
+    running on the old pool are finished on it, and it is shut down once they are done
+
+    .. code-block:: python
+
+        # Match the shared transport's connection pool
+        set_worker_pool(get_transport().get_pool_maxsize())
+
+    :param workers: The number of threads in the pool
+    :type workers: int
+    """
+    if workers <= 0:
+        raise ValueError("Worker count must be a positive integer.")
+    _logger.info(f"Setting shared worker pool size to {workers}")
+    with _WorkerPoolConfig.lock:
+        old_pool = _WorkerPoolConfig.pool
+        _WorkerPoolConfig.workers = workers
+        _WorkerPoolConfig.pool = None
+        if old_pool is None or old_pool in _WorkerPoolConfig.users:
+            return
+    old_pool.shutdown(wait=False)
+
+
+def fetch_many(
+    ids: Iterable[int], fetch: Callable[[int], Any], max_pending: Optional[int] = None
+) -> Iterator[Tuple[int, Any]]:
+    """Call a function on many IDs at once on the shared worker pool, yielding each result as soon as it is ready
+
+    IDs are read lazily and duplicates are only fetched once. At most `max_pending` IDs are submitted to the
+    pool at once, so a long list of IDs does not flood the pool's queue, and if the caller stops iterating
+    the IDs that have not started yet are cancelled.
+
+    .. code-block:: python
+
+        for _id, response in fetch_many(ids, player_resource.get_data):
+            print(_id, response["success"])
+
+    :param ids: The IDs to fetch
+    :type ids: Iterable[int]
+
+    :param fetch: The function to call with each ID, which should not raise
+    :type fetch: :class:`collections.abc.Callable`
+
+    :param max_pending: The maximum number of IDs submitted at once, defaults to twice the pool size
+    :type max_pending: Optional[int], optional
+
+    :return: A generator of (ID, result) tuples, in the order they finish
+    :rtype: Iterator[Tuple[int, Any]]
+    """
+    pool, workers = _acquire_worker_pool()
+    max_pending = max_pending or 2 * workers
+    pending: Dict[Future, int] = {}
+    seen: Set[int] = set()
+    ids = iter(ids)
+    try:
+        while True:
+            for _id in ids:
+                if _id in seen:
+                    continue
+                seen.add(_id)
+                pending[pool.submit(fetch, _id)] = _id
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        _release_worker_pool(pool)
@@ -0,0 +1,337 @@
+"""This module implements compact columnar storage of player stats, for aggregating stats across many matches
+
+Implements:
+    - `StatsTable`, a table of player stats stored as one typed array per stat, with a null mask per stat
+    - `stats_groups`, a function that gets every group of player stats in a match, over the whole match and
+      on each map, for each side
+"""
+
+from array import array
+from itertools import compress
+from dataclasses import fields
+from typing import Optional, Dict, Iterable, Tuple, Union, Any
+
+from vlrscraper.resources import Match, MapStats, PlayerStats, SIDES
+from vlrscraper.logger import get_logger
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+_logger = get_logger()
+
+# The name of every column of PlayerStats, in order
+STAT_FIELDS = tuple(field.name for field in fields(PlayerStats))
+# The array typecode of each stat column. Rating is a float, every other stat a whole number
+_TYPECODES = {name: "d" if name == "rating" else "q" for name in STAT_FIELDS}
+# Turns a null mask into a mask of the values that are present, at C speed
+_INVERT_MASK = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+def stats_groups(
+    match: Match,
+) -> Iterable[Tuple[Optional[MapStats], str, Dict[int, PlayerStats]]]:
+    """Get every group of player stats in a match, over the whole match and on each map, for both sides and
+    each side on its own
+
+    :param match: The match
+    :type match: Match
+
+    :return: A generator of (map stats or None for the whole match, side, stats) tuples
+    :rtype: Iterable[Tuple[Optional[MapStats], str, Dict[int, PlayerStats]]]
+    """
+    yield None, "both", match.get_stats()
+    for side in SIDES:
+        yield None, side, match.get_side_stats(side)
+    for game in match.get_maps():
+        yield game, "both", game.stats
+        for side in SIDES:
+            yield game, side, game.get_side_stats(side)
+
+
+class StatsTable:
+    """A table of player stats, with one row per player per match
+
+    Each stat is stored in its own typed :class:`array.array` with a matching null mask, rather than as a
+    :class:`PlayerStats` object per row, so millions of rows take a few bytes each. Sums and means can be
+    taken over the whole table or per player, and use NumPy when it is installed.
+
+    .. code-block:: python
+
+        table = StatsTable.from_matches(MatchController.iter_player_matches(4004, previous_epoch(days=365)))
+        table.mean("rating"), table.sum("kills", by_player=True)
+
+        # With NumPy installed
+        stats = table.to_numpy()
+        stats["ACS"].mean()
+    """
+
+    def __init__(self) -> None:
+        self.__match_ids = array("q")
+        self.__player_ids = array("q")
+        self.__columns = {name: array(_TYPECODES[name]) for name in STAT_FIELDS}
+        self.__nulls = {name: bytearray() for name in STAT_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.__player_ids)
+
+    @classmethod
+    def from_matches(
+        cls, matches: Iterable[Match], side: Optional[str] = None
+    ) -> "StatsTable":
+        """Create a table of the stats of every player in the given matches
+
+        :param matches: The matches, for example a generator from :func:`MatchController.iter_player_matches`
+        :type matches: Iterable[Match]
+
+        :param side: "attack" or "defense" to only include the stats of that side, defaults to None
+        :type side: Optional[str], optional
+
+        :return: The table
+        :rtype: StatsTable
+        """
+        table = cls()
+        for match in matches:
+            table.add_match(match, side)
+        return table
+
+    def add_match(self, match: Match, side: Optional[str] = None) -> None:
+        """Add a row to the table for every player in a match
+
+        :param match: The match
+        :type match: Match
+
+        :param side: "attack" or "defense" to only add the stats of that side, defaults to None
+        :type side: Optional[str], optional
+        """
+        stats = match.get_stats() if side is None else match.get_side_stats(side)
+        for player, player_stats in stats.items():
+            self.append(match.get_id(), player, player_stats)
+
+    def append(self, match_id: int, player_id: int, stats: PlayerStats) -> None:
+        """Add a row to the table
+
+        :param match_id: The vlr.gg ID of the match
+        :type match_id: int
+
+        :param player_id: The vlr.gg ID of the player
+        :type player_id: int
+
+        :param stats: The player's stats in the match
+        :type stats: PlayerStats
+        """
+        self.__match_ids.append(match_id)
+        self.__player_ids.append(player_id)
+        for name in STAT_FIELDS:
+            value = getattr(stats, name)
+            self.__columns[name].append(0 if value is None else value)
+            self.__nulls[name].append(value is None)
+
+    def extend(self, other: "StatsTable") -> None:
+        """Add every row of another table to the end of this one
+
+        :param other: The table to add the rows of
+        :type other: StatsTable
+        """
+        self.__match_ids.extend(other.get_match_ids())
+        self.__player_ids.extend(other.get_player_ids())
+        for name in STAT_FIELDS:
+            self.__columns[name].extend(other.get_column(name))
+            self.__nulls[name].extend(other.get_nulls(name))
+
+    def get_match_ids(self) -> "array[int]":
+        """Get the match ID of every row
+
+        :return: The match IDs
+        :rtype: array.array
+        """
+        return self.__match_ids
+
+    def get_player_ids(self) -> "array[int]":
+        """Get the player ID of every row
+
+        :return: The player IDs
+        :rtype: array.array
+        """
+        return self.__player_ids
+
+    def get_column(self, name: str) -> "array[Any]":
+        """Get the values of a stat in every row. Missing values are stored as 0, see :func:`get_nulls`
+
+        :param name: The name of a field of :class:`PlayerStats`, such as "rating"
+        :type name: str
+
+        :return: The values
+        :rtype: array.array
+        """
+        if name not in self.__columns:
+            raise KeyError(f"Unknown stat {name!r}, expected one of {STAT_FIELDS}.")
+        return self.__columns[name]
+
+    def get_nulls(self, name: str) -> bytearray:
+        """Get the null mask of a stat, which is 1 in each row the stat is missing from and 0 otherwise
+
+        :param name: The name of a field of :class:`PlayerStats`
+        :type name: str
+
+        :return: The null mask
+        :rtype: bytearray
+        """
+        self.get_column(name)
+        return self.__nulls[name]
+
+    def get_row(self, index: int) -> Tuple[int, int, PlayerStats]:
+        """Get a single row of the table
+
+        :param index: The index of the row
+        :type index: int
+
+        :return: The match ID, player ID and stats of the row
+        :rtype: Tuple[int, int, PlayerStats]
+        """
+        return (
+            self.__match_ids[index],
+            self.__player_ids[index],
+            PlayerStats(
+                *(
+                    None if self.__nulls[name][index] else self.__columns[name][index]
+                    for name in STAT_FIELDS
+                )
+            ),
+        )
+
+    def sum(self, name: str, by_player: bool = False) -> Union[float, Dict[int, float]]:
+        """Sum a stat over every row it is present in
+
+        :param name: The name of a field of :class:`PlayerStats`, such as "kills"
+        :type name: str
+
+        :param by_player: Whether to sum each player's rows separately, defaults to False
+        :type by_player: bool, optional
+
+        :return: The sum, or a dictionary mapping each player ID to their sum if `by_player` is set
+        :rtype: Union[float, Dict[int, float]]
+        """
+        sums, _ = self.__aggregate(name, by_player)
+        return sums
+
+    def mean(
+        self, name: str, by_player: bool = False
+    ) -> Union[Optional[float], Dict[int, float]]:
+        """Average a stat over every row it is present in
+
+        :param name: The name of a field of :class:`PlayerStats`, such as "rating"
+        :type name: str
+
+        :param by_player: Whether to average each player's rows separately, defaults to False
+        :type by_player: bool, optional
+
+        :return: The mean, or None if the stat is missing from every row. If `by_player` is set, a dictionary
+            mapping the ID of each player with the stat present to their mean
+        :rtype: Union[Optional[float], Dict[int, float]]
+        """
+        sums, counts = self.__aggregate(name, by_player)
+        if by_player:
+            return {player: sums[player] / counts[player] for player in sums}
+        return sums / counts if counts else None
+
+    def __aggregate(self, name: str, by_player: bool) -> Tuple[Any, Any]:
+        """Get the sum and count of a stat's present values, either overall or per player
+
+        :return: The sum and count, or dictionaries mapping each player ID to their sum and count
+        :rtype: Tuple[Any, Any]
+        """
+        column, nulls = self.get_column(name), self.get_nulls(name)
+
+        if np is not None:
+            values = np.frombuffer(column, dtype=column.typecode)
+            present = np.frombuffer(nulls, dtype=np.uint8) == 0
+            if not by_player:
+                return float(values[present].sum()), int(present.sum())
+            players, groups = np.unique(
+                np.frombuffer(self.__player_ids, dtype=np.int64)[present],
+                return_inverse=True,
+            )
+            sums = np.bincount(groups, weights=values[present]).tolist()
+            counts = np.bincount(groups).tolist()
+            players = players.tolist()
+            return dict(zip(players, sums)), dict(zip(players, counts))
+
+        present = nulls.translate(_INVERT_MASK)
+        if not by_player:
+            return float(sum(compress(column, present))), sum(present)
+        sums: Dict[int, float] = {}
+        counts: Dict[int, int] = {}
+        for player, value, p in zip(self.__player_ids, column, present):
+            if p:
+                sums[player] = sums.get(player, 0.0) + value
+                counts[player] = counts.get(player, 0) + 1
+        return sums, counts
+
+    def to_numpy(self) -> Any:
+        """Export the table to a NumPy masked structured array, without converting each row in python
+
+        The array has a `match_id` and `player_id` field followed by one field per stat, and missing stats
+        are masked. Requires NumPy.
+
+        :return: The table as a masked array
+        :rtype: :class:`numpy.ma.MaskedArray`
+        """
+        if np is None:
+            raise ImportError(
+                "Exporting stats to NumPy requires numpy to be installed."
+            )
+
+        dtype = np.dtype(
+            [("match_id", np.int64), ("player_id", np.int64)]
+            + [(name, _TYPECODES[name]) for name in STAT_FIELDS]
+        )
+        data = np.empty(len(self), dtype=dtype)
+        mask = np.zeros(len(self), dtype=np.ma.make_mask_descr(dtype))
+        data["match_id"] = np.frombuffer(self.__match_ids, dtype=np.int64)
+        data["player_id"] = np.frombuffer(self.__player_ids, dtype=np.int64)
+        for name in STAT_FIELDS:
+            column = self.__columns[name]
+            data[name] = np.frombuffer(column, dtype=column.typecode)
+            mask[name] = np.frombuffer(self.__nulls[name], dtype=np.uint8) != 0
+        return np.ma.MaskedArray(data, mask=mask)
+
+    @classmethod
+    def from_numpy(cls, data: Any) -> "StatsTable":
+        """Import a table from a NumPy structured array such as one returned by :func:`to_numpy`
+
+        Masked values are treated as missing, as are NaN ratings. Requires NumPy.
+
+        :param data: A structured array or masked structured array with a `match_id` and `player_id` field
+            and a field for every stat
+        :type data: :class:`numpy.ndarray`
+
+        :return: The table
+        :rtype: StatsTable
+        """
+        if np is None:
+            raise ImportError(
+                "Importing stats from NumPy requires numpy to be installed."
+            )
+        if missing := {"match_id", "player_id", *STAT_FIELDS} - set(
+            data.dtype.names or ()
+        ):
+            raise ValueError(f"Structured array is missing the fields {missing}.")
+
+        table = cls()
+        table.__match_ids.frombytes(
+            np.ascontiguousarray(data["match_id"], dtype=np.int64).tobytes()
+        )
+        table.__player_ids.frombytes(
+            np.ascontiguousarray(data["player_id"], dtype=np.int64).tobytes()
+        )
+        for name in STAT_FIELDS:
+            nulls = np.ma.getmaskarray(data[name])
+            values = np.ma.getdata(data[name])
+            if _TYPECODES[name] == "d":
+                nulls = nulls | np.isnan(values)
+            values = np.where(nulls, 0, values).astype(_TYPECODES[name])
+            table.__columns[name].frombytes(values.tobytes())
+            table.__nulls[name].extend(nulls.astype(np.uint8).tobytes())
+        return table
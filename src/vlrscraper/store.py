@@ -0,0 +1,615 @@
+"""This module implements persistent storage of scraped entities, so they do not have to be scraped again
+
+Implements:
+    - `EntityStore`, an indexed SQLite database of players, teams, matches and match stats with batched upserts,
+      along with the watermark each player's and team's matches have been synced up to
+    - `get_store` / `set_store`, functions to get or swap the store that the controllers read and write
+"""
+
+import sqlite3
+import threading
+
+from itertools import islice
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple, Any
+
+from vlrscraper.resources import Player, PlayerStatus, Team, Match
+from vlrscraper.stats import STAT_FIELDS, stats_groups
+from vlrscraper.logger import get_logger
+
+_logger = get_logger()
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS players (
+        id INTEGER PRIMARY KEY,
+        display_name TEXT,
+        name TEXT,
+        image TEXT,
+        status INTEGER,
+        team_id INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS teams (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        tag TEXT,
+        logo TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS matches (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        event TEXT,
+        epoch REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS match_teams (
+        match_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        team_id INTEGER NOT NULL,
+        PRIMARY KEY (match_id, position)
+    )""",
+    """CREATE TABLE IF NOT EXISTS match_players (
+        match_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        team_id INTEGER NOT NULL,
+        player_id INTEGER NOT NULL,
+        display_name TEXT,
+        PRIMARY KEY (match_id, position)
+    )""",
+    """CREATE TABLE IF NOT EXISTS match_maps (
+        match_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        game_id INTEGER NOT NULL,
+        name TEXT,
+        PRIMARY KEY (match_id, position)
+    )""",
+    # A game ID of 0 holds the stats over the whole match
+    f"""CREATE TABLE IF NOT EXISTS stats (
+        match_id INTEGER NOT NULL,
+        game_id INTEGER NOT NULL,
+        side TEXT NOT NULL,
+        player_id INTEGER NOT NULL,
+        {", ".join(f'"{name}" {"REAL" if name == "rating" else "INTEGER"}' for name in STAT_FIELDS)},
+        PRIMARY KEY (match_id, game_id, side, player_id)
+    )""",
+    # The newest match of each player or team that every older match has been synced up to
+    """CREATE TABLE IF NOT EXISTS watermarks (
+        kind TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        match_id INTEGER NOT NULL,
+        epoch REAL NOT NULL,
+        PRIMARY KEY (kind, id)
+    )""",
+    "CREATE INDEX IF NOT EXISTS matches_epoch ON matches (epoch)",
+    "CREATE INDEX IF NOT EXISTS match_teams_team ON match_teams (team_id, match_id)",
+    "CREATE INDEX IF NOT EXISTS match_players_player ON match_players (player_id, match_id)",
+    "CREATE INDEX IF NOT EXISTS stats_player ON stats (player_id, match_id)",
+]
+
+# Upserts keep the fields already stored when a scrape is missing them, such as a player scraped from a match page
+_UPSERT_PLAYER = """INSERT INTO players VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET
+    display_name = COALESCE(excluded.display_name, display_name),
+    name = COALESCE(excluded.name, name),
+    image = COALESCE(excluded.image, image),
+    status = COALESCE(excluded.status, status),
+    team_id = COALESCE(excluded.team_id, team_id)"""
+_UPSERT_TEAM = """INSERT INTO teams VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET
+    name = COALESCE(excluded.name, name),
+    tag = COALESCE(excluded.tag, tag),
+    logo = COALESCE(excluded.logo, logo)"""
+_MATCH_TABLES = ("matches", "match_teams", "match_players", "match_maps", "stats")
+
+
+class EntityStore:
+    """A local SQLite database of scraped players, teams, matches and the stats of each player in each match
+
+    Entities are upserted, so storing a player or team again updates it and keeps any fields the new scrape
+    is missing, while storing a match again replaces it. Writes of many entities are batched into one
+    transaction per `batch_size` entities. Matches are indexed by date, team and player.
+
+    Set a store with :func:`set_store` and the controllers will load matches from it instead of fetching
+    them, and store every entity they scrape.
+
+    .. code-block:: python
+
+        store = EntityStore("vlr.sqlite")
+        set_store(store)
+        MatchController.get_player_matches(4004, previous_epoch(days=365))   # Only new matches are fetched
+        store.get_match_ids(player=4004, _from=previous_epoch(days=30))
+
+    :param path: The path of the SQLite database, defaults to ":memory:"
+    :type path: str, optional
+
+    :param batch_size: The number of entities written per transaction by the `put_*s` methods, defaults to 500
+    :type batch_size: int, optional
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 500) -> None:
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+
+        self.__batch_size = batch_size
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        with self.__db:
+            for statement in _SCHEMA:
+                self.__db.execute(statement)
+
+    def put_player(self, player: Player) -> None:
+        """Store a player, along with their current team
+
+        :param player: The player
+        :type player: Player
+        """
+        self.put_players((player,))
+
+    def put_players(self, players: Iterable[Player]) -> int:
+        """Store many players in batched transactions, along with their current teams
+
+        :param players: The players
+        :type players: Iterable[Player]
+
+        :return: The number of players stored
+        :rtype: int
+        """
+        return self.__put_batched(players, self.__write_player)
+
+    def put_team(self, team: Team) -> None:
+        """Store a team, along with the players on its roster, whose current team becomes the team
+
+        :param team: The team
+        :type team: Team
+        """
+        self.put_teams((team,))
+
+    def put_teams(self, teams: Iterable[Team]) -> int:
+        """Store many teams in batched transactions, along with the players on their rosters. See :func:`put_team`
+
+        :param teams: The teams
+        :type teams: Iterable[Team]
+
+        :return: The number of teams stored
+        :rtype: int
+        """
+        return self.__put_batched(teams, self.__write_team)
+
+    def put_match(self, match: Match) -> None:
+        """Store a match, replacing any stored match with the same ID
+
+        :param match: The match
+        :type match: Match
+        """
+        self.put_matches((match,))
+
+    def put_matches(self, matches: Iterable[Match]) -> int:
+        """Store many matches in batched transactions, replacing any stored matches with the same IDs
+
+        Matches are read lazily, so a generator such as :func:`MatchController.iter_player_matches` is
+        stored as it is scraped.
+
+        :param matches: The matches
+        :type matches: Iterable[Match]
+
+        :return: The number of matches stored
+        :rtype: int
+        """
+        return self.__put_batched(matches, self.__write_match)
+
+    def get_player(self, _id: int) -> Optional[Player]:
+        """Load a stored player
+
+        :param _id: The vlr.gg ID of the player
+        :type _id: int
+
+        :return: The player, with their current team if it is stored, or None if the player is not stored
+        :rtype: Optional[Player]
+        """
+        with self.__lock:
+            if (row := self.__fetch("SELECT * FROM players WHERE id = ?", _id)) is None:
+                return None
+            team = self.__fetch("SELECT * FROM teams WHERE id = ?", row[0][5])
+        return EntityStore.__player(
+            row[0], None if team is None else Team(*team[0], None)
+        )
+
+    def get_team(self, _id: int) -> Optional[Team]:
+        """Load a stored team, with the stored players whose current team it is as its roster
+
+        :param _id: The vlr.gg ID of the team
+        :type _id: int
+
+        :return: The team, or None if the team is not stored
+        :rtype: Optional[Team]
+        """
+        with self.__lock:
+            if (row := self.__fetch("SELECT * FROM teams WHERE id = ?", _id)) is None:
+                return None
+            players = self.__fetch(
+                "SELECT * FROM players WHERE team_id = ? ORDER BY id", _id
+            )
+        team = Team(*row[0], None)
+        if players is not None:
+            team.set_roster([EntityStore.__player(player, team) for player in players])
+        return team
+
+    def get_match(self, _id: int) -> Optional[Match]:
+        """Load a stored match
+
+        :param _id: The vlr.gg ID of the match
+        :type _id: int
+
+        :return: The match, or None if the match is not stored
+        :rtype: Optional[Match]
+        """
+        return next(self.__load_matches((_id,)), None)
+
+    def has_match(self, _id: int) -> bool:
+        """Check whether a match is stored
+
+        :param _id: The vlr.gg ID of the match
+        :type _id: int
+
+        :return: True if the match is stored, otherwise False
+        :rtype: bool
+        """
+        with self.__lock:
+            return self.__fetch("SELECT 1 FROM matches WHERE id = ?", _id) is not None
+
+    def get_match_ids(
+        self,
+        player: Optional[int] = None,
+        team: Optional[int] = None,
+        _from: Optional[float] = None,
+        to: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """Get the IDs and dates of the stored matches, filtered by player, team and date
+
+        :param player: The vlr.gg ID of a player that played in the matches, defaults to None
+        :type player: Optional[int], optional
+
+        :param team: The vlr.gg ID of a team that played in the matches, defaults to None
+        :type team: Optional[int], optional
+
+        :param _from: The epoch to get matches from, defaults to None
+        :type _from: Optional[float], optional
+
+        :param to: The epoch to get matches to, defaults to None
+        :type to: Optional[float], optional
+
+        :return: A list of (match ID, epoch) tuples, newest first
+        :rtype: List[Tuple[int, float]]
+        """
+        query, params = "SELECT id, epoch FROM matches WHERE 1", []
+        if player is not None:
+            query += (
+                " AND id IN (SELECT match_id FROM match_players WHERE player_id = ?)"
+            )
+            params.append(player)
+        if team is not None:
+            query += " AND id IN (SELECT match_id FROM match_teams WHERE team_id = ?)"
+            params.append(team)
+        if _from is not None:
+            query += " AND epoch >= ?"
+            params.append(_from)
+        if to is not None:
+            query += " AND epoch <= ?"
+            params.append(to)
+
+        with self.__lock:
+            return self.__db.execute(
+                query + " ORDER BY epoch DESC, id DESC", params
+            ).fetchall()
+
+    def iter_matches(
+        self,
+        player: Optional[int] = None,
+        team: Optional[int] = None,
+        _from: Optional[float] = None,
+        to: Optional[float] = None,
+    ) -> Iterator[Match]:
+        """Iterate over the stored matches, filtered by player, team and date. See :func:`get_match_ids`
+
+        :return: A generator of matches, newest first
+        :rtype: Iterator[Match]
+        """
+        return self.__load_matches(
+            match_id for match_id, _ in self.get_match_ids(player, team, _from, to)
+        )
+
+    def get_latest_match(
+        self, player: Optional[int] = None, team: Optional[int] = None
+    ) -> Optional[Tuple[int, float]]:
+        """Get the newest stored match, optionally of a player or team
+
+        :param player: The vlr.gg ID of a player that played in the match, defaults to None
+        :type player: Optional[int], optional
+
+        :param team: The vlr.gg ID of a team that played in the match, defaults to None
+        :type team: Optional[int], optional
+
+        :return: The (match ID, epoch) of the newest match, or None if there is no such match stored
+        :rtype: Optional[Tuple[int, float]]
+        """
+        return next(iter(self.get_match_ids(player, team)), None)
+
+    def get_watermark(self, kind: str, _id: int) -> Optional[Tuple[int, float]]:
+        """Get the newest match of a player or team that their matches have been synced up to
+
+        :param kind: "player" or "team"
+        :type kind: str
+
+        :param _id: The vlr.gg ID of the player or team
+        :type _id: int
+
+        :return: The (match ID, epoch) of the watermark, or None if the matches have never been synced
+        :rtype: Optional[Tuple[int, float]]
+        """
+        with self.__lock:
+            row = self.__fetch(
+                "SELECT match_id, epoch FROM watermarks WHERE kind = ? AND id = ?",
+                kind,
+                _id,
+            )
+        return None if row is None else row[0]
+
+    def set_watermark(self, kind: str, _id: int, match_id: int, epoch: float) -> None:
+        """Record that every match of a player or team up to and including the given match has been synced
+
+        :param kind: "player" or "team"
+        :type kind: str
+
+        :param _id: The vlr.gg ID of the player or team
+        :type _id: int
+
+        :param match_id: The vlr.gg ID of the newest synced match
+        :type match_id: int
+
+        :param epoch: The epoch of the newest synced match
+        :type epoch: float
+        """
+        with self.__lock, self.__db:
+            self.__db.execute(
+                "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?)",
+                (kind, _id, match_id, epoch),
+            )
+
+    def get_stats(self) -> dict:
+        """Get the number of players, teams, matches and stats rows stored
+
+        :return: The counts
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                table: self.__db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("players", "teams", "matches", "stats")
+            }
+
+    def close(self) -> None:
+        """Close the underlying database"""
+        with self.__lock:
+            self.__db.close()
+
+    def __put_batched(self, entities: Iterable[Any], write: Any) -> int:
+        """Write entities with the given function, committing once per `batch_size` entities
+
+        :return: The number of entities written
+        :rtype: int
+        """
+        count = 0
+        entities = iter(entities)
+        while batch := list(islice(entities, self.__batch_size)):
+            with self.__lock, self.__db:
+                for entity in batch:
+                    write(entity)
+            count += len(batch)
+            _logger.debug(f"Stored {count} entities in {self}")
+        return count
+
+    def __write_player(self, player: Player, team_id: Optional[int] = None) -> None:
+        if (team := player.get_current_team()) is not None:
+            self.__write_team(team, roster=False)
+            team_id = team.get_id()
+        self.__db.execute(
+            _UPSERT_PLAYER,
+            (
+                player.get_id(),
+                player.get_display_name(),
+                player.get_name(),
+                player.get_image(),
+                None if (status := player.get_status()) is None else int(status),
+                team_id,
+            ),
+        )
+
+    def __write_team(self, team: Team, roster: bool = True) -> None:
+        # Match pages have no team tag, so an empty tag is treated as missing
+        self.__db.execute(
+            _UPSERT_TEAM,
+            (team.get_id(), team.get_name(), team.get_tag() or None, team.get_logo()),
+        )
+        for player in (team.get_roster() or []) if roster else []:
+            self.__write_player(player, team.get_id())
+
+    def __write_match(self, match: Match) -> None:
+        _id = match.get_id()
+        for table in _MATCH_TABLES:
+            self.__db.execute(
+                f"DELETE FROM {table} WHERE {'id' if table == 'matches' else 'match_id'} = ?",
+                (_id,),
+            )
+
+        self.__db.execute(
+            "INSERT INTO matches VALUES (?, ?, ?, ?)",
+            (_id, match.get_name(), match.get_event_name(), match.get_date()),
+        )
+        teams = match.get_teams()
+        for team in teams:
+            self.__write_team(team, roster=False)
+        self.__db.executemany(
+            "INSERT INTO match_teams VALUES (?, ?, ?)",
+            ((_id, i, team.get_id()) for i, team in enumerate(teams)),
+        )
+        roster = [
+            (team, player) for team in teams for player in team.get_roster() or []
+        ]
+        for _, player in roster:
+            self.__write_player(player)
+        self.__db.executemany(
+            "INSERT INTO match_players VALUES (?, ?, ?, ?, ?)",
+            (
+                (_id, i, team.get_id(), player.get_id(), player.get_display_name())
+                for i, (team, player) in enumerate(roster)
+            ),
+        )
+        self.__db.executemany(
+            "INSERT INTO match_maps VALUES (?, ?, ?, ?)",
+            (
+                (_id, i, game.game_id, game.name)
+                for i, game in enumerate(match.get_maps())
+            ),
+        )
+        self.__db.executemany(
+            f"INSERT INTO stats VALUES ({', '.join('?' * (4 + len(STAT_FIELDS)))})",
+            (
+                (
+                    _id,
+                    0 if game is None else game.game_id,
+                    side,
+                    player,
+                    *(getattr(player_stats, name) for name in STAT_FIELDS),
+                )
+                for game, side, stats in stats_groups(match)
+                for player, player_stats in stats.items()
+            ),
+        )
+
+    def __load_matches(self, ids: Iterable[int]) -> Iterator[Match]:
+        """Rebuild stored matches one at a time, skipping any that are not stored
+
+        :return: A generator of matches, in the order of their IDs
+        :rtype: Iterator[Match]
+        """
+        from vlrscraper.controllers import MatchController
+
+        for _id in ids:
+            if (record := self.__match_record(_id)) is not None:
+                yield MatchController.match_from_record(record)
+
+    def __match_record(self, _id: int) -> Optional[dict]:
+        """Read a stored match into the record format of :func:`MatchController.parse_match_record`
+
+        :return: The match record, or None if the match is not stored
+        :rtype: Optional[dict]
+        """
+        with self.__lock:
+            if (
+                match := self.__fetch("SELECT * FROM matches WHERE id = ?", _id)
+            ) is None:
+                return None
+            teams = self.__fetch(
+                "SELECT t.id, t.name, t.logo FROM match_teams m JOIN teams t ON t.id = m.team_id "
+                "WHERE m.match_id = ? ORDER BY m.position",
+                _id,
+            )
+            players = self.__fetch(
+                "SELECT team_id, player_id, display_name FROM match_players WHERE match_id = ? "
+                "ORDER BY position",
+                _id,
+            )
+            maps = self.__fetch(
+                "SELECT game_id, name FROM match_maps WHERE match_id = ? ORDER BY position",
+                _id,
+            )
+            stats = self.__fetch(
+                "SELECT * FROM stats WHERE match_id = ? ORDER BY rowid", _id
+            )
+
+        groups: Dict[Tuple[int, str], Dict[int, tuple]] = {}
+        for _, game_id, side, player, *fields in stats or []:
+            groups.setdefault((game_id, side), {})[player] = tuple(fields)
+
+        return {
+            "id": _id,
+            "name": match[0][1],
+            "event": match[0][2],
+            "epoch": match[0][3],
+            "teams": tuple(
+                (
+                    team_id,
+                    name,
+                    logo,
+                    [(p, n) for t, p, n in players or [] if t == team_id],
+                )
+                for team_id, name, logo in teams or []
+            ),
+            "stats": groups.get((0, "both"), {}),
+            "sides": {
+                side: groups.get((0, side), {}) for side in ("attack", "defense")
+            },
+            "maps": tuple(
+                (
+                    game_id,
+                    name,
+                    *(
+                        groups.get((game_id, side), {})
+                        for side in ("both", "attack", "defense")
+                    ),
+                )
+                for game_id, name in maps or []
+            ),
+            # Only finished matches are stored by the controllers
+            "final": True,
+        }
+
+    def __fetch(self, query: str, *params: Any) -> Optional[List[tuple]]:
+        """Run a query, which must be done while holding the lock
+
+        :return: The rows, or None if there are none
+        :rtype: Optional[List[tuple]]
+        """
+        return self.__db.execute(query, params).fetchall() or None
+
+    @staticmethod
+    def __player(row: tuple, team: Optional[Team]) -> Player:
+        """Build a player from a row of the players table"""
+        _id, display_name, name, image, status, _ = row
+        return Player(
+            _id,
+            display_name,
+            team,
+            name,
+            None,
+            image,
+            None if status is None else PlayerStatus(status),
+        )
+
+
+class _StoreConfig:
+    store: Optional[EntityStore] = None
+    lock = threading.Lock()
+
+
+def get_store() -> Optional[EntityStore]:
+    """Get the store that the controllers load matches from and save scraped entities to
+
+    :return: The store, or None if scraped entities are not being stored
+    :rtype: Optional[EntityStore]
+    """
+    with _StoreConfig.lock:
+        return _StoreConfig.store
+
+
+def set_store(store: Optional[EntityStore]) -> None:
+    """Swap the store that the controllers load matches from and save scraped entities to
+
+    .. code-block:: python
+
+        set_store(EntityStore("vlr.sqlite"))
+
+        # Stop storing scraped entities
+        set_store(None)
+
+    :param store: The new store, or None to stop storing entities
+    :type store: Optional[EntityStore]
+    """
+    _logger.info(f"Setting entity store to {store}")
+    with _StoreConfig.lock:
+        _StoreConfig.store = store
@@ -0,0 +1,357 @@
+"""This module implements the HTTP transport that every :class:`vlrscraper.resource.Resource` fetches data through
+
+Implements:
+    - `Transport`, a pooled keep-alive HTTP client with connect / read timeouts, compression, per-host reuse
+      and transfer stats, optional response caching and optional throttling
+    - `get_transport` / `set_transport`, functions to get or swap the transport shared by all resources
+"""
+
+import time
+import threading
+
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import brotli  # type: ignore
+
+from vlrscraper.cache import TTL, ResponseCache
+from vlrscraper.ratelimit import AdaptiveLimiter
+from vlrscraper.logger import get_logger
+
+_logger = get_logger()
+
+# Only advertise brotli when a brotli decoder (`brotli` or `brotlicffi`) is installed for urllib3 to decode with
+ACCEPT_ENCODING = "br, gzip" if brotli is not None else "gzip"
+# The size of the chunks that streamed bodies are read in
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class Transport:
+    """A pooled HTTP transport that keeps connections to each host alive between requests
+
+    :param pool_connections: The number of per-host connection pools to keep, defaults to 4
+    :type pool_connections: int, optional
+
+    :param pool_maxsize: The maximum number of keep-alive connections kept open to a single host, defaults to 16
+    :type pool_maxsize: int, optional
+
+    :param connect_timeout: The number of seconds to wait for a connection to be established, defaults to 5.0
+    :type connect_timeout: float, optional
+
+    :param read_timeout: The number of seconds to wait for the server to send data, defaults to 20.0
+    :type read_timeout: float, optional
+
+    :param pool_block: Whether to wait for a free connection when a host's pool is exhausted rather than
+        opening a throwaway connection, defaults to True
+    :type pool_block: bool, optional
+
+    :param cache: A cache to serve and store responses in, defaults to None
+    :type cache: ResponseCache, optional
+
+    :param limiter: A limiter that throttles every request sent over the network, defaults to None
+    :type limiter: AdaptiveLimiter, optional
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 20.0,
+        pool_block: bool = True,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ) -> None:
+        if pool_connections <= 0 or pool_maxsize <= 0:
+            raise ValueError("Transport pool sizes must be positive integers.")
+
+        self.__adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.__session = requests.Session()
+        self.__session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.__session.mount("https://", self.__adapter)
+        self.__session.mount("http://", self.__adapter)
+
+        self.__cache = cache
+        self.__limiter = limiter
+        self.__pool_maxsize = pool_maxsize
+        self.__timeout = (connect_timeout, read_timeout)
+        self.__lock = threading.Lock()
+        self.__requests: Dict[str, int] = {}
+        self.__connections: Dict[str, int] = {}
+        self.__wire_bytes: Dict[str, int] = {}
+        self.__decoded_bytes: Dict[str, int] = {}
+
+    def get_pool_maxsize(self) -> int:
+        """Get the maximum number of keep-alive connections kept open to a single host
+
+        :return: The pool size
+        :rtype: int
+        """
+        return self.__pool_maxsize
+
+    def get_timeout(self) -> tuple:
+        """Get the connect and read timeouts used for every request
+
+        :return: A tuple of (connect timeout, read timeout) in seconds
+        :rtype: tuple
+        """
+        return self.__timeout
+
+    def get_cache(self) -> Optional[ResponseCache]:
+        """Get the response cache used by this transport
+
+        :return: The cache, or None if responses are not cached
+        :rtype: Optional[ResponseCache]
+        """
+        return self.__cache
+
+    def get_limiter(self) -> Optional[AdaptiveLimiter]:
+        """Get the limiter that throttles requests sent by this transport
+
+        :return: The limiter, or None if requests are not throttled
+        :rtype: Optional[AdaptiveLimiter]
+        """
+        return self.__limiter
+
+    def get(
+        self, url: str, ttl: TTL = 0, stream: bool = False, **kwargs
+    ) -> requests.Response:
+        """Perform a GET request through the connection pool
+
+        If the transport has a cache, fresh cached responses are returned without a request, and stale
+        ones are revalidated using their `ETag` / `Last-Modified` validators.
+
+        Responses are compressed on the wire with brotli or gzip where the server supports it. Streamed
+        responses are returned as soon as their headers arrive, and their body should be read with
+        :func:`iter_body`. Bodies that need to be cached are always read in full.
+
+        :param url: The url to fetch
+        :type url: str
+
+        :param ttl: The number of seconds a cached response stays fresh for, None if it never expires, or a
+            function that gets either from the cached body, defaults to 0
+        :type ttl: TTL, optional
+
+        :param stream: Whether to return before the body has been downloaded, defaults to False
+        :type stream: bool, optional
+
+        :return: The response recieved from the server, or from the cache
+        :rtype: :class:`requests.Response`
+        """
+        if self.__cache is None:
+            return self._send(url, stream=stream, **kwargs)
+
+        if (cached := self.__cache.get(url, ttl)) is not None:
+            if cached["fresh"]:
+                return _cached_response(url, cached["content"])
+            headers = dict(kwargs.pop("headers", None) or {})
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+            kwargs["headers"] = headers
+
+        response = self._send(url, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            self.__cache.refresh(url)
+            return _cached_response(url, cached["content"])
+        if response.status_code == 200:
+            self.__cache.put(
+                url,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        return response
+
+    def _send(self, url: str, stream: bool = False, **kwargs) -> requests.Response:
+        """Send a GET request over the network through the connection pool
+
+        :param url: The url to fetch
+        :type url: str
+
+        :param stream: Whether to return before the body has been downloaded, defaults to False
+        :type stream: bool, optional
+
+        :return: The response recieved from the server
+        :rtype: :class:`requests.Response`
+        """
+        if self.__limiter is None:
+            response = self.__session.get(
+                url, timeout=self.__timeout, stream=stream, **kwargs
+            )
+            self._record(response)
+            return response
+
+        self.__limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = self.__session.get(
+                url, timeout=self.__timeout, stream=stream, **kwargs
+            )
+        except Exception:
+            self.__limiter.release(None, time.monotonic() - start)
+            raise
+        self.__limiter.release(
+            response.status_code,
+            time.monotonic() - start,
+            response.headers.get("Retry-After"),
+        )
+        self._record(response)
+        return response
+
+    def _record(self, response: requests.Response) -> None:
+        """Update the per-host request and connection counters after a request
+
+        :param response: The response that was recieved, including any redirects
+        :type response: :class:`requests.Response`
+        """
+        with self.__lock:
+            for resp in [*response.history, response]:
+                host = urlsplit(resp.url).netloc
+                self.__requests[host] = self.__requests.get(host, 0) + 1
+                if (pool := getattr(resp.raw, "_pool", None)) is not None:
+                    self.__connections[host] = pool.num_connections
+
+        # Streamed bodies are counted by iter_body once they have been read
+        if response._content_consumed:  # type: ignore
+            self._record_body(response, len(response.content))
+
+    def _record_body(self, response: requests.Response, decoded: int) -> None:
+        """Update the per-host transfer counters once a response body has been read
+
+        :param response: The response whose body was read
+        :type response: :class:`requests.Response`
+
+        :param decoded: The number of bytes in the decoded body
+        :type decoded: int
+        """
+        tell = getattr(response.raw, "tell", None)
+        wire = tell() if callable(tell) else decoded
+        _logger.debug(
+            f"Fetched {response.url}: {wire} bytes on the wire, {decoded} bytes decoded"
+            + f" ({response.headers.get('Content-Encoding', 'identity')})"
+        )
+        host = urlsplit(response.url).netloc
+        with self.__lock:
+            self.__wire_bytes[host] = self.__wire_bytes.get(host, 0) + wire
+            self.__decoded_bytes[host] = self.__decoded_bytes.get(host, 0) + decoded
+
+    def iter_body(
+        self, response: requests.Response, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Iterate over the decoded body of a response as it is downloaded
+
+        .. code-block:: python
+
+            response = transport.get(url, stream=True)
+            parser = XpathParser.from_chunks(transport.iter_body(response))
+
+        :param response: A response returned by :func:`get`
+        :type response: :class:`requests.Response`
+
+        :param chunk_size: The number of bytes to read from the wire at a time, defaults to 64KiB
+        :type chunk_size: int, optional
+
+        :return: A generator of decoded chunks of the body
+        :rtype: Iterator[bytes]
+        """
+        # Responses that were already read (for example from the cache) have nothing left to stream
+        if response.raw is None or response._content_consumed:  # type: ignore
+            yield response.content
+            return
+
+        decoded = 0
+        try:
+            for chunk in response.iter_content(chunk_size):
+                decoded += len(chunk)
+                yield chunk
+        finally:
+            response.close()
+        self._record_body(response, decoded)
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Get the connection reuse stats for every host that has been requested through this transport
+
+        .. code-block:: python
+
+            get_transport().get_stats()
+            # {'www.vlr.gg': {'requests': 20, 'connections': 2, 'reused': 18,
+            #                 'wire_bytes': 1312042, 'decoded_bytes': 9478254}}
+
+        :return: A mapping of hosts to their request, connection and reused connection counts, along with the
+            number of body bytes sent over the wire and the number of bytes they decoded to
+        :rtype: Dict[str, dict]
+        """
+        with self.__lock:
+            return {
+                host: {
+                    "requests": count,
+                    "connections": self.__connections.get(host, 0),
+                    "reused": max(count - self.__connections.get(host, 0), 0),
+                    "wire_bytes": self.__wire_bytes.get(host, 0),
+                    "decoded_bytes": self.__decoded_bytes.get(host, 0),
+                }
+                for host, count in self.__requests.items()
+            }
+
+    def close(self) -> None:
+        """Close every pooled connection held by this transport"""
+        self.__session.close()
+
+
+def _cached_response(url: str, content: bytes) -> requests.Response:
+    """Build a successful response from a cached body
+
+    :param url: The url the body was fetched from
+    :type url: str
+
+    :param content: The cached body
+    :type content: bytes
+
+    :return: The response
+    :rtype: :class:`requests.Response`
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response._content = content
+    response._content_consumed = True  # type: ignore
+    return response
+
+
+class _TransportConfig:
+    transport: Optional[Transport] = None
+    lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """Get the transport shared by every resource that was not given its own transport
+
+    The default shared transport throttles its requests with an :class:`vlrscraper.ratelimit.AdaptiveLimiter`,
+    so that scraping many pages at once does not get us blocked by vlr.gg.
+
+    :return: The shared transport, created on first use
+    :rtype: Transport
+    """
+    with _TransportConfig.lock:
+        if _TransportConfig.transport is None:
+            _TransportConfig.transport = Transport(limiter=AdaptiveLimiter())
+        return _TransportConfig.transport
+
+
+def set_transport(transport: Optional[Transport]) -> None:
+    """Swap the transport shared by every resource, for example to point them at a local test server
+
+    :param transport: The new transport, or None to create a fresh default transport on next use
+    :type transport: Optional[Transport]
+    """
+    _logger.info(f"Setting shared transport to {transport}")
+    with _TransportConfig.lock:
+        _TransportConfig.transport = transport
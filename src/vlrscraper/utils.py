@@ -6,7 +6,7 @@ import time
 
 from threading import Thread
 from datetime import datetime
-from typing import TypeVar, Type, Optional, Tuple, List, Any
+from typing import TypeVar, Type, Optional, Tuple, List, Union, Any
 
 from collections.abc import Callable
 
@@ -116,6 +116,102 @@ def previous_epoch(
     return time.time() - total_loss
 
 
+# A bound of a time window: an epoch, a function returning an epoch when the window is resolved, or None
+TimeBound = Union[float, "Callable[[], float]", None]
+
+
+class TimeWindow:
+    """A span of time to get matches within, whose bounds are resolved each time the window is used
+
+    Either bound may be left open, and may be a function that is called to get the epoch when the window is
+    resolved, so one window can be reused over a long-running process without "now" going stale.
+
+    .. code-block:: python
+
+        last_week = TimeWindow.last(days=7)
+        MatchController.get_player_matches(4004, last_week)   # The 7 days before each call
+        TimeWindow(to=lambda: previous_epoch(days=30))        # Everything older than 30 days before each call
+
+    :param _from: The epoch the window starts at, or None to leave it open, defaults to None
+    :type _from: Union[float, Callable[[], float], None], optional
+
+    :param to: The epoch the window ends at, or None to end it when it is resolved, defaults to None
+    :type to: Union[float, Callable[[], float], None], optional
+    """
+
+    __slots__ = ("__from", "__to")
+
+    def __init__(self, _from: TimeBound = None, to: TimeBound = None) -> None:
+        self.__from = _from
+        self.__to = to
+
+    def __repr__(self) -> str:
+        return f"TimeWindow({self.__from!r}, {self.__to!r})"
+
+    @classmethod
+    def last(
+        cls,
+        years: int = 0,
+        days: int = 0,
+        hours: int = 0,
+        minutes: int = 0,
+        seconds: int = 0,
+    ) -> "TimeWindow":
+        """Create a window of the given amount of time up to the moment it is resolved. See :func:`previous_epoch`
+
+        :return: The window
+        :rtype: TimeWindow
+        """
+        return cls(lambda: previous_epoch(years, days, hours, minutes, seconds))
+
+    @classmethod
+    def of(
+        cls, _from: Union["TimeWindow", TimeBound], to: TimeBound = None
+    ) -> "TimeWindow":
+        """Get a window from either a window or the bounds of one, as accepted by the controllers
+
+        :param _from: A window, or the epoch the window starts at
+        :type _from: Union[TimeWindow, float, Callable[[], float], None]
+
+        :param to: The epoch the window ends at if `_from` is not a window, defaults to None
+        :type to: Union[float, Callable[[], float], None], optional
+
+        :return: The window
+        :rtype: TimeWindow
+        """
+        if not isinstance(_from, TimeWindow):
+            return cls(_from, to)
+        if to is not None:
+            raise ValueError("Cannot give an end epoch along with a TimeWindow.")
+        return _from
+
+    def resolve(self) -> Tuple[float, float]:
+        """Get the epochs of the window's bounds as of now
+
+        :return: The start and end epochs, with an open start resolved to 0 and an open end to now
+        :rtype: Tuple[float, float]
+        """
+        _from, to = (
+            bound() if callable(bound) else bound for bound in (self.__from, self.__to)
+        )
+        return (
+            0.0 if _from is None else float(_from),
+            time.time() if to is None else float(to),
+        )
+
+    def contains(self, epoch: float) -> bool:
+        """Check whether an epoch is within the window as of now
+
+        :param epoch: The epoch to check
+        :type epoch: float
+
+        :return: True if the epoch is within the window, otherwise False
+        :rtype: bool
+        """
+        _from, to = self.resolve()
+        return _from <= epoch <= to
+
+
 def test_performance(func: Callable) -> Callable:
     """Decorator to test the performance of a function by timing it and logging the result to the
     logger's info stream
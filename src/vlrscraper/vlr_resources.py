@@ -1,15 +1,57 @@
+from typing import Optional
+
+import vlrscraper.constants as const
+
 from vlrscraper.resource import Resource
+from vlrscraper.scraping import extract_element
+
+# How long cached copies of pages that change over time stay fresh for
+PLAYER_TTL = 6 * 60 * 60
+TEAM_TTL = 6 * 60 * 60
+# Upcoming and live matches are refreshed often, so a match's stats are picked up soon after it finishes
+MATCH_TTL = 60
 
 
 def vlr_url(subdomain: str) -> str:
     return f"https://vlr.gg/{subdomain}"
 
 
-player_resource = Resource(vlr_url("player/<res_id>"))
+def is_match_final(data: bytes) -> bool:
+    """Check whether a match page is of a finished match, rather than an upcoming or live one. Live matches
+    already have stats, so only the status note above the score tells them apart
+
+    :param data: The byte data of the match page
+    :type data: bytes
+
+    :return: True if the match has finished, otherwise False
+    :rtype: bool
+    """
+    status = extract_element(data, const.MATCH_STATUS_REGION)
+    return status is not None and b"final" in status
+
+
+def match_ttl(data: bytes) -> Optional[float]:
+    """Get how long a cached match page stays fresh for. Finished matches never change, so their pages
+    never expire, while the pages of upcoming and live matches expire after `MATCH_TTL` seconds
+
+    :param data: The byte data of the match page
+    :type data: bytes
+
+    :return: The TTL, or None if the match has finished
+    :rtype: Optional[float]
+    """
+    return None if is_match_final(data) else MATCH_TTL
+
+
+player_resource = Resource(vlr_url("player/<res_id>"), ttl=PLAYER_TTL)
 player_teams_resource = Resource(vlr_url("player/matches/<res_id>"))
-team_resource = Resource(vlr_url("team/<res_id>"))
-match_resource = Resource(vlr_url("<res_id>"))
+team_resource = Resource(vlr_url("team/<res_id>"), ttl=TEAM_TTL)
+match_resource = Resource(vlr_url("<res_id>"), ttl=match_ttl)
 
 
 def player_match_resource(page: int) -> Resource:
     return Resource(vlr_url(f"player/matches/<res_id>?page={page}"))
+
+
+def team_match_resource(page: int) -> Resource:
+    return Resource(vlr_url(f"team/matches/<res_id>?page={page}"))
@@ -1,9 +1,15 @@
+import gzip
 import json
+import hashlib
+import threading
 import pytest  # type: ignore
 import requests
 
-from typing import Callable, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from vlrscraper.cache import get_memory_cache
 from vlrscraper.logger import get_logger
+from vlrscraper.transport import Transport, get_transport, set_transport
 
 regression_json: dict
 
@@ -37,23 +43,75 @@ def save_regression(url, response) -> None:
     )
 
 
-def requests_get_patch(original_get: Callable):
-    def patch(url):
-        result = original_get(url)
+class RegressionTransport(Transport):
+    """Serves responses stored in regressions.json, falling back to the real transport for new urls"""
+
+    def __init__(self, fallback: Transport) -> None:
+        super().__init__()
+        self.fallback = fallback
+
+    def get(self, url: str, **kwargs) -> requests.Response:
         if (regression := get_regression(url)) is not None:
             get_logger().warning(f"Using regression stored for {url}")
+            result = requests.Response()
+            result.url = url
             result.status_code = regression["status-code"]
             result._content = regression["content"].encode("utf-8")
         else:
+            result = self.fallback.get(url, **kwargs)
             save_regression(url, result)
         return result
 
-    return patch
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    get_memory_cache().clear()
+    yield
 
 
 @pytest.fixture
 def requests_regression():
-    old_get = requests.get
-    requests.get = requests_get_patch(old_get)
+    old_transport = get_transport()
+    set_transport(RegressionTransport(old_transport))
     yield
-    requests.get = old_get
+    set_transport(old_transport)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    routes: Dict[str, Tuple[int, bytes]] = {}
+    requests: List[Tuple[str, int]] = []
+
+    def do_GET(self) -> None:
+        status, body = self.routes.get(self.path, (404, b"Not found"))
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        self.requests.append((self.path, status))
+
+        self.send_response(status)
+        if body and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    """A local keep-alive HTTP server that serves the routes set in its handler's `routes` dict, gzipped if
+    the client accepts it, and records each (path, status) it responds with in its handler's `requests` list"""
+    handler = type("StandInHandler", (_StandInHandler,), {"routes": {}, "requests": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,72 @@
+# type: ignore
+import asyncio
+import pytest
+
+from vlrscraper.async_client import AsyncClient
+from vlrscraper.cache import get_memory_cache
+from vlrscraper.controllers import PlayerController
+from vlrscraper.resources import Match, PlayerStats
+from vlrscraper.store import EntityStore, set_store
+from vlrscraper.utils import TimeWindow
+
+
+def test_async_client_init():
+    with pytest.raises(ValueError):
+        AsyncClient(concurrency=0)
+
+    client = AsyncClient(concurrency=4)
+    assert client.get_concurrency() == 4
+    client.close()
+
+
+def test_async_get(requests_regression):
+    async def scrape():
+        async with AsyncClient(concurrency=4) as client:
+            return await asyncio.gather(
+                client.get_player(29873), client.get_team(2), client.get_player("1000")
+            )
+
+    benjy, sen, invalid = asyncio.run(scrape())
+    assert benjy.get_display_name() == "benjyfishy"
+    assert sen.get_name() == "Sentinels"
+    assert invalid is None
+
+
+def test_async_player_matches(requests_regression):
+    async def scrape():
+        async with AsyncClient(concurrency=4) as client:
+            return await client.get_player_matches(
+                4004, TimeWindow.of(1725224060.4716666, 1730407900.8408132)
+            )
+
+    matches = asyncio.run(scrape())
+    assert [m.get_id() for m in matches] == [413228, 413189, 412065, 408415, 408414]
+    assert matches[3].get_player_stats(729) == PlayerStats(
+        1.2, 245, 39, 30, 21, 9, 78, 146, 25, 9, 4, 5
+    )
+
+
+def test_async_client_layers(requests_regression):
+    async def scrape(*coroutines):
+        async with AsyncClient(concurrency=4) as client:
+            return await asyncio.gather(*(c(client) for c in coroutines))
+
+    # Players scraped by either client share the memory cache
+    zekken = PlayerController.get_player(4004)
+    hits = get_memory_cache().get_stats()["hits"]
+    (player,) = asyncio.run(scrape(lambda c: c.get_player(4004)))
+    assert get_memory_cache().get_stats()["hits"] == hits + 1
+    assert player is zekken
+
+    # Stored matches are loaded from the store
+    store = EntityStore()
+    match = Match(1, "Match", "Event", 1700000000.0, ())
+    match.set_stats({4004: PlayerStats(*[1] * 12)})
+    store.put_match(match)
+    set_store(store)
+    try:
+        (stored,) = asyncio.run(scrape(lambda c: c.get_match(1)))
+        assert stored.get_stats()[4004].kills == 1
+    finally:
+        set_store(None)
+        store.close()
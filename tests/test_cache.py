@@ -0,0 +1,159 @@
+# type: ignore
+import os
+import pytest
+
+from vlrscraper.cache import ResponseCache, MemoryCache, get_memory_cache, memoize
+from vlrscraper.controllers import MatchController, PlayerController, TeamController
+from vlrscraper.registry import get_registry
+from vlrscraper.resource import Resource
+from vlrscraper.transport import Transport
+from vlrscraper.vlr_resources import MATCH_TTL, match_resource, match_ttl
+
+
+def test_response_cache():
+    with pytest.raises(ValueError):
+        ResponseCache(max_size=0)
+
+    cache = ResponseCache()
+    assert cache.get("https://vlr.gg/1", None) is None
+
+    cache.put("https://vlr.gg/1", b"match", etag='"abc"')
+    assert cache.get("https://vlr.gg/1", None) == {
+        "content": b"match",
+        "etag": '"abc"',
+        "last_modified": None,
+        "fresh": True,
+    }
+    assert cache.get("https://vlr.gg/1", 0)["fresh"] is False
+
+    assert cache.get_stats() == {
+        "hits": 1,
+        "misses": 2,
+        "revalidated": 0,
+        "evictions": 0,
+        "entries": 1,
+        "size": cache.get_stats()["size"],
+    }
+
+    # The TTL can depend on the cached body
+    assert cache.get("https://vlr.gg/1", lambda body: None)["fresh"] is True
+    assert cache.get("https://vlr.gg/1", lambda body: 0)["fresh"] is False
+
+    cache.clear()
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_response_cache_persistent(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    cache.put("https://vlr.gg/1", b"match")
+    cache.close()
+
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    assert cache.get("https://vlr.gg/1", None)["content"] == b"match"
+
+
+def test_response_cache_eviction():
+    # Random bytes do not compress, so each entry is roughly 1000 bytes
+    pages = {url: os.urandom(1000) for url in ("a", "b", "c")}
+    cache = ResponseCache(max_size=2100)
+    cache.put("a", pages["a"])
+    cache.put("b", pages["b"])
+    cache.get("a", None)
+    cache.put("c", pages["c"])
+
+    # b was the least recently used entry
+    assert cache.get("b", None) is None
+    assert cache.get("a", None) is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_transport_cache(stand_in_server):
+    handler = stand_in_server.RequestHandlerClass
+    handler.routes.update({"/1": (200, b"<html>1</html>")})
+    transport = Transport(cache=ResponseCache())
+
+    forever = Resource(f"{stand_in_server.url}/<res_id>", transport, ttl=None)
+    assert forever.get_data(1)["data"] == b"<html>1</html>"
+    assert forever.get_data(1)["data"] == b"<html>1</html>"
+    assert handler.requests == [("/1", 200)]
+
+    # Stale entries are revalidated with their ETag
+    stale = Resource(f"{stand_in_server.url}/<res_id>", transport, ttl=0)
+    assert stale.get_data(1)["data"] == b"<html>1</html>"
+    assert handler.requests == [("/1", 200), ("/1", 304)]
+
+    handler.routes.update({"/1": (200, b"<html>2</html>")})
+    assert stale.get_data(1)["data"] == b"<html>2</html>"
+    assert forever.get_data(1)["data"] == b"<html>2</html>"
+
+    stats = transport.get_cache().get_stats()
+    assert (stats["hits"], stats["misses"], stats["revalidated"]) == (2, 3, 1)
+
+
+def test_memory_cache():
+    with pytest.raises(ValueError):
+        MemoryCache(max_entries=-1)
+
+    cache = MemoryCache(max_entries=2, max_age=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    # b was the least recently used entry
+    assert cache.get("b") is None
+    assert cache.get_or_set("c", lambda: 4) == 3
+    assert cache.get_or_set("d", lambda: None) is None
+    assert cache.get_stats() == {"hits": 2, "misses": 2, "entries": 2}
+
+    expired = MemoryCache(max_age=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+    disabled = MemoryCache(max_entries=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+
+
+def test_memoized_controllers(requests_regression):
+    zekken = PlayerController.get_player(4004)
+    hits = get_memory_cache().get_stats()["hits"]
+    memoized = PlayerController.get_player(4004)
+    assert get_memory_cache().get_stats()["hits"] == hits + 1
+
+    # Memoized entities stay the registry's canonical instances
+    assert memoized is zekken
+    assert get_registry().get_player(4004) is zekken
+
+    # The player page parsed for get_player is reused for the team history
+    hits = get_memory_cache().get_stats()["hits"]
+    assert len(TeamController.get_player_team_history(4004)) == 7
+    assert get_memory_cache().get_stats()["hits"] == hits + 1
+
+
+def test_memoize_keep():
+    calls = []
+
+    @memoize("number", Resource("https://vlr.gg/<res_id>", ttl=None), keep=bool)
+    def number(_id):
+        calls.append(_id)
+        return _id % 2
+
+    assert [number(1), number(1), number(2), number(2)] == [1, 1, 0, 0]
+    assert calls == [1, 2, 2]
+
+
+def test_match_ttl(requests_regression):
+    # Finished matches never expire
+    assert match_ttl(match_resource.get_data(408415)["data"]) is None
+
+    live = b'<div class="match-header-vs-note"><span class="mod-live">live</span></div>'
+    assert match_ttl(live) == MATCH_TTL
+    assert match_ttl(b"<html></html>") == MATCH_TTL
+
+
+def test_memoized_matches(requests_regression):
+    match = MatchController.get_match(408415)
+    again = MatchController.get_match(408415)
+    assert again is match
+    assert again.get_teams()[0] is match.get_teams()[0]
@@ -0,0 +1,103 @@
+# type: ignore
+import io
+import gzip
+import json
+import pytest
+
+from vlrscraper import export
+from vlrscraper.controllers import MatchController
+from vlrscraper.export import (
+    SCHEMA,
+    NDJSONExporter,
+    ColumnarExporter,
+    export_matches,
+    match_to_dict,
+    match_to_rows,
+)
+from vlrscraper.vlr_resources import match_resource
+
+
+@pytest.fixture
+def matches(requests_regression):
+    return [
+        MatchController.parse_match(_id, match_resource.get_data(_id)["data"])
+        for _id in (408415, 408414, 413228)
+    ]
+
+
+def test_match_to_rows(matches):
+    rows = match_to_rows(matches[0])
+    for table, columns in SCHEMA.items():
+        assert all(len(row) == len(columns) for row in rows[table])
+
+    assert rows["matches"] == [
+        (
+            408415,
+            matches[0].get_name(),
+            matches[0].get_event_name(),
+            matches[0].get_date(),
+        )
+    ]
+    assert [row[1] for row in rows["teams"]] == [2, 188]
+    assert len(rows["players"]) == 10
+    # 10 players over both sides and each side, for the whole match and each of the two maps
+    assert len(rows["stats"]) == 10 * 3 * 3
+    assert rows["stats"][0][:5] == (408415, None, None, rows["stats"][0][3], "both")
+    assert {row[2] for row in rows["stats"]} == {None, "Lotus", "Bind"}
+
+    data = match_to_dict(matches[0])
+    assert len(data["stats"]) == len(rows["stats"])
+    assert len(data["teams"][0]["players"]) == 5
+    assert json.loads(json.dumps(data)) == data
+
+
+def test_ndjson_export(matches, tmp_path):
+    with pytest.raises(ValueError):
+        NDJSONExporter(tmp_path / "x", compression="zip")
+
+    buffer = io.StringIO()
+    with NDJSONExporter(buffer) as exporter:
+        assert exporter.write_many(iter(matches)) == 3
+    lines = buffer.getvalue().splitlines()
+    assert [json.loads(line)["match_id"] for line in lines] == [408415, 408414, 413228]
+
+    path = tmp_path / "matches.ndjson.gz"
+    assert export_matches(iter(matches), str(path), compression="gzip") == 3
+    with gzip.open(path, "rt") as f:
+        assert [json.loads(line) for line in f] == [json.loads(line) for line in lines]
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_columnar_export(matches, tmp_path, file_format):
+    pytest.importorskip("pyarrow")
+    from pyarrow import ipc, parquet
+
+    with pytest.raises(ValueError):
+        ColumnarExporter(str(tmp_path), batch_size=0)
+
+    assert (
+        export_matches(
+            iter(matches), str(tmp_path), file_format, compression="zstd", batch_size=2
+        )
+        == 3
+    )
+
+    def read(table):
+        path = str(tmp_path / f"{table}.{file_format}")
+        if file_format == "parquet":
+            return parquet.read_table(path)
+        return ipc.open_file(path).read_all()
+
+    assert read("matches").column("match_id").to_pylist() == [408415, 408414, 413228]
+    assert read("players").num_rows == 30
+    stats = read("stats")
+    assert stats.schema.names == [name for name, _ in SCHEMA["stats"]]
+    assert stats.num_rows == sum(len(match_to_rows(m)["stats"]) for m in matches)
+    rows = match_to_rows(matches[0])["stats"]
+    assert tuple(stats.slice(0, 1).to_pylist()[0].values()) == rows[0]
+
+
+def test_columnar_export_without_pyarrow(monkeypatch, tmp_path):
+    monkeypatch.setattr(export, "pa", None)
+    with pytest.raises(ImportError):
+        ColumnarExporter(str(tmp_path))
@@ -1,7 +1,21 @@
 # type: ignore
-from vlrscraper.utils import previous_epoch
+import pickle
+import pytest
+
+from vlrscraper import controllers, logger, utils
+from vlrscraper.utils import previous_epoch, TimeWindow
 from vlrscraper.controllers import MatchController
 from vlrscraper.resources import Team, PlayerStats, Match
+from vlrscraper.scraping import ThreadedMatchScraper
+from vlrscraper.store import EntityStore, set_store
+from vlrscraper.transport import get_transport
+from vlrscraper.vlr_resources import (
+    MATCH_TTL,
+    is_match_final,
+    match_resource,
+    match_ttl,
+    player_match_resource,
+)
 
 from .helpers import assert_teams
 
@@ -48,7 +62,9 @@ def test_match_eq():
 
 
 def test_match_player_get_ids(requests_regression):
-    m = MatchController.get_player_match_ids(4004, 1725224060.4716666, 1730407900.8408132)
+    m = MatchController.get_player_match_ids(
+        4004, 1725224060.4716666, 1730407900.8408132
+    )
     assert m == [413228, 413189, 412065, 408415, 408414]
 
     assert (
@@ -70,6 +86,27 @@ def test_match_player_get_ids(requests_regression):
     )
 
 
+def test_match_time_window(requests_regression, monkeypatch):
+    window = TimeWindow(1725224060.4716666)
+    # The end of the window is now, as of each call
+    monkeypatch.setattr(utils.time, "time", lambda: 1728680437.5714862)
+    assert len(MatchController.get_player_match_ids(4004, window)) == 3
+    monkeypatch.setattr(utils.time, "time", lambda: 1730407900.8408132)
+    assert len(MatchController.get_player_match_ids(4004, window)) == 5
+    assert MatchController.get_team_match_ids(2, window) == [412065, 408415, 408414]
+
+    with pytest.raises(ValueError):
+        MatchController.get_player_match_ids(4004, window, 1730407900.8408132)
+
+
+def test_match_player_iter_ids(requests_regression):
+    ids = MatchController.iter_player_match_ids(
+        4004, 1725224060.4716666, 1730407900.8408132
+    )
+    assert next(ids) == (413228, 1728791400.0)
+    assert [match_id for match_id, _ in ids] == [413189, 412065, 408415, 408414]
+
+
 def test_match_team_get_ids(requests_regression):
     m = MatchController.get_team_match_ids(2, 1725224060.4716666, 1730407900.8408132)
     assert m == [412065, 408415, 408414]
@@ -80,7 +117,7 @@ def test_match_team_get_ids(requests_regression):
                 2, 1722632640.3587997, 1725224060.4716666
             )
         )
-        == 2
+        == 6
     )
     assert (
         len(
@@ -93,7 +130,9 @@ def test_match_team_get_ids(requests_regression):
 
 
 def test_match_player_get(requests_regression):
-    matches = MatchController.get_player_matches(4004, 1725224060.4716666, 1730407900.8408132)
+    matches = MatchController.get_player_matches(
+        4004, 1725224060.4716666, 1730407900.8408132
+    )
     assert len(matches) == 5
     assert matches[3].get_player_stats(729) == PlayerStats(
         1.2, 245, 39, 30, 21, 9, 78, 146, 25, 9, 4, 5
@@ -142,3 +181,255 @@ def test_match_get():
 
     assert MatchController.get_match(0) is None
     assert MatchController.get_match("3490") is None
+
+
+def test_match_record(requests_regression):
+    data = match_resource.get_data(408415)["data"]
+    record = MatchController.parse_match_record(408415, data)
+
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert record["teams"][0][:3] == (
+        2,
+        "Sentinels",
+        "https://owcdn.net/img/62875027c8e06.png",
+    )
+    assert len(record["teams"][1][3]) == 5
+
+    m = MatchController.match_from_record(record)
+    assert m.is_same_match(MatchController.parse_match(408415, data))
+    assert m.get_player_stats(4004) == PlayerStats(
+        1.19, 271, 45, 36, 8, 9, 71, 164, 21, 7, 5, 2
+    )
+
+
+def test_match_maps_and_sides(requests_regression):
+    m = MatchController.parse_match(408415, match_resource.get_data(408415)["data"])
+
+    assert [(g.game_id, g.name) for g in m.get_maps()] == [
+        (186274, "Lotus"),
+        (186275, "Bind"),
+    ]
+    lotus = m.get_map("Lotus")
+    assert m.get_map("Ascent") is None
+    assert lotus.stats[4004] == PlayerStats(
+        1.53, 333, 28, 17, 3, 11, 68, 200, 20, 4, 3, 1
+    )
+    assert lotus.get_side_stats("attack")[4004] == PlayerStats(
+        0.91, 214, 8, 9, 1, -1, 50, 128, 14, 1, 2, -1
+    )
+    assert lotus.get_side_stats("defense")[4004].kills == 20
+    assert len(lotus.attack) == len(lotus.defense) == 10
+
+    attack, defense = m.get_side_stats("attack"), m.get_side_stats("defense")
+    assert attack.keys() == defense.keys() == m.get_stats().keys()
+    assert attack[4004].kills + defense[4004].kills == m.get_player_stats(4004).kills
+    assert m.get_player_stats(4004, side="defense") is defense[4004]
+
+    with pytest.raises(ValueError):
+        m.get_side_stats("both")
+    with pytest.raises(ValueError):
+        lotus.get_side_stats("ct")
+
+
+def test_match_record_modes(requests_regression):
+    with pytest.raises(ValueError):
+        MatchController.parse_match_record(408415, b"", mode="footer")
+
+    for _id in (408415, 413228, 412065):
+        data = match_resource.get_data(_id)["data"]
+        full = MatchController.parse_match_record(_id, data)
+        assert MatchController.parse_match_record(_id, data, mode="maps") == full
+        stats = MatchController.parse_match_record(_id, data, mode="stats")
+        assert stats == {**full, "maps": ()}
+
+        header = MatchController.parse_match_record(_id, data, mode="header")
+        assert header["stats"] == header["sides"] == {}
+        assert header["maps"] == ()
+        assert [team[:3] for team in header["teams"]] == [
+            team[:3] for team in full["teams"]
+        ]
+        assert header["name"] == full["name"]
+        assert header["epoch"] == full["epoch"]
+
+    # Pages without the regions a mode reads are parsed in full
+    data = match_resource.get_data(408415)["data"]
+    data = data.replace(b'class="vm-stats-game mod-active"', b'class="vm-stats-game"')
+    assert MatchController.parse_match_record(408415, data, mode="stats")["stats"] == {}
+    assert MatchController.parse_match(408415, data, mode="stats").get_id() == 408415
+
+
+def test_match_player_iter(requests_regression):
+    matches = MatchController.iter_player_matches(
+        4004, 1725224060.4716666, 1730407900.8408132
+    )
+    assert sorted(m.get_id() for m in matches) == [
+        408414,
+        408415,
+        412065,
+        413189,
+        413228,
+    ]
+
+    matches = MatchController.iter_team_matches(
+        2, 1725224060.4716666, 1730407900.8408132, ordered=True, reorder_buffer=1
+    )
+    assert [m.get_id() for m in matches] == [412065, 408415, 408414]
+
+    matches = MatchController.iter_team_matches(
+        2, 1725224060.4716666, 1730407900.8408132, ordered=True, mode="stats"
+    )
+    assert next(matches).get_player_stats(729) is not None
+
+
+def test_match_player_get_processes(requests_regression):
+    matches = MatchController.get_player_matches(
+        4004, 1725224060.4716666, 1730407900.8408132, processes=2
+    )
+    assert [m.get_id() for m in matches] == [413228, 413189, 412065, 408415, 408414]
+    assert matches[3].get_player_stats(729) == PlayerStats(
+        1.2, 245, 39, 30, 21, 9, 78, 146, 25, 9, 4, 5
+    )
+
+
+def test_match_processes_keep_log(requests_regression):
+    # Parse processes import vlrscraper again, which must not truncate the parent's log
+    handler = logger.LogConfig.fileHandler
+    logger.get_logger().warning("Before parsing in processes")
+    handler.flush()
+    matches = ThreadedMatchScraper([408415, 408414], processes=2).run()
+    assert len(matches) == 2
+    handler.flush()
+    with open(handler.baseFilename, "rb") as f:
+        log = f.read()
+    assert b"Before parsing in processes" in log
+    assert b"\x00" not in log
+
+
+def test_match_player_sync(requests_regression, monkeypatch):
+    with pytest.raises(ValueError):
+        MatchController.sync_player_matches(4004, 1725224060.4716666)
+
+    # Match list pages are counted by the resource rather than the transport, since other tests may still
+    # be prefetching pages in the background
+    pages, urls = [], []
+    monkeypatch.setattr(
+        controllers,
+        "player_match_resource",
+        lambda page: pages.append(page) or player_match_resource(page),
+    )
+    transport = get_transport()
+    get = transport.get
+    monkeypatch.setattr(
+        transport, "get", lambda url, **kwargs: urls.append(url) or get(url, **kwargs)
+    )
+    store = EntityStore()
+    set_store(store)
+    try:
+        store.put_matches(
+            MatchController.parse_match(_id, match_resource.get_data(_id)["data"])
+            for _id in (412065, 408415, 408414)
+        )
+
+        # Only matches newer than the watermark are scraped
+        store.set_watermark("player", 4004, 412065, 1728538200.0)
+        urls.clear()
+        matches = MatchController.sync_player_matches(4004, 1725224060.4716666)
+        assert [m.get_id() for m in matches] == [413228, 413189]
+        assert pages == [1]
+        assert sorted(u for u in urls if "/matches/" not in u) == [
+            "https://vlr.gg/413189",
+            "https://vlr.gg/413228",
+        ]
+        assert store.get_watermark("player", 4004) == (413228, 1728791400.0)
+
+        # Checking for new matches fetches a single page
+        pages.clear()
+        urls.clear()
+        assert MatchController.sync_player_matches(4004, 1725224060.4716666) == []
+        assert pages == [1]
+        assert [u for u in urls if "/matches/" not in u] == []
+
+        # Matches that are already stored are not scraped again on the first sync
+        assert MatchController.sync_team_matches(2, 1725224060.4716666) == []
+        assert store.get_watermark("team", 2) == (412065, 1728538200.0)
+    finally:
+        set_store(None)
+
+
+def test_match_player_sync_unplayed(requests_regression, monkeypatch):
+    parse_match = MatchController.parse_match
+
+    def unplayed(_id, data, mode="full"):
+        match = parse_match(_id, data, mode)
+        # Live matches already have stats, but have not finished
+        if _id == 413189:
+            match.set_final(False)
+        return match
+
+    store = EntityStore()
+    set_store(store)
+    try:
+        store.set_watermark("player", 4004, 412065, 1728538200.0)
+        monkeypatch.setattr(MatchController, "parse_match", unplayed)
+        matches = MatchController.sync_player_matches(4004, 1725224060.4716666)
+        assert [m.get_id() for m in matches] == [413228, 413189]
+        # The live match is not stored, so the watermark cannot move past it
+        assert store.get_watermark("player", 4004) == (412065, 1728538200.0)
+
+        monkeypatch.setattr(MatchController, "parse_match", parse_match)
+        matches = MatchController.sync_player_matches(4004, 1725224060.4716666)
+        assert [m.get_id() for m in matches] == [413189]
+        assert store.get_watermark("player", 4004) == (413228, 1728791400.0)
+    finally:
+        set_store(None)
+
+
+def live_page(_id):
+    """The page of a finished match, changed to read as if the match was still being played"""
+    data = match_resource.get_data(_id)["data"]
+    start = data.index(b'class="match-header-vs-note"')
+    end = data.index(b"</div>", start)
+    return data[:start] + b'class="match-header-vs-note">live' + data[end:]
+
+
+def test_match_live(requests_regression, monkeypatch):
+    live = live_page(408415)
+    assert not is_match_final(live) and match_ttl(live) == MATCH_TTL
+    assert MatchController.parse_match(408415, live).get_stats()
+    assert not MatchController.parse_match(408415, live).is_final()
+    assert MatchController.parse_match(408415, live, mode="header").is_final() is False
+    final = match_resource.get_data(408415)["data"]
+    assert MatchController.parse_match(408415, final, mode="stats").is_final()
+
+    store = EntityStore()
+    set_store(store)
+    monkeypatch.setattr(
+        match_resource,
+        "get_data",
+        lambda _id: {"success": True, "data": live, "attempts": 1},
+    )
+    try:
+        # Live matches have stats, but are neither stored nor memoized
+        assert not MatchController.scrape_match(408415, live).is_final()
+        assert list(ThreadedMatchScraper([408415]))[0].get_stats()
+        match = MatchController.get_match(408415)
+        assert MatchController.get_match(408415) is not match
+        assert not store.has_match(408415)
+    finally:
+        set_store(None)
+        store.close()
+
+
+def test_match_get_many(requests_regression, monkeypatch):
+    def parse_match(_id, data):
+        if _id == 408414:
+            raise ValueError("bad page")
+        return Match(_id, "", "", 0)
+
+    # Pages that cannot be parsed are reported along with the pages that cannot be fetched
+    monkeypatch.setattr(MatchController, "parse_match", parse_match)
+    matches = MatchController.get_matches([413228, 408414, "x"])
+    assert matches[413228]["data"].get_id() == 413228
+    assert not matches[408414]["success"]
+    assert "bad page" in matches[408414]["error"]
+    assert not matches["x"]["success"]
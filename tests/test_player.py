@@ -2,7 +2,7 @@
 import pytest
 
 from vlrscraper.controllers import PlayerController
-from vlrscraper.resources import Player, PlayerStatus, Team
+from vlrscraper.resources import Player, PlayerStatus, PlayerStats, Team, Match
 
 
 def test_player_init():
@@ -116,6 +116,30 @@ def test_string():
     )
 
 
+def test_compact_entities():
+    def fresh(value):
+        return "".join(list(value))
+
+    team = Team(2, fresh("Sentinels"), fresh("SEN"), fresh("//owcdn.net/1.png"), [])
+    players = [
+        Player(i, fresh("zekken"), team, fresh("Zachary"), None, None, None)
+        for i in (1, 2)
+    ]
+    match = Match(1, fresh("Grand Final"), fresh("Champions"), 0, (team, team))
+    stats = PlayerStats(1.0, 200, 10, 10, 5, 0, 70, 130, 20, 1, 1, 0)
+
+    # Entities are slotted, so none of them carry an instance dictionary
+    for entity in (team, *players, match, stats):
+        assert not hasattr(entity, "__dict__")
+
+    # Repeated strings are shared between entities
+    assert players[0].get_display_name() is players[1].get_display_name()
+    assert team.get_name() is Team(3, fresh("Sentinels"), None, None, []).get_name()
+    assert (
+        match.get_event_name() is Match(2, "", fresh("Champions"), 0).get_event_name()
+    )
+
+
 def test_player_from():
     benjy = Player.from_player_page(
         29873,
@@ -178,3 +202,21 @@ def test_player_get(requests_regression):
 
     # Inactive player
     assert PlayerController.get_player(45).get_status() == PlayerStatus.INACTIVE
+
+
+def test_player_get_many(requests_regression):
+    players = PlayerController.get_players([31207, 29873, None, 29873])
+    assert list(players) == [31207, 29873, None]
+    assert players[29873]["success"] and players[29873]["attempts"] == 1
+    assert players[29873]["data"].get_display_name() == "benjyfishy"
+    assert players[31207]["data"].get_name() == "Lee Jae-hyeok"
+    assert players[None] == {
+        "success": False,
+        "error": "Invalid id given: None",
+        "attempts": 0,
+    }
+
+    assert sorted(_id for _id, _ in PlayerController.iter_players([45, 31207])) == [
+        45,
+        31207,
+    ]
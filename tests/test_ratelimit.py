@@ -0,0 +1,131 @@
+# type: ignore
+import time
+import pytest
+
+from email.utils import formatdate
+
+from vlrscraper.ratelimit import TokenBucket, AdaptiveLimiter, parse_retry_after
+from vlrscraper.transport import Transport
+
+
+def test_token_bucket():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    with pytest.raises(ValueError):
+        TokenBucket(1, burst=0)
+
+    bucket = TokenBucket(20, burst=2)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    # The burst is used up, and the next token takes 50ms
+    assert not bucket.acquire(timeout=0)
+    start = time.monotonic()
+    assert bucket.acquire()
+    assert time.monotonic() - start >= 0.03
+
+    bucket.set_rate(1000)
+    assert bucket.get_rate() == 1000
+    bucket.pause(0.1)
+    assert not bucket.acquire(timeout=0.05)
+    assert bucket.acquire(timeout=1)
+
+
+def test_adaptive_limiter_init():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(rate=0.1, min_rate=0.5)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(rate=30, max_rate=20)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(window=0)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(decrease=1)
+
+    limiter = AdaptiveLimiter(rate=4, window=4)
+    assert limiter.get_rate() == 4
+    assert limiter.get_window() == 4
+    assert limiter.get_in_flight() == 0
+
+
+def test_adaptive_limiter_aimd():
+    limiter = AdaptiveLimiter(rate=100, window=2, max_rate=200, max_window=8)
+
+    # Healthy responses grow the rate and window
+    for _ in range(20):
+        limiter.acquire()
+        assert limiter.get_in_flight() == 1
+        limiter.release(200, 0.01)
+    assert limiter.get_in_flight() == 0
+    assert 100 < limiter.get_rate() <= 200
+    assert 2 < limiter.get_window() <= 8
+
+    # Throttling halves them, but only once per cooldown
+    rate, window = limiter.get_rate(), limiter.get_window()
+    limiter.acquire()
+    limiter.release(429, 0.01)
+    assert limiter.get_rate() == rate / 2
+    assert limiter.get_window() == window // 2 or limiter.get_window() == 1
+    limiter.acquire()
+    limiter.release(503, 0.01)
+    assert limiter.get_rate() == rate / 2
+
+    stats = limiter.get_stats()
+    assert stats["requests"] == 22
+    assert stats["throttled"] == 2
+    assert stats["backoffs"] == 1
+
+
+def test_adaptive_limiter_spikes():
+    limiter = AdaptiveLimiter(rate=10, window=4, cooldown=0)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(200, 0.5)
+
+    rate = limiter.get_rate()
+    limiter.acquire()
+    limiter.release(200, 3)
+    assert limiter.get_rate() == rate / 2
+    assert limiter.get_stats()["spikes"] == 1
+
+    # Failed requests without a response do not count unless they were slow
+    rate = limiter.get_rate()
+    limiter.acquire()
+    limiter.release(None, 0.01)
+    assert limiter.get_rate() == rate
+    assert limiter.get_stats()["latency"] == pytest.approx(0.5)
+
+
+def test_adaptive_limiter_retry_after():
+    limiter = AdaptiveLimiter(rate=20, window=4)
+    limiter.acquire()
+    limiter.release(429, 0.01, retry_after="0.2")
+
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+    limiter.release(200, 0.01)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("-5") == 0
+    assert parse_retry_after("soon") is None
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after(formatdate(time.time() - 60, usegmt=True)) == 0
+
+
+def test_transport_limiter(stand_in_server):
+    stand_in_server.RequestHandlerClass.routes.update({"/1": (200, b"<html></html>")})
+    limiter = AdaptiveLimiter(rate=10, window=2)
+    transport = Transport(limiter=limiter)
+    assert transport.get_limiter() is limiter
+    assert Transport().get_limiter() is None
+
+    for _ in range(3):
+        assert transport.get(f"{stand_in_server.url}/1").status_code == 200
+    assert transport.get(f"{stand_in_server.url}/2").status_code == 404
+
+    assert limiter.get_stats()["requests"] == 4
+    assert limiter.get_in_flight() == 0
+    assert limiter.get_rate() > 10
+    transport.close()
@@ -0,0 +1,110 @@
+# type: ignore
+import gc
+import pytest
+
+from vlrscraper.controllers import MatchController, PlayerController
+from vlrscraper.registry import EntityRegistry, get_registry, set_registry
+from vlrscraper.resources import Player, PlayerStatus, Team
+from vlrscraper.vlr_resources import match_resource
+
+
+def test_registry_players():
+    registry = EntityRegistry()
+    zekken = registry.player(Player.from_match_page(4004, "zekken"))
+    assert registry.player(Player.from_match_page(4004, "zekken")) is zekken
+
+    # Richer scrapes fill in the fields the canonical player is missing
+    team = Team.from_player_page(2, "Sentinels", "https://owcdn.net/img/1.png")
+    full = Player(4004, "zekken", team, "Zachary", "Patrone", None, PlayerStatus.ACTIVE)
+    assert registry.player(full) is zekken
+    assert zekken.get_name() == "Zachary Patrone"
+    assert zekken.get_current_team() is team
+    assert zekken.get_display_name() == "zekken"
+
+    assert registry.get_player(4004) is zekken
+    assert registry.get_player(1) is None
+    assert registry.get_stats() == {"hits": 2, "misses": 1, "players": 1, "teams": 0}
+
+    # Stale fields are kept by partial scrapes, but replaced by authoritative ones
+    moved = Player(4004, "zekken", None, None, None, None, PlayerStatus.INACTIVE)
+    assert registry.player(moved) is zekken
+    assert zekken.get_current_team() is team
+    assert registry.player(moved, overwrite=True) is zekken
+    assert zekken.get_current_team() is None
+    assert zekken.get_status() == PlayerStatus.INACTIVE
+    assert zekken.get_name() == "Zachary Patrone"
+
+    with pytest.raises(ValueError):
+        zekken.merge(Player.from_match_page(1, "TenZ"))
+
+    # Players nobody refers to any more are forgotten
+    del zekken, full
+    gc.collect()
+    assert registry.get_player(4004) is None
+
+
+def test_registry_teams():
+    registry = EntityRegistry()
+
+    def sentinels(*roster):
+        return Team.from_match_page(
+            2, "Sentinels", "", "", [Player.from_match_page(p, str(p)) for p in roster]
+        )
+
+    team = registry.team(sentinels(1, 2, 3))
+    # Teams with the same roster in any order are the same team
+    assert registry.team(sentinels(3, 1, 2)) is team
+    other = registry.team(sentinels(1, 2, 4))
+    assert other is not team
+    assert other.get_roster()[0] is team.get_roster()[0]
+    assert registry.get_team(2, [2, 3, 1]) is team
+    assert registry.get_team(2) is None
+
+    renamed = sentinels(1, 2, 3)
+    renamed.merge(Team.from_match_page(2, "SEN", "", "", None))
+    assert renamed.get_name() == "Sentinels"
+    assert registry.team(sentinels(1, 2, 3)) is team
+    team.merge(Team.from_match_page(2, "SEN", "", "", None), overwrite=True)
+    assert team.get_name() == "SEN"
+    assert len(team.get_roster()) == 3
+
+    registry.clear()
+    assert registry.get_stats()["teams"] == 0
+
+
+def test_registry_matches(requests_regression):
+    old_registry = get_registry()
+    set_registry(EntityRegistry())
+
+    matches = [
+        MatchController.parse_match(_id, match_resource.get_data(_id)["data"])
+        for _id in (408415, 408414)
+    ]
+    players = [
+        {p.get_id(): p for p in t.get_roster()} for m in matches for t in m.get_teams()
+    ]
+    assert players[0][4004] is players[2][4004]
+    assert matches[0].get_teams()[0].is_same_team(matches[1].get_teams()[0])
+
+    set_registry(None)
+    match = MatchController.parse_match(408415, match_resource.get_data(408415)["data"])
+    assert match.get_teams()[0] is not matches[0].get_teams()[0]
+    set_registry(old_registry)
+
+
+def test_registry_player_page(requests_regression):
+    old_registry = get_registry()
+    registry = EntityRegistry()
+    set_registry(registry)
+    try:
+        # A player seen on an old team is moved to their current team by their player page
+        stale_team = Team.from_player_page(1, "Old Team", "")
+        stale = registry.player(
+            Player(4004, "zekken", stale_team, None, None, None, PlayerStatus.INACTIVE)
+        )
+        zekken = PlayerController.get_player(4004)
+        assert zekken.get_current_team().get_id() == 2
+        assert zekken.get_status() == PlayerStatus.ACTIVE
+        assert stale.get_current_team().get_id() == 2
+    finally:
+        set_registry(old_registry)
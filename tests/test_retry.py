@@ -0,0 +1,130 @@
+# type: ignore
+import time
+import pytest
+import requests
+
+from vlrscraper.resource import Resource, ResourceResponse
+from vlrscraper.retry import RetryPolicy, get_retry_policy, set_retry_policy
+from vlrscraper.transport import Transport
+
+
+class FlakyTransport(Transport):
+    """Answers each request with the next of the given status codes, raising ConnectionError for None
+    and any other exception given as it is"""
+
+    def __init__(self, statuses, headers=None) -> None:
+        super().__init__()
+        self.statuses = list(statuses)
+        self.headers = headers or {}
+        self.requests = 0
+        self.closed = 0
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.requests += 1
+        if (status := self.statuses.pop(0)) is None:
+            raise requests.ConnectionError("Connection reset")
+        if isinstance(status, Exception):
+            raise status
+        response = requests.Response()
+        response.close = self.close
+        response.url = url
+        response.status_code = status
+        response.headers.update(self.headers)
+        response._content = b"<html></html>"
+        return response
+
+    def close(self) -> None:
+        self.closed += 1
+
+
+def test_retry_policy():
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+    with pytest.raises(ValueError):
+        RetryPolicy(backoff=-1)
+
+    policy = RetryPolicy(backoff=1, max_backoff=3)
+    assert policy.is_retryable(None, requests.ConnectionError())
+    assert policy.is_retryable(None, requests.ReadTimeout())
+    assert not policy.is_retryable(None, requests.exceptions.MissingSchema())
+    assert not policy.is_retryable(None, requests.exceptions.InvalidURL())
+    assert policy.is_retryable(503)
+    assert not policy.is_retryable(404)
+
+    assert all(0 <= policy.get_delay(1) <= 1 for _ in range(100))
+    assert all(0 <= policy.get_delay(5) <= 3 for _ in range(100))
+    assert policy.get_delay(1, retry_after=7) == 7
+
+
+def test_shared_retry_policy():
+    old_policy = get_retry_policy()
+    policy = RetryPolicy(attempts=1)
+    set_retry_policy(policy)
+    assert Resource("https://vlr.gg/<res_id>").get_retry_policy() is policy
+    set_retry_policy(old_policy)
+
+    own = RetryPolicy(attempts=5)
+    assert Resource("https://vlr.gg/<res_id>", retry=own).get_retry_policy() is own
+
+
+def test_resource_retry():
+    policy = RetryPolicy(attempts=3, backoff=0)
+
+    # Transient failures are retried
+    transport = FlakyTransport([503, None, 200])
+    res = Resource("https://vlr.gg/<res_id>", transport=transport, retry=policy)
+    assert res.get_data(1) == ResourceResponse.success(b"<html></html>", attempts=3)
+
+    # Permanent failures are not
+    transport = FlakyTransport([404, 200])
+    res = Resource("https://vlr.gg/<res_id>", transport=transport, retry=policy)
+    assert res.get_data(1) == ResourceResponse.request_refused(
+        "https://vlr.gg/1", 404, attempts=1
+    )
+
+    # Give up once every attempt is used
+    transport = FlakyTransport([500, 502, 504, 200])
+    res = Resource("https://vlr.gg/<res_id>", transport=transport, retry=policy)
+    assert res.get_data(1)["attempts"] == 3
+    assert transport.requests == 3
+
+    transport = FlakyTransport([None, None, None])
+    res = Resource("https://vlr.gg/<res_id>", transport=transport, retry=policy)
+    with pytest.raises(requests.ConnectionError):
+        res.get_data(1)
+
+    # Requests that could never succeed are not
+    transport = FlakyTransport([requests.exceptions.InvalidURL("Bad url"), 200])
+    res = Resource("https://vlr.gg/<res_id>", transport=transport, retry=policy)
+    with pytest.raises(requests.exceptions.InvalidURL):
+        res.get_data(1)
+    assert transport.requests == 1
+
+    # Every response that is retried is closed, so it gives its connection back to the pool
+    transport = FlakyTransport([503, 502, 200])
+    res = Resource("https://vlr.gg/<res_id>", transport=transport, retry=policy)
+    assert res.get_data(1)["success"] is True
+    assert transport.closed == 2
+
+
+def test_resource_retry_deadline():
+    # The server asks for a longer wait than the deadline allows, so we give up straight away
+    transport = FlakyTransport([429, 200], headers={"Retry-After": "5"})
+    res = Resource(
+        "https://vlr.gg/<res_id>",
+        transport=transport,
+        retry=RetryPolicy(attempts=3, deadline=1),
+    )
+    start = time.monotonic()
+    assert res.get_data(1)["attempts"] == 1
+    assert time.monotonic() - start < 1
+
+    transport = FlakyTransport([429, 200], headers={"Retry-After": "0.1"})
+    res = Resource(
+        "https://vlr.gg/<res_id>",
+        transport=transport,
+        retry=RetryPolicy(attempts=3, backoff=0, deadline=1),
+    )
+    start = time.monotonic()
+    assert res.get_data(1)["success"] is True
+    assert time.monotonic() - start >= 0.1
@@ -1,9 +1,26 @@
 # type: ignore
+import io
 import pytest
 
 import requests
 
-from vlrscraper.scraping import xpath, XpathParser, join
+from lxml.etree import XPath
+
+from vlrscraper import constants
+from vlrscraper.scraping import (
+    xpath,
+    XpathParser,
+    join,
+    compile_xpath,
+    extract_element,
+    ThreadedMatchScraper,
+    Paginator,
+    fetch_many,
+    get_worker_pool,
+    set_worker_pool,
+)
+from vlrscraper.resource import Resource
+from vlrscraper.transport import Transport, get_transport
 
 
 def test_xpath():
@@ -37,6 +54,20 @@ def test_xpathJoin():
     )
 
 
+def test_compile_xpath():
+    compiled = compile_xpath("//div")
+    assert isinstance(compiled, XPath)
+    assert compile_xpath("//div") is compiled
+
+    assert join(compiled, "img") == "//div//img"
+    assert constants.REGISTRY["PLAYER_DISPLAYNAME"] is constants.PLAYER_DISPLAYNAME
+    assert all(isinstance(x, XPath) for x in constants.REGISTRY.values())
+
+    parser = XpathParser(b"<div><h1 class='wf-title'> benjyfishy </h1></div>")
+    assert parser.get_text(constants.PLAYER_DISPLAYNAME) == "benjyfishy"
+    assert parser.get_text(constants.PLAYER_DISPLAYNAME.path) == "benjyfishy"
+
+
 # TODO: Add regression testing for this :D
 def test_xpathParser():
     data = requests.get("https://www.vlr.gg/player/29873/benjyfishy")
@@ -60,3 +91,157 @@ def test_xpathParser():
 
     with pytest.raises(TypeError):
         XpathParser("skibidi sigma")
+
+
+def test_xpathParser_from_chunks():
+    page = b"<div><h1 class='wf-title'> benjyfishy </h1></div>"
+    parser = XpathParser.from_chunks([page[:9], page[9:20], page[20:]])
+    assert parser.get_text(constants.PLAYER_DISPLAYNAME) == "benjyfishy"
+
+    parser = XpathParser.from_file(io.BytesIO(page), chunk_size=4)
+    assert parser.get_text(constants.PLAYER_DISPLAYNAME) == "benjyfishy"
+
+
+def test_xpathParser_prune(requests_regression):
+    page = (
+        b"<html><head><script>var x = 1;</script><style>p {}</style></head><body>"
+        b"<nav>Menu</nav><!-- note --><p class='keep'>a<script>x</script>b</p>"
+        b"<div class='wf-card post-container'><p>Comment</p></div></body></html>"
+    )
+    parser = XpathParser.from_chunks([page], prune=True)
+    assert parser.get_elements("//script | //style | //nav | //comment()") == []
+    assert parser.get_elements(xpath("div", class_="post-container")) == []
+    # Text after a pruned element is kept
+    assert parser.get_text(xpath("p", class_="keep")) == "ab"
+
+    # Pruning does not change what gets scraped
+    data = get_transport().get("https://vlr.gg/413228").content
+    full, pruned = XpathParser(data), XpathParser.from_chunks([data], prune=True)
+    for name, value in constants.REGISTRY.items():
+        if name.startswith("MATCH_"):
+            assert [e.text_content() for e in full.get_elements(value)] == [
+                e.text_content() for e in pruned.get_elements(value)
+            ], name
+
+
+def test_extract_element():
+    page = b"<body><div id='a'><div>x</div><DIV>y</DIV >z</div><div>after</div></body>"
+    assert (
+        extract_element(page, b"id='a'")
+        == b"<div id='a'><div>x</div><DIV>y</DIV >z</div>"
+    )
+    assert extract_element(page, b"id='b'") is None
+    # The marker must be in the opening tag of an element of the right type
+    assert extract_element(page, b"id='a'", tag="span") is None
+    assert extract_element(b"<div id='a'><div>x</div>", b"id='a'") is None
+
+
+def test_threaded_match_scraper_init():
+    with pytest.raises(ValueError):
+        ThreadedMatchScraper([], fetch_workers=0)
+    with pytest.raises(ValueError):
+        ThreadedMatchScraper([], queue_size=0)
+    with pytest.raises(ValueError):
+        ThreadedMatchScraper([], mode="footer")
+
+    assert ThreadedMatchScraper([]).run() == []
+
+
+def test_threaded_match_scraper(requests_regression):
+    ids = [413228, 413189, 412065, 408415, 408414]
+    scraper = ThreadedMatchScraper(
+        iter(ids), fetch_workers=3, parse_workers=2, queue_size=1
+    )
+    assert [m.get_id() for m in scraper.run()] == ids
+
+    with pytest.raises(RuntimeError):
+        scraper.run()
+
+
+def test_threaded_match_scraper_ordered(requests_regression):
+    with pytest.raises(ValueError):
+        ThreadedMatchScraper([], ordered=True, reorder_buffer=0)
+
+    # Failed matches do not hold up the ones after them
+    ids = [408414, 413228, None, 412065, 408415, 413189]
+    scraper = ThreadedMatchScraper(
+        ids, fetch_workers=3, queue_size=1, ordered=True, reorder_buffer=2
+    )
+    assert [m.get_id() for m in scraper] == [408414, 413228, 412065, 408415, 413189]
+
+
+def test_threaded_match_scraper_stop(requests_regression):
+    scraper = ThreadedMatchScraper([413228, 413189, 412065], queue_size=1)
+    for match in scraper:
+        assert match.get_id() in (413228, 413189, 412065)
+        break
+    assert scraper.is_stopped()
+
+
+def test_paginator(stand_in_server):
+    handler = stand_in_server.RequestHandlerClass
+    handler.routes.update(
+        {
+            f"/list/{_id}?page={page}": (200, f"<html><p>{page}</p></html>".encode())
+            for _id in (1, 2)
+            for page in range(1, 4)
+        }
+    )
+    transport = Transport()
+
+    def page_resource(page: int) -> Resource:
+        return Resource(
+            f"{stand_in_server.url}/list/<res_id>?page={page}", transport=transport
+        )
+
+    with pytest.raises(ValueError):
+        Paginator(page_resource, 1, prefetch=0)
+
+    # Pages are yielded in order until one cannot be fetched
+    pages = Paginator(page_resource, 1, prefetch=2)
+    assert pages.get_prefetch() == 2
+    assert [p.get_text("//p") for p in pages] == ["1", "2", "3"]
+
+    # Stopping early abandons pages that are not needed
+    for parser in Paginator(page_resource, 2, prefetch=2):
+        break
+    assert parser.get_text("//p") == "1"
+    assert "/list/2?page=3" not in [path for path, _ in handler.requests]
+    transport.close()
+
+
+def test_fetch_many():
+    with pytest.raises(ValueError):
+        set_worker_pool(0)
+
+    set_worker_pool(2)
+    try:
+        assert get_worker_pool() is get_worker_pool()
+        # Duplicate IDs are fetched once, and results come back as each one finishes
+        calls = []
+        results = fetch_many(
+            [3, 1, 2, 3, 1], lambda _id: calls.append(_id) or _id * 10, max_pending=1
+        )
+        assert sorted(results) == [(1, 10), (2, 20), (3, 30)]
+        assert sorted(calls) == [1, 2, 3]
+
+        # Only `max_pending` IDs are read ahead of the results
+        read = []
+        results = fetch_many(
+            (read.append(_id) or _id for _id in range(100)), str, max_pending=4
+        )
+        next(results)
+        assert len(read) <= 5
+        results.close()
+
+        # Resizing the pool lets running calls finish on the old pool before it is shut down
+        old_pool = get_worker_pool()
+        results = fetch_many(range(10), str, max_pending=2)
+        first = next(results)
+        set_worker_pool(3)
+        assert get_worker_pool() is not old_pool
+        assert sorted([first, *results]) == sorted((i, str(i)) for i in range(10))
+        with pytest.raises(RuntimeError):
+            old_pool.submit(str, 1)
+    finally:
+        set_worker_pool(16)
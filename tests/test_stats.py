@@ -0,0 +1,116 @@
+# type: ignore
+import pytest
+
+from vlrscraper import stats as stats_module
+from vlrscraper.controllers import MatchController
+from vlrscraper.resources import PlayerStats
+from vlrscraper.stats import StatsTable, STAT_FIELDS, stats_groups
+from vlrscraper.vlr_resources import match_resource
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(stats_module, "np", None)
+    return request.param
+
+
+def make_table():
+    table = StatsTable()
+    table.append(1, 10, PlayerStats(1.5, 250, 20, 10, 5, 10, 80, 150, 25, 3, 1, 2))
+    table.append(1, 20, PlayerStats(0.5, 150, 10, 20, 2, -10, 60, 90, 15, 1, 3, -2))
+    table.append(2, 10, PlayerStats(1.0, 200, 15, 15, None, 0, None, 120, 20, 2, 2, 0))
+    table.append(2, 20, PlayerStats(None, 180, 12, 14, 4, -2, 70, 110, 18, 0, 1, -1))
+    return table
+
+
+def test_stats_table():
+    table = make_table()
+    assert len(table) == 4
+    assert list(table.get_match_ids()) == [1, 1, 2, 2]
+    assert list(table.get_player_ids()) == [10, 20, 10, 20]
+    assert list(table.get_column("kills")) == [20, 10, 15, 12]
+    assert list(table.get_nulls("rating")) == [0, 0, 0, 1]
+    assert table.get_row(3) == (
+        2,
+        20,
+        PlayerStats(None, 180, 12, 14, 4, -2, 70, 110, 18, 0, 1, -1),
+    )
+
+    with pytest.raises(KeyError):
+        table.get_column("clutches")
+
+    table.extend(make_table())
+    assert len(table) == 8
+    assert table.get_row(7) == table.get_row(3)
+
+
+def test_stats_table_aggregate(backend):
+    table = make_table()
+    assert table.sum("kills") == 57
+    assert table.sum("kills", by_player=True) == {10: 35, 20: 22}
+    # Missing stats are left out of both the sum and the count
+    assert table.mean("rating") == pytest.approx(1.0)
+    assert table.mean("rating", by_player=True) == pytest.approx({10: 1.25, 20: 0.5})
+    assert table.mean("assists", by_player=True) == pytest.approx({10: 5, 20: 3})
+
+    assert StatsTable().mean("rating") is None
+    assert StatsTable().sum("kills", by_player=True) == {}
+
+
+def test_stats_table_from_matches(requests_regression):
+    matches = [
+        MatchController.parse_match(_id, match_resource.get_data(_id)["data"])
+        for _id in (408415, 408414)
+    ]
+    table = StatsTable.from_matches(matches)
+    assert len(table) == 20
+    assert table.get_row(0)[:2] == (408415, list(matches[0].get_stats())[0])
+    assert table.sum("kills", by_player=True)[4004] == sum(
+        m.get_player_stats(4004).kills for m in matches
+    )
+
+    attack = StatsTable.from_matches(matches, side="attack")
+    defense = StatsTable.from_matches(matches, side="defense")
+    assert attack.sum("kills") + defense.sum("kills") == table.sum("kills")
+
+
+def test_stats_groups(requests_regression):
+    match = MatchController.parse_match(408415, match_resource.get_data(408415)["data"])
+    groups = list(stats_groups(match))
+    assert len(groups) == 3 * (1 + len(match.get_maps()))
+    assert groups[0] == (None, "both", match.get_stats())
+    assert [side for _, side, _ in groups[:3]] == ["both", "attack", "defense"]
+    assert all(game is match.get_maps()[0] for game, _, _ in groups[3:6])
+
+
+def test_stats_table_numpy():
+    np = pytest.importorskip("numpy")
+    table = make_table()
+
+    data = table.to_numpy()
+    assert data.dtype.names == ("match_id", "player_id", *STAT_FIELDS)
+    assert data["kills"].sum() == 57
+    assert data["rating"].mask.tolist() == [False, False, False, True]
+    assert data["rating"].mean() == pytest.approx(1.0)
+
+    copy = StatsTable.from_numpy(data)
+    assert [copy.get_row(i) for i in range(4)] == [table.get_row(i) for i in range(4)]
+
+    # NaN ratings in plain structured arrays are missing too
+    plain = data.filled(0)
+    plain["rating"][3] = np.nan
+    assert StatsTable.from_numpy(plain).get_row(3)[2].rating is None
+
+    with pytest.raises(ValueError):
+        StatsTable.from_numpy(np.zeros(2, dtype=[("match_id", np.int64)]))
+
+
+def test_stats_table_without_numpy(monkeypatch):
+    monkeypatch.setattr(stats_module, "np", None)
+    with pytest.raises(ImportError):
+        make_table().to_numpy()
+    with pytest.raises(ImportError):
+        StatsTable.from_numpy(None)
@@ -0,0 +1,134 @@
+# type: ignore
+import pytest
+import sqlite3
+
+from vlrscraper.cache import get_memory_cache
+from vlrscraper.controllers import MatchController
+from vlrscraper.export import match_to_dict
+from vlrscraper.resources import Match, Player, PlayerStats, PlayerStatus, Team
+from vlrscraper.scraping import ThreadedMatchScraper
+from vlrscraper.store import EntityStore, get_store, set_store
+from vlrscraper.vlr_resources import match_resource
+
+
+@pytest.fixture
+def store():
+    store = EntityStore(batch_size=2)
+    yield store
+    store.close()
+
+
+def test_store_players_and_teams(store):
+    with pytest.raises(ValueError):
+        EntityStore(batch_size=0)
+
+    assert store.get_player(4004) is None and store.get_team(2) is None
+    store.put_player(Player.from_match_page(4004, "zekken"))
+    assert store.get_player(4004).get_current_team() is None
+
+    # Upserts keep the fields that a later scrape is missing
+    team = Team.from_player_page(2, "Sentinels", "https://owcdn.net/img/1.png")
+    store.put_player(
+        Player(4004, None, team, "Zachary", "Patrone", None, PlayerStatus.ACTIVE)
+    )
+    store.put_team(Team.from_match_page(2, "Sentinels", "", None, []))
+    player = store.get_player(4004)
+    assert player.get_display_name() == "zekken"
+    assert player.get_name() == "Zachary Patrone"
+    assert player.get_status() == PlayerStatus.ACTIVE
+    assert player.get_current_team().get_logo() == "https://owcdn.net/img/1.png"
+
+    assert (
+        store.put_teams(
+            Team.from_team_page(
+                _id, str(_id), "T", "", [Player.from_match_page(_id * 10, "p")]
+            )
+            for _id in range(1, 6)
+        )
+        == 5
+    )
+    sentinels = store.get_team(2)
+    assert sentinels.get_tag() == "T"
+    assert {p.get_id() for p in sentinels.get_roster()} == {4004, 20}
+    assert sentinels.get_roster()[0].get_current_team() is sentinels
+    assert store.get_stats() == {"players": 6, "teams": 5, "matches": 0, "stats": 0}
+
+
+def test_store_matches(store, requests_regression):
+    matches = [
+        MatchController.parse_match(_id, match_resource.get_data(_id)["data"])
+        for _id in (408415, 408414, 413228)
+    ]
+    assert store.put_matches(iter(matches)) == 3
+    for match in matches:
+        assert store.has_match(match.get_id())
+        assert match_to_dict(store.get_match(match.get_id())) == match_to_dict(match)
+    assert store.get_match(1) is None and not store.has_match(1)
+
+    # Storing a match again replaces it
+    store.put_match(matches[0])
+    assert store.get_stats()["matches"] == 3
+
+    newest = sorted(matches, key=Match.get_date, reverse=True)
+    assert [i for i, _ in store.get_match_ids()] == [m.get_id() for m in newest]
+    assert store.get_latest_match() == (newest[0].get_id(), newest[0].get_date())
+    assert store.get_match_ids(_from=newest[0].get_date() + 1) == []
+    assert store.get_match_ids(to=newest[-1].get_date()) == [
+        (newest[-1].get_id(), newest[-1].get_date())
+    ]
+
+    player = next(iter(matches[0].get_stats()))
+    assert matches[0].get_id() in [i for i, _ in store.get_match_ids(player=player)]
+    assert {m.get_id() for m in store.iter_matches(team=2)} == {
+        m.get_id() for m in matches if 2 in [t.get_id() for t in m.get_teams()]
+    }
+    assert store.get_latest_match(player=1) is None
+
+
+def test_controllers_use_store(store):
+    match = Match(1, "Match", "Event", 1700000000.0, ())
+    match.set_stats({4004: PlayerStats(*[1] * 12)})
+    store.put_match(match)
+
+    previous = get_store()
+    set_store(store)
+    get_memory_cache().clear()
+    try:
+        # Stored matches are never fetched
+        assert MatchController.get_match(1).get_stats()[4004].kills == 1
+        assert [m.get_id() for m in ThreadedMatchScraper([1]).run()] == [1]
+    finally:
+        set_store(previous)
+        get_memory_cache().clear()
+
+
+class LockedStore(EntityStore):
+    """A store whose database is always locked"""
+
+    def get_match(self, _id):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put_match(self, match):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_threaded_scraper_store_errors(requests_regression):
+    previous = get_store()
+    store = LockedStore()
+    set_store(store)
+    try:
+        # Matches are still fetched, parsed and yielded in order when the store fails
+        ids = [408415, 408414]
+        scraper = ThreadedMatchScraper(ids, ordered=True, reorder_buffer=1)
+        assert [m.get_id() for m in scraper] == ids
+    finally:
+        set_store(previous)
+        store.close()
+
+
+def test_store_watermarks(store):
+    assert store.get_watermark("player", 4004) is None
+    store.set_watermark("player", 4004, 408415, 1727678400.0)
+    store.set_watermark("player", 4004, 413228, 1728791400.0)
+    assert store.get_watermark("player", 4004) == (413228, 1728791400.0)
+    assert store.get_watermark("team", 4004) is None
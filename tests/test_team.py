@@ -1,7 +1,9 @@
 # type: ignore
 import pytest
 
-from vlrscraper.controllers import TeamController
+from vlrscraper.controllers import TeamController, PlayerController
+from vlrscraper.scraping import XpathParser
+from vlrscraper.utils import epoch_from_timestamp
 from vlrscraper.resources import Team, Player, PlayerStatus
 
 from .helpers import assert_players
@@ -124,6 +126,52 @@ def test_getTeam(requests_regression):
     assert TeamController.get_team("2") is None
 
 
+def test_get_players_from_team_page():
+    parser = XpathParser(
+        b"""<html><body>
+        <div class="team-roster-item"><a href="/player/9/tenz">
+            <div class="team-roster-item-img"><img src="/img/base/ph/sil.png"></div>
+            <div class="team-roster-item-name-alias">TenZ</div>
+        </a></div>
+        <div class="team-roster-item"><a href="/player/4004/zekken">
+            <div class="team-roster-item-img"><img src="//owcdn.net/img/zekken.png"></div>
+            <div class="team-roster-item-name-alias">zekken</div>
+            <div class="team-roster-item-name-real">Zachary Patrone</div>
+            <div class="wf-tag">Inactive</div>
+        </a></div>
+        </body></html>"""
+    )
+    sen = Team.from_player_page(2, "Sentinels", "")
+    players = PlayerController.get_players_from_team_page(parser, sen)
+
+    # Fields are read per roster item, so a missing name does not shift the others
+    assert len(players) == 2
+    assert_players(
+        players[0],
+        Player.from_team_page(
+            9,
+            "TenZ",
+            "",
+            None,
+            sen,
+            "https://vlr.gg/img/base/ph/sil.png",
+            PlayerStatus.ACTIVE,
+        ),
+    )
+    assert_players(
+        players[1],
+        Player.from_team_page(
+            4004,
+            "zekken",
+            "Zachary",
+            "Patrone",
+            sen,
+            "https://owcdn.net/img/zekken.png",
+            PlayerStatus.INACTIVE,
+        ),
+    )
+
+
 def test_get_player_teams(requests_regression):
     zekken_teams = TeamController.get_player_team_history(4004)
 
@@ -145,3 +193,31 @@ def test_get_player_teams(requests_regression):
             10963, "Team Zander", "https://vlr.gg/img/vlr/tmp/vlr.png"
         )
     )
+
+    # Check join / leave dates are loaded
+    assert len(zekken_teams) == 7
+    assert zekken_teams[0].get_join_date() == epoch_from_timestamp(
+        "October 2022 -0400", "%B %Y %z"
+    )
+    assert zekken_teams[0].get_leave_date() is None
+    assert zekken_teams[1].get_join_date() is None
+    assert zekken_teams[3].get_join_date() == epoch_from_timestamp(
+        "June 2021 -0400", "%B %Y %z"
+    )
+    assert zekken_teams[3].get_leave_date() == epoch_from_timestamp(
+        "October 2022 -0400", "%B %Y %z"
+    )
+
+
+def test_get_player_teams_news_links(requests_regression):
+    # Carpe's history links to a news article, which is not a team
+    carpe_teams = TeamController.get_player_team_history(31207)
+    assert [t.get_id() for t in carpe_teams] == [14]
+
+
+def test_get_teams(requests_regression):
+    teams = TeamController.get_teams([2, -100])
+    assert teams[2]["success"]
+    assert teams[2]["data"].get_name() == "Sentinels"
+    assert len(teams[2]["data"].get_roster()) == 10
+    assert not teams[-100]["success"]
@@ -0,0 +1,90 @@
+# type: ignore
+import pytest
+
+from vlrscraper.cache import get_memory_cache
+from vlrscraper.resource import Resource, ResourceResponse
+from vlrscraper.transport import Transport, get_transport, set_transport
+
+
+def test_transport_init():
+    transport = Transport(pool_maxsize=4, connect_timeout=1.0, read_timeout=2.0)
+    assert transport.get_pool_maxsize() == 4
+    assert transport.get_timeout() == (1.0, 2.0)
+    assert transport.get_stats() == {}
+
+    with pytest.raises(ValueError):
+        Transport(pool_maxsize=0)
+
+
+def test_transport_reuse(stand_in_server):
+    stand_in_server.RequestHandlerClass.routes.update({"/1": (200, b"<html></html>")})
+    host = stand_in_server.url.split("//")[1]
+
+    transport = Transport()
+    for _ in range(5):
+        assert transport.get(f"{stand_in_server.url}/1").status_code == 200
+
+    stats = transport.get_stats()[host]
+    assert (stats["requests"], stats["connections"], stats["reused"]) == (5, 1, 4)
+    transport.close()
+
+
+def test_resource_transport(stand_in_server):
+    stand_in_server.RequestHandlerClass.routes.update({"/1": (200, b"<html></html>")})
+    transport = Transport()
+
+    res = Resource(f"{stand_in_server.url}/<res_id>", transport=transport)
+    assert res.get_transport() is transport
+    assert res.get_data(1) == ResourceResponse.success(b"<html></html>")
+    assert res.get_data(2) == ResourceResponse.request_refused(
+        f"{stand_in_server.url}/2", 404
+    )
+
+    # Resources without their own transport follow the shared one
+    old_transport = get_transport()
+    set_transport(transport)
+    assert Resource(f"{stand_in_server.url}/<res_id>").get_transport() is transport
+    set_transport(old_transport)
+    transport.close()
+
+
+def test_transport_compression(stand_in_server):
+    body = b"<html>" + b"<p>vlr</p>" * 10000 + b"</html>"
+    stand_in_server.RequestHandlerClass.routes.update({"/1": (200, body)})
+    host = stand_in_server.url.split("//")[1]
+    transport = Transport()
+
+    response = transport.get(f"{stand_in_server.url}/1")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.content == body
+
+    stats = transport.get_stats()[host]
+    assert stats["decoded_bytes"] == len(body)
+    assert 0 < stats["wire_bytes"] < len(body) / 10
+    transport.close()
+
+
+def test_transport_stream(stand_in_server):
+    body = b"<html><body>" + b"<p>vlr</p>" * 10000 + b"</body></html>"
+    stand_in_server.RequestHandlerClass.routes.update({"/1": (200, body)})
+    host = stand_in_server.url.split("//")[1]
+    transport = Transport()
+
+    # Streamed bodies are only counted once they have been read
+    response = transport.get(f"{stand_in_server.url}/1", stream=True)
+    assert transport.get_stats()[host]["decoded_bytes"] == 0
+    assert b"".join(transport.iter_body(response, chunk_size=1024)) == body
+    assert transport.get_stats()[host]["decoded_bytes"] == len(body)
+
+    res = Resource(f"{stand_in_server.url}/<res_id>", transport=transport)
+    parser = res.get_parser(1, stream=True)
+    assert len(parser.get_elements("//p")) == 10000
+    assert res.get_parser(2, stream=True) is None
+    assert res.get_parser("1", stream=True) is None
+
+    # Streamed pages of cached resources are kept as raw bytes
+    cached = Resource(f"{stand_in_server.url}/<res_id>", transport=transport, ttl=None)
+    assert len(cached.get_parser(1, stream=True).get_elements("//p")) == 10000
+    assert get_memory_cache().get(("page", f"{stand_in_server.url}/1")) == body
+    assert len(cached.get_parser(1, stream=True).get_elements("//p")) == 10000
+    transport.close()
@@ -71,3 +71,23 @@ def test_parse_stat() -> None:
 
     assert utils.parse_stat("100%", int) == 100
     assert utils.parse_stat("\xa0", float) is None
+
+
+def test_time_window(monkeypatch) -> None:
+    assert utils.TimeWindow(10, 20).resolve() == (10.0, 20.0)
+    assert utils.TimeWindow(10, 20).contains(20)
+    assert not utils.TimeWindow(10, 20).contains(21)
+
+    # Open and relative bounds are resolved each time the window is used
+    monkeypatch.setattr(utils.time, "time", lambda: 1000.0)
+    window = utils.TimeWindow.last(seconds=100)
+    assert window.resolve() == (900.0, 1000.0)
+    assert utils.TimeWindow().resolve() == (0.0, 1000.0)
+    monkeypatch.setattr(utils.time, "time", lambda: 2000.0)
+    assert window.resolve() == (1900.0, 2000.0)
+    assert utils.TimeWindow(to=lambda: 1500.0).resolve() == (0.0, 1500.0)
+
+    assert utils.TimeWindow.of(window) is window
+    assert utils.TimeWindow.of(10, 20).resolve() == (10.0, 20.0)
+    with pytest.raises(ValueError):
+        utils.TimeWindow.of(window, 20)